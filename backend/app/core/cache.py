@@ -0,0 +1,457 @@
+"""Content-addressed response cache.
+
+Caches expensive LLM results keyed by a hash of their normalized inputs.
+Two tiers:
+- an in-process LRU (fast, per worker)
+- an optional SQLite tier under data/cache/ (persistent, shared by workers)
+
+Values must be JSON-serializable. Large binary payloads (e.g. TTS audio)
+use DiskBlobCache instead, which stores one file per key.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Disk eviction is checked every N writes rather than on every insert
+_EVICTION_CHECK_INTERVAL = 50
+
+# Disk-hit access times (for LRU eviction) are written in batches of N
+_TOUCH_FLUSH_INTERVAL = 50
+
+_MISSING = object()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so cosmetic differences map to the same key."""
+    return " ".join((text or "").split())
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable content hash from arbitrary JSON-serializable parts.
+
+    Example:
+        >>> make_cache_key("questions", "gemini-2.5-flash-lite", "Once upon a time")
+        '3f1c...'
+    """
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) cache with TTL and size limits."""
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        disk_path: Optional[Path] = None,
+        disk_max_entries: int = 20000,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_path = disk_path
+        self.disk_max_entries = max(1, disk_max_entries)
+
+        self._memory: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # The memory lock is never held across SQLite calls, so async callers can take it inline
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_eviction = 0
+        self._touched: dict[str, float] = {}  # key -> access time not yet written
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ----- disk tier -----
+
+    def _disk(self) -> Optional[sqlite3.Connection]:
+        if self.disk_path is None:
+            return None
+        if self._conn is None:
+            self.disk_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.disk_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _disk_get(self, key: str, now: float) -> Any:
+        conn = self._disk()
+        if conn is None:
+            return _MISSING
+        try:
+            row = conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return _MISSING
+            value, created_at = row
+            if self._expired(created_at, now):
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                conn.commit()
+                return _MISSING
+            # Reads stay read-only; access times are written in batches
+            self._touched[key] = now
+            if len(self._touched) >= _TOUCH_FLUSH_INTERVAL:
+                self._flush_touches(conn)
+                conn.commit()
+            return created_at, json.loads(value)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Cache '{self.name}' disk read failed: {e}")
+            return _MISSING
+
+    def _disk_set(self, key: str, value: Any, now: float) -> None:
+        conn = self._disk()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= _EVICTION_CHECK_INTERVAL:
+                self._writes_since_eviction = 0
+                self._flush_touches(conn)
+                self._disk_evict(conn, now)
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Cache '{self.name}' disk write failed: {e}")
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        if self._touched:
+            conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _disk_evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds is not None:
+            cur = conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+            self.evictions += cur.rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.disk_max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM entries WHERE key IN "
+                "(SELECT key FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    # ----- public API -----
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for key, or default on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            value = self._memory_get(key, now)
+        if value is not _MISSING:
+            return value
+
+        with self._disk_lock:
+            found = self._disk_get(key, now)
+
+        with self._lock:
+            if found is _MISSING:
+                self.misses += 1
+                return default
+            created_at, value = found
+            self.hits += 1
+            self.disk_hits += 1
+            # Promote the disk hit, unless a set() stored a newer value meanwhile
+            if key in self._memory:
+                return self._memory[key][1]
+            self._memory_set(key, value, created_at)
+            return value
+
+    def _memory_get(self, key: str, now: float) -> Any:
+        """Memory-tier lookup (caller holds self._lock); _MISSING if absent or expired."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return _MISSING
+        created_at, value = entry
+        if self._expired(created_at, now):
+            del self._memory[key]
+            return _MISSING
+        self._memory.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def aget(self, key: str, default: Any = None) -> Any:
+        """get() for async code: memory hits return inline, the SQLite tier runs in a thread."""
+        if self.disk_path is None:
+            return self.get(key, default)
+        with self._lock:
+            value = self._memory_get(key, time.time())
+        if value is not _MISSING:
+            return value
+        return await asyncio.to_thread(self.get, key, default)
+
+    async def aset(self, key: str, value: Any) -> None:
+        """set() for async code; the SQLite write runs in a thread."""
+        if self.disk_path is None:
+            self.set(key, value)
+            return
+        await asyncio.to_thread(self.set, key, value)
+
+    def _memory_set(self, key: str, value: Any, created_at: float) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key in all tiers."""
+        now = time.time()
+        with self._lock:
+            self._memory_set(key, value, now)
+        with self._disk_lock:
+            self._disk_set(key, value, now)
+
+    def clear(self) -> None:
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        with self._disk_lock:
+            self._touched.clear()
+            conn = self._disk()
+            if conn is not None:
+                conn.execute("DELETE FROM entries")
+                conn.commit()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "disk": self.disk_path is not None,
+        }
+
+
+class DiskBlobCache:
+    """
+    Size-capped, file-per-key cache for binary payloads.
+
+    Files live under directory/<key[:2]>/<key><suffix>. Writes are atomic
+    (temp file + os.replace), so concurrent workers never read partial
+    files. Reads bump the file mtime; when the total size exceeds max_bytes
+    the least recently used files are removed.
+    """
+
+    def __init__(self, name: str, directory: Path, max_bytes: int, suffix: str = ".bin"):
+        self.name = name
+        self.directory = Path(directory)
+        self.max_bytes = max(1, max_bytes)
+        self.suffix = suffix
+
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def get_path(self, key: str) -> Optional[Path]:
+        """Path of the cached file for key (touched for LRU), or None on miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for key, or None on miss."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            # Evicted by another worker between touch and read
+            return None
+
+    def set(self, key: str, data: bytes) -> Path:
+        """Atomically store data under key and enforce the size cap."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return path
+
+    def _files(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.glob(f"*/*{self.suffix}") if not p.name.startswith(".tmp-")]
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self) -> None:
+        """Remove least recently used files until under 90% of the cap."""
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+        self._total_bytes = total
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# Named caches shared across the process
+_caches: dict[str, ResponseCache] = {}
+_blob_caches: dict[str, DiskBlobCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(
+    name: str,
+    max_entries: int = 1024,
+    ttl_seconds: Optional[float] = None,
+    disk: bool = False,
+    disk_max_entries: int = 20000,
+) -> ResponseCache:
+    """
+    Get or create a named cache.
+
+    Args:
+        name: Cache name (also the SQLite file name when disk=True)
+        max_entries: In-memory LRU size
+        ttl_seconds: Entry lifetime (None = no expiry)
+        disk: Enable the SQLite tier under CACHE_DIR
+        disk_max_entries: Max rows kept in the SQLite tier
+
+    Returns:
+        Shared ResponseCache instance
+    """
+    with _caches_lock:
+        if name not in _caches:
+            disk_path = None
+            if disk:
+                cache_dir = Path(settings()["CACHE_DIR"])
+                disk_path = cache_dir / f"{name}.sqlite3"
+            _caches[name] = ResponseCache(
+                name,
+                max_entries=max_entries,
+                ttl_seconds=ttl_seconds,
+                disk_path=disk_path,
+                disk_max_entries=disk_max_entries,
+            )
+        return _caches[name]
+
+
+def get_blob_cache(name: str, max_bytes: int, suffix: str = ".bin") -> DiskBlobCache:
+    """
+    Get or create a named file cache under CACHE_DIR/<name>.
+
+    Args:
+        name: Cache name (also the directory name)
+        max_bytes: Total size cap before LRU eviction
+        suffix: File extension for stored entries
+
+    Returns:
+        Shared DiskBlobCache instance
+    """
+    with _caches_lock:
+        if name not in _blob_caches:
+            directory = Path(settings()["CACHE_DIR"]) / name
+            _blob_caches[name] = DiskBlobCache(name, directory, max_bytes, suffix)
+        return _blob_caches[name]
+
+
+def cache_stats() -> dict:
+    """Stats for every named cache created so far."""
+    stats = {name: cache.stats() for name, cache in _caches.items()}
+    stats.update({name: cache.stats() for name, cache in _blob_caches.items()})
+    return stats
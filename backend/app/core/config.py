@@ -1,12 +1,22 @@
-"""Application configuration helpers."""
+"""Application configuration helpers.
+
+settings() is built on first use, never at import, and does not require any
+API key: a missing key only disables the features that need it (see
+FEATURES). Call require_feature() before using one; a disabled feature
+raises FeatureUnavailable, which the app maps to 503.
+"""
 
 import os
 from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple, TypedDict
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
 
 def get_secret(key: str, default: str | None = None) -> str:
     """Fetch configuration values from environment or .env file."""
@@ -21,13 +31,85 @@ def get_secret(key: str, default: str | None = None) -> str:
     )
 
 
+def get_optional_secret(key: str) -> Optional[str]:
+    """Fetch an API key, or None if it is unset or empty."""
+    return os.getenv(key) or None
+
+
+def _int(key: str, default: str) -> int:
+    raw = get_secret(key, default)
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"❌ {key} must be an integer, got {raw!r}")
+
+
+def _float(key: str, default: str) -> float:
+    raw = get_secret(key, default)
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"❌ {key} must be a number, got {raw!r}")
+
+
+class Settings(TypedDict):
+    GEMINI_API_KEY: Optional[str]
+    GEMINI_AUDIO_API_KEY: Optional[str]
+    DEEPSEEK_API_KEY: Optional[str]
+    HF_API_TOKEN: Optional[str]
+    GEMINI_QUESTION_MODEL: str
+    GEMINI_SPLITTER_MODEL: str
+    GEMINI_AUDIO_MODEL: str
+    OPENAI_TTS_MODEL: str
+    OPENAI_TTS_HD_MODEL: str
+    OPENAI_DEFAULT_VOICE: str
+    OPENAI_TTS_SPEED: float
+    GOOGLE_CLOUD_PROJECT_ID: str
+    GOOGLE_TTS_SAMPLE_RATE: int
+    GOOGLE_TTS_SPEAKING_RATE: float
+    GOOGLE_TTS_PITCH: float
+    GEMINI_MAX_CONCURRENCY: int
+    DEEPSEEK_MAX_CONCURRENCY: int
+    SPLITTER_MODE: str
+    SPLIT_CACHE_TTL: float
+    QUESTION_BATCH_TOKEN_BUDGET: int
+    QUESTION_BATCH_CONTEXT_TOKENS: int
+    CACHE_DIR: str
+    RESPONSE_CACHE_DISK: bool
+    QUESTION_CACHE_MAX_ENTRIES: int
+    QUESTION_CACHE_TTL: float
+    AUDIO_CACHE_MAX_MB: int
+    TTS_SPEAKER_CACHE_TTL: float
+    TTS_FALLBACK_CACHE_TTL: float
+    TTS_CHUNK_CHARS: int
+    TTS_MAX_CONCURRENCY: int
+    UPLOAD_STORE: str
+    UPLOAD_DB_PATH: str
+    UPLOAD_MEMORY_MAX_ENTRIES: int
+    RATE_LIMIT_BACKEND: str
+    RATE_LIMIT_DB_PATH: str
+    RATE_LIMIT_MEMORY_MAX_ENTRIES: int
+    SIMPLIFY_MODE: str
+    SIMPLIFY_FRAGMENT_CHARS: int
+    SIMPLIFY_FRAGMENT_TOKENS: int
+    SIMPLIFY_CONTEXT_TOKENS: int
+    SIMPLIFY_CACHE_MAX_ENTRIES: int
+    SIMPLIFY_CACHE_TTL: float
+    LLM_PROVIDER: str
+    FAKE_LLM_LATENCY: str
+    FAKE_LLM_CHUNK_DELAY: float
+    FAKE_LLM_RESPONSES: str
+    FAKE_LLM_SEED: int
+
+
 @lru_cache(maxsize=None)
-def settings() -> dict:
+def settings() -> Settings:
     return {
-        "GEMINI_API_KEY": get_secret("GEMINI_API_KEY"),
-        "GEMINI_AUDIO_API_KEY": get_secret("GEMINI_AUDIO_API_KEY"),
-        "DEEPSEEK_API_KEY": get_secret("DEEPSEEK_API_KEY"),
-        "HF_API_TOKEN": get_secret("HF_API_TOKEN"),
+        # API keys are optional; each one enables the features listed in FEATURES
+        "GEMINI_API_KEY": get_optional_secret("GEMINI_API_KEY"),
+        "GEMINI_AUDIO_API_KEY": get_optional_secret("GEMINI_AUDIO_API_KEY"),
+        "DEEPSEEK_API_KEY": get_optional_secret("DEEPSEEK_API_KEY"),
+        "HF_API_TOKEN": get_optional_secret("HF_API_TOKEN"),
         "GEMINI_QUESTION_MODEL": "gemini-2.5-flash-lite",
         "GEMINI_SPLITTER_MODEL": "gemini-2.5-flash-lite",
         "GEMINI_AUDIO_MODEL": "gemini-2.5-flash-lite",
@@ -39,6 +121,101 @@ def settings() -> dict:
         "GOOGLE_TTS_SAMPLE_RATE": 22050,
         "GOOGLE_TTS_SPEAKING_RATE": 1.0,
         "GOOGLE_TTS_PITCH": 0.0,
+        # Max in-flight requests per LLM provider on the async path
+        "GEMINI_MAX_CONCURRENCY": _int("GEMINI_MAX_CONCURRENCY", "8"),
+        "DEEPSEEK_MAX_CONCURRENCY": _int("DEEPSEEK_MAX_CONCURRENCY", "4"),
+        # Text splitting: "local" (rule-based, no API call), "llm" or "refine" (LLM adjusts the local split)
+        "SPLITTER_MODE": get_secret("SPLITTER_MODE", "local"),
+        # Preview results reused by the following upload (seconds)
+        "SPLIT_CACHE_TTL": _float("SPLIT_CACHE_TTL", "1800"),
+        # Question batches: fragments packed per Gemini call, plus carried-over context
+        "QUESTION_BATCH_TOKEN_BUDGET": _int("QUESTION_BATCH_TOKEN_BUDGET", "2000"),
+        "QUESTION_BATCH_CONTEXT_TOKENS": _int("QUESTION_BATCH_CONTEXT_TOKENS", "120"),
+        # Response caches (memory LRU + optional SQLite tier under CACHE_DIR)
+        "CACHE_DIR": get_secret("CACHE_DIR", str(PROJECT_ROOT / "data" / "cache")),
+        "RESPONSE_CACHE_DISK": get_secret("RESPONSE_CACHE_DISK", "1") == "1",
+        "QUESTION_CACHE_MAX_ENTRIES": _int("QUESTION_CACHE_MAX_ENTRIES", "2048"),
+        "QUESTION_CACHE_TTL": _float("QUESTION_CACHE_TTL", str(7 * 24 * 3600)),
+        "AUDIO_CACHE_MAX_MB": _int("AUDIO_CACHE_MAX_MB", "500"),
+        "TTS_SPEAKER_CACHE_TTL": _float("TTS_SPEAKER_CACHE_TTL", "3600"),
+        # Clips from the HF router fallback are reused this long before the primary Space is retried
+        "TTS_FALLBACK_CACHE_TTL": _float("TTS_FALLBACK_CACHE_TTL", "3600"),
+        # Chunked TTS: max characters per sentence chunk and parallel Space calls
+        "TTS_CHUNK_CHARS": _int("TTS_CHUNK_CHARS", "300"),
+        "TTS_MAX_CONCURRENCY": _int("TTS_MAX_CONCURRENCY", "3"),
+        # Uploaded texts: "sqlite" (shared by workers, persistent) or "memory" (bounded, per process)
+        "UPLOAD_STORE": get_secret("UPLOAD_STORE", "sqlite"),
+        "UPLOAD_DB_PATH": get_secret("UPLOAD_DB_PATH", str(PROJECT_ROOT / "data" / "uploads.db")),
+        "UPLOAD_MEMORY_MAX_ENTRIES": _int("UPLOAD_MEMORY_MAX_ENTRIES", "1000"),
+        # Per-user rate limits: "sqlite" (one quota shared by all workers) or "memory" (per process)
+        "RATE_LIMIT_BACKEND": get_secret("RATE_LIMIT_BACKEND", "sqlite"),
+        "RATE_LIMIT_DB_PATH": get_secret("RATE_LIMIT_DB_PATH", str(PROJECT_ROOT / "data" / "rate_limit.db")),
+        "RATE_LIMIT_MEMORY_MAX_ENTRIES": _int("RATE_LIMIT_MEMORY_MAX_ENTRIES", "10000"),
+        # Simplification: "whole" (one prompt), "fragments" (parallel, no size cap) or
+        # "auto" (fragments above SIMPLIFY_FRAGMENT_CHARS); fragment size and carried-over context
+        "SIMPLIFY_MODE": get_secret("SIMPLIFY_MODE", "auto"),
+        "SIMPLIFY_FRAGMENT_CHARS": _int("SIMPLIFY_FRAGMENT_CHARS", "4000"),
+        "SIMPLIFY_FRAGMENT_TOKENS": _int("SIMPLIFY_FRAGMENT_TOKENS", "600"),
+        "SIMPLIFY_CONTEXT_TOKENS": _int("SIMPLIFY_CONTEXT_TOKENS", "80"),
+        # Simplification results (per text or fragment), in the response cache
+        "SIMPLIFY_CACHE_MAX_ENTRIES": _int("SIMPLIFY_CACHE_MAX_ENTRIES", "512"),
+        "SIMPLIFY_CACHE_TTL": _float("SIMPLIFY_CACHE_TTL", str(30 * 24 * 3600)),
+        # LLM backend: "live" (Gemini / DeepSeek) or "fake" (local stand-in, no keys needed)
+        "LLM_PROVIDER": get_secret("LLM_PROVIDER", "live"),
+        # Fake provider: latency spec (e.g. "0.8", "uniform:0.3,1.5", "lognormal:-0.5,0.4"),
+        # delay between streamed words, JSON file of canned outputs per role, RNG seed
+        "FAKE_LLM_LATENCY": get_secret("FAKE_LLM_LATENCY", "0"),
+        "FAKE_LLM_CHUNK_DELAY": _float("FAKE_LLM_CHUNK_DELAY", "0"),
+        "FAKE_LLM_RESPONSES": get_secret("FAKE_LLM_RESPONSES", ""),
+        "FAKE_LLM_SEED": _int("FAKE_LLM_SEED", "0"),
     }
 
 
+# Feature → config keys it needs. Texts, uploads, local splitting, banked
+# questions and Space TTS need no key and are always available.
+FEATURES: Dict[str, Tuple[str, ...]] = {
+    "questions": ("GEMINI_API_KEY",),
+    "evaluation": ("GEMINI_API_KEY",),
+    "formatting": ("GEMINI_API_KEY",),
+    "llm_split": ("GEMINI_API_KEY",),
+    "simplify": ("DEEPSEEK_API_KEY",),
+    "tts_fallback": ("HF_API_TOKEN",),
+}
+
+# Features served by an LLM provider; LLM_PROVIDER=fake enables them without keys
+LLM_FEATURES = {"questions", "evaluation", "formatting", "llm_split", "simplify"}
+
+
+class FeatureUnavailable(Exception):
+    """A feature was used whose configuration (e.g. API key) is missing."""
+
+    def __init__(self, feature: str, missing: Tuple[str, ...]):
+        self.feature = feature
+        self.missing = missing
+        super().__init__(
+            f"🚫 '{feature}' is not available on this server: set {', '.join(missing)}"
+        )
+
+
+def missing_keys(feature: str) -> Tuple[str, ...]:
+    """Config keys the feature needs that are not set."""
+    cfg = settings()
+    if feature in LLM_FEATURES and cfg["LLM_PROVIDER"].lower() == "fake":
+        return ()
+    return tuple(key for key in FEATURES[feature] if not cfg[key])
+
+
+def feature_enabled(feature: str) -> bool:
+    return not missing_keys(feature)
+
+
+def capabilities() -> Dict[str, bool]:
+    """Availability of every optional feature."""
+    return {feature: feature_enabled(feature) for feature in FEATURES}
+
+
+def require_feature(feature: str) -> None:
+    """Raise FeatureUnavailable unless the feature is configured."""
+    missing = missing_keys(feature)
+    if missing:
+        raise FeatureUnavailable(feature, missing)
@@ -2,24 +2,48 @@
 
 This module eliminates code duplication across services by providing
 a single place to configure and instantiate LLM clients.
+
+Services talk to an LLMProvider (get_llm_provider) rather than to a
+specific SDK. With LLM_PROVIDER=fake every role is served by FakeProvider,
+a local stand-in with configurable latency and canned outputs, so the
+request pipeline, concurrency limits and caches can be measured offline.
 """
 
-from functools import lru_cache
-from langchain_google_genai import ChatGoogleGenerativeAI
-from openai import OpenAI
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+from .config import FeatureUnavailable, settings
 
-from .config import settings
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from openai import AsyncOpenAI, OpenAI
 
 
-# Lazy-loaded singletons for performance
+# Lazy-loaded singletons for performance; the SDKs themselves are imported
+# on first use so importing the app stays cheap
 _llm_instances = {}
 
+# Per-provider semaphores bounding concurrent async LLM calls
+_semaphores: dict[str, asyncio.Semaphore] = {}
+
+_CONCURRENCY_KEYS = {
+    "gemini": "GEMINI_MAX_CONCURRENCY",
+    "deepseek": "DEEPSEEK_MAX_CONCURRENCY",
+}
+
 
 def get_gemini_llm(
     temperature: float = 0.7,
     top_p: float = 0.7,
-    model_key: str = "GEMINI_QUESTION_MODEL"
-) -> ChatGoogleGenerativeAI:
+    model_key: str = "GEMINI_QUESTION_MODEL",
+    json_mode: bool = False,
+) -> "ChatGoogleGenerativeAI":
     """
     Get or create a Gemini LLM instance with specified configuration.
     
@@ -27,25 +51,31 @@ def get_gemini_llm(
         temperature: Sampling temperature (0.0-1.0)
         top_p: Nucleus sampling threshold
         model_key: Config key for model name
+        json_mode: Constrain output to JSON (response_mime_type)
         
     Returns:
         Configured ChatGoogleGenerativeAI instance
     """
-    cache_key = f"gemini_{temperature}_{top_p}_{model_key}"
+    cache_key = f"gemini_{temperature}_{top_p}_{model_key}_{json_mode}"
     
     if cache_key not in _llm_instances:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
         cfg = settings()
+        if not cfg["GEMINI_API_KEY"]:
+            raise FeatureUnavailable("gemini", ("GEMINI_API_KEY",))
         _llm_instances[cache_key] = ChatGoogleGenerativeAI(
             model=cfg[model_key],
             api_key=cfg["GEMINI_API_KEY"],
             temperature=temperature,
             top_p=top_p,
+            response_mime_type="application/json" if json_mode else None,
         )
     
     return _llm_instances[cache_key]
 
 
-def get_openai_client(base_url: str = "https://api.deepseek.com") -> OpenAI:
+def get_openai_client(base_url: str = "https://api.deepseek.com") -> "OpenAI":
     """
     Get or create an OpenAI-compatible client (used for DeepSeek).
     
@@ -58,7 +88,11 @@ def get_openai_client(base_url: str = "https://api.deepseek.com") -> OpenAI:
     cache_key = f"openai_{base_url}"
     
     if cache_key not in _llm_instances:
+        from openai import OpenAI
+
         cfg = settings()
+        if not cfg["DEEPSEEK_API_KEY"]:
+            raise FeatureUnavailable("deepseek", ("DEEPSEEK_API_KEY",))
         _llm_instances[cache_key] = OpenAI(
             api_key=cfg["DEEPSEEK_API_KEY"],
             base_url=base_url,
@@ -67,8 +101,394 @@ def get_openai_client(base_url: str = "https://api.deepseek.com") -> OpenAI:
     return _llm_instances[cache_key]
 
 
+def get_async_openai_client(base_url: str = "https://api.deepseek.com") -> "AsyncOpenAI":
+    """
+    Get or create an async OpenAI-compatible client (used for DeepSeek).
+    
+    Args:
+        base_url: API endpoint base URL
+        
+    Returns:
+        Configured AsyncOpenAI client
+    """
+    cache_key = f"async_openai_{base_url}"
+    
+    if cache_key not in _llm_instances:
+        from openai import AsyncOpenAI
+
+        cfg = settings()
+        if not cfg["DEEPSEEK_API_KEY"]:
+            raise FeatureUnavailable("deepseek", ("DEEPSEEK_API_KEY",))
+        _llm_instances[cache_key] = AsyncOpenAI(
+            api_key=cfg["DEEPSEEK_API_KEY"],
+            base_url=base_url,
+        )
+    
+    return _llm_instances[cache_key]
+
+
+def get_llm_semaphore(provider: str) -> asyncio.Semaphore:
+    """
+    Get the semaphore that bounds concurrent async calls to a provider.
+    
+    Limits come from config (GEMINI_MAX_CONCURRENCY, DEEPSEEK_MAX_CONCURRENCY),
+    so load is capped per provider instead of by threadpool size.
+    
+    Args:
+        provider: Provider name ("gemini" or "deepseek")
+        
+    Returns:
+        Shared asyncio.Semaphore for the provider
+    """
+    if provider not in _semaphores:
+        limit = settings()[_CONCURRENCY_KEYS[provider]]
+        _semaphores[provider] = asyncio.Semaphore(max(1, limit))
+    
+    return _semaphores[provider]
+
+
+# ----- Provider abstraction -----
+
+# A chat prompt: (role, content) pairs, role "system", "user" or "assistant".
+# Content is sent verbatim (no template formatting, braces need no escaping).
+Message = Tuple[str, str]
+
+
+def _message_text(message) -> str:
+    """Text of a LangChain message or chunk (content may be a list of blocks)."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, (str, dict))
+    )
+
+
+class LLMProvider(ABC):
+    """
+    Chat model used by the services: blocking and async completion, token
+    streaming, and JSON mode (output constrained to a JSON document).
+
+    Providers implement complete/stream and the unbounded _acomplete/_astream;
+    the public acomplete/astream wrap those in the semaphore of `name` (see
+    get_llm_semaphore).
+    """
+
+    name = ""
+    model = ""
+
+    @abstractmethod
+    def complete(self, messages: Sequence[Message], json_mode: bool = False) -> str:
+        """Blocking completion."""
+
+    @abstractmethod
+    def stream(self, messages: Sequence[Message], json_mode: bool = False) -> Iterator[str]:
+        """Blocking token stream."""
+
+    @abstractmethod
+    async def _acomplete(self, messages: Sequence[Message], json_mode: bool) -> str:
+        """Async completion, without the semaphore."""
+
+    @abstractmethod
+    def _astream(self, messages: Sequence[Message], json_mode: bool) -> AsyncIterator[str]:
+        """Async token stream (an async generator), without the semaphore."""
+
+    async def acomplete(self, messages: Sequence[Message], json_mode: bool = False) -> str:
+        """Async completion, bounded by the provider semaphore."""
+        async with get_llm_semaphore(self.name):
+            return await self._acomplete(messages, json_mode)
+
+    async def astream(self, messages: Sequence[Message], json_mode: bool = False) -> AsyncIterator[str]:
+        """
+        Async token stream; holds a semaphore slot until the stream ends.
+        Closing the generator (aclose) closes the provider stream.
+        """
+        async with get_llm_semaphore(self.name):
+            stream = self._astream(messages, json_mode)
+            try:
+                async for piece in stream:
+                    yield piece
+            finally:
+                await stream.aclose()
+
+
+class GeminiProvider(LLMProvider):
+    """Gemini through langchain_google_genai."""
+
+    name = "gemini"
+
+    def __init__(self, temperature: float = 0.7, top_p: float = 0.7, model_key: str = "GEMINI_QUESTION_MODEL"):
+        self.temperature = temperature
+        self.top_p = top_p
+        self.model_key = model_key
+        self.model = settings()[model_key]
+
+    def _llm(self, json_mode: bool = False):
+        return get_gemini_llm(self.temperature, self.top_p, self.model_key, json_mode=json_mode)
+
+    def complete(self, messages: Sequence[Message], json_mode: bool = False) -> str:
+        return _message_text(self._llm(json_mode).invoke(list(messages)))
+
+    def stream(self, messages: Sequence[Message], json_mode: bool = False) -> Iterator[str]:
+        for chunk in self._llm(json_mode).stream(list(messages)):
+            text = _message_text(chunk)
+            if text:
+                yield text
+
+    async def _acomplete(self, messages: Sequence[Message], json_mode: bool) -> str:
+        return _message_text(await self._llm(json_mode).ainvoke(list(messages)))
+
+    async def _astream(self, messages: Sequence[Message], json_mode: bool) -> AsyncIterator[str]:
+        async for chunk in self._llm(json_mode).astream(list(messages)):
+            text = _message_text(chunk)
+            if text:
+                yield text
+
+
+class DeepSeekProvider(LLMProvider):
+    """DeepSeek through the OpenAI-compatible API."""
+
+    name = "deepseek"
+
+    def __init__(self, model: str = "deepseek-chat", base_url: str = "https://api.deepseek.com"):
+        self.model = model
+        self.base_url = base_url
+
+    def _request(self, messages: Sequence[Message], json_mode: bool = False, stream: bool = False) -> dict:
+        request = {
+            "model": self.model,
+            "messages": [
+                {"role": "user" if role == "human" else role, "content": content}
+                for role, content in messages
+            ],
+            "stream": stream,
+        }
+        if json_mode:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def complete(self, messages: Sequence[Message], json_mode: bool = False) -> str:
+        resp = get_openai_client(self.base_url).chat.completions.create(**self._request(messages, json_mode))
+        return resp.choices[0].message.content
+
+    def stream(self, messages: Sequence[Message], json_mode: bool = False) -> Iterator[str]:
+        stream = get_openai_client(self.base_url).chat.completions.create(
+            **self._request(messages, json_mode, stream=True)
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            stream.close()
+
+    async def _acomplete(self, messages: Sequence[Message], json_mode: bool) -> str:
+        client = get_async_openai_client(self.base_url)
+        resp = await client.chat.completions.create(**self._request(messages, json_mode))
+        return resp.choices[0].message.content
+
+    async def _astream(self, messages: Sequence[Message], json_mode: bool) -> AsyncIterator[str]:
+        client = get_async_openai_client(self.base_url)
+        stream = await client.chat.completions.create(**self._request(messages, json_mode, stream=True))
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # Stops the HTTP response, so an abandoned stream stops generating
+            await stream.close()
+
+
+def _fake_batch_questions(messages: Sequence[Message]) -> str:
+    fragments = re.findall(r"^FRAGMENT (\d+):", messages[-1][1], re.MULTILINE)
+    return json.dumps({
+        index: [f"Fake question {n} about fragment {index}?" for n in (1, 2)]
+        for index in fragments
+    })
+
+
+# Default fake outputs per role; shaped like real answers so parsing succeeds.
+# A role without an entry echoes the last message.
+FAKE_RESPONSES: Dict[str, Union[str, Callable[[Sequence[Message]], str]]] = {
+    "questions": '["Fake question one?", "Fake question two?", "Fake question three?"]',
+    "questions_batch": _fake_batch_questions,
+    "evaluation": '{"feedback": "Fake feedback.", "correct_snippet": "", "correct": true}',
+}
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a FAKE_LLM_LATENCY spec into a sampler of seconds.
+
+    "0.5" or "fixed:0.5", "uniform:LOW,HIGH", "normal:MEAN,STDDEV",
+    "lognormal:MU,SIGMA" (parameters of the underlying normal).
+    """
+    kind, _, params = spec.strip().partition(":")
+    if not params:
+        kind, params = "fixed", kind or "0"
+    try:
+        values = [float(value) for value in params.split(",")]
+        if kind == "fixed" and len(values) == 1:
+            return lambda rng: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(*values)
+        if kind == "normal" and len(values) == 2:
+            return lambda rng: max(0.0, rng.normalvariate(*values))
+        if kind == "lognormal" and len(values) == 2:
+            return lambda rng: rng.lognormvariate(*values)
+    except ValueError:
+        pass
+    raise ValueError(f"❌ Invalid FAKE_LLM_LATENCY '{spec}'")
+
+
+class FakeProvider(LLMProvider):
+    """
+    Deterministic local stand-in for a real provider (no network).
+
+    Sleeps a sampled latency (time to first token), then answers with the
+    canned output for its role: FAKE_LLM_RESPONSES ({role: text or [texts]},
+    lists are cycled) over FAKE_RESPONSES over an echo of the last message.
+    Streams split the answer into words, FAKE_LLM_CHUNK_DELAY apart.
+    Uses the semaphore of the provider it stands in for.
+    """
+
+    model = "fake"
+
+    def __init__(
+        self,
+        role: str,
+        stands_for: str,
+        latency: Callable[[random.Random], float],
+        chunk_delay: float = 0.0,
+        responses: Dict[str, Union[str, list]] | None = None,
+        seed: int = 0,
+    ):
+        self.role = role
+        self.name = stands_for
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.responses = responses or {}
+        self._rng = random.Random(f"{seed}:{role}")
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "simulated_seconds": 0.0}
+
+    def _delay(self) -> float:
+        with self._lock:
+            delay = self.latency(self._rng)
+            self.stats["calls"] += 1
+            self.stats["simulated_seconds"] += delay
+            return delay
+
+    def _answer(self, messages: Sequence[Message]) -> str:
+        canned = self.responses.get(self.role)
+        if isinstance(canned, list):
+            with self._lock:
+                return canned[(self.stats["calls"] - 1) % len(canned)] if canned else ""
+        if isinstance(canned, str):
+            return canned
+        default = FAKE_RESPONSES.get(self.role)
+        if callable(default):
+            return default(messages)
+        if default is not None:
+            return default
+        return messages[-1][1] if messages else ""
+
+    def _chunks(self, text: str) -> List[str]:
+        return re.findall(r"\s*\S+\s*", text) or [text]
+
+    def complete(self, messages: Sequence[Message], json_mode: bool = False) -> str:
+        time.sleep(self._delay())
+        return self._answer(messages)
+
+    def stream(self, messages: Sequence[Message], json_mode: bool = False) -> Iterator[str]:
+        time.sleep(self._delay())
+        for index, chunk in enumerate(self._chunks(self._answer(messages))):
+            if index and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield chunk
+
+    async def _acomplete(self, messages: Sequence[Message], json_mode: bool) -> str:
+        await asyncio.sleep(self._delay())
+        return self._answer(messages)
+
+    async def _astream(self, messages: Sequence[Message], json_mode: bool) -> AsyncIterator[str]:
+        await asyncio.sleep(self._delay())
+        for index, chunk in enumerate(self._chunks(self._answer(messages))):
+            if index and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield chunk
+
+
+# Role → (provider, constructor options) used by the services
+LLM_ROLES: Dict[str, Tuple[str, dict]] = {
+    "questions": ("gemini", {"temperature": 0.7, "top_p": 0.7}),
+    "questions_batch": ("gemini", {"temperature": 0.7, "top_p": 0.7}),
+    "evaluation": ("gemini", {"temperature": 0.7, "top_p": 0.7}),
+    "formatting": ("gemini", {"temperature": 0.4, "top_p": 0.7}),
+    "splitter": ("gemini", {"temperature": 0.7, "top_p": 0.95, "model_key": "GEMINI_SPLITTER_MODEL"}),
+    "simplify": ("deepseek", {"model": "deepseek-chat"}),
+}
+
+_PROVIDERS = {"gemini": GeminiProvider, "deepseek": DeepSeekProvider}
+
+
+def _load_fake_responses(path: str) -> dict:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def get_llm_provider(role: str) -> LLMProvider:
+    """
+    Get the provider serving a role (see LLM_ROLES).
+
+    LLM_PROVIDER selects "live" (Gemini / DeepSeek per role) or "fake".
+    Creating a provider never contacts the API; a missing key surfaces as
+    FeatureUnavailable on the first call.
+    
+    Args:
+        role: Service role, e.g. "questions" or "simplify"
+        
+    Returns:
+        Shared LLMProvider for the role
+    """
+    cache_key = f"provider_{role}"
+    
+    if cache_key not in _llm_instances:
+        cfg = settings()
+        provider, options = LLM_ROLES[role]
+        mode = cfg["LLM_PROVIDER"].lower()
+        if mode == "fake":
+            _llm_instances[cache_key] = FakeProvider(
+                role,
+                stands_for=provider,
+                latency=parse_latency(cfg["FAKE_LLM_LATENCY"]),
+                chunk_delay=cfg["FAKE_LLM_CHUNK_DELAY"],
+                responses=_load_fake_responses(cfg["FAKE_LLM_RESPONSES"]),
+                seed=cfg["FAKE_LLM_SEED"],
+            )
+        elif mode == "live":
+            _llm_instances[cache_key] = _PROVIDERS[provider](**options)
+        else:
+            raise ValueError(f"❌ Unknown LLM_PROVIDER '{cfg['LLM_PROVIDER']}' (use live or fake)")
+    
+    return _llm_instances[cache_key]
+
+
+def llm_stats() -> Dict[str, dict]:
+    """Call counts and simulated latency of fake providers created so far."""
+    return {
+        provider.role: dict(provider.stats)
+        for provider in list(_llm_instances.values())
+        if isinstance(provider, FakeProvider)
+    }
+
+
 def clear_llm_cache():
     """Clear all cached LLM instances. Useful for testing."""
-    global _llm_instances
     _llm_instances.clear()
+    _semaphores.clear()
 
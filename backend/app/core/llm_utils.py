@@ -4,8 +4,12 @@ Common operations for working with LLM responses across services.
 """
 
 import json
-import re
-from typing import Any
+import logging
+from typing import Any, List, Tuple
+
+from .config import FeatureUnavailable
+
+logger = logging.getLogger(__name__)
 
 
 def clean_llm_json_response(response: str) -> str:
@@ -59,6 +63,85 @@ def parse_llm_json(response: str, default: Any = None) -> Any:
             return default
 
 
+class JsonObjectStream:
+    """
+    Incremental parser for a streamed top-level JSON object.
+
+    feed() takes the next chunk of model output and returns the members
+    (key, value) whose value has just closed, so each can be used before
+    the rest of the object is generated. Text before the opening brace
+    (e.g. a ```json fence) is ignored.
+
+    Example:
+        >>> stream = JsonObjectStream()
+        >>> stream.feed('```json\\n{"0": ["Q1", "Q')
+        []
+        >>> stream.feed('2"], "1": [')
+        [('0', ['Q1', 'Q2'])]
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = -1
+        self._member_emitted = False
+        self.closed = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.text += chunk
+        members = []
+
+        while self._pos < len(self.text) and not self.closed:
+            char = self.text[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1:
+                    # A nested value just closed: its member is complete
+                    self._emit(self._pos + 1, members)
+                elif self._depth == 0:
+                    self._emit(self._pos, members)
+                    self.closed = True
+            elif char == "," and self._depth == 1:
+                self._emit(self._pos, members)
+                self._member_start = self._pos + 1
+                self._member_emitted = False
+
+            self._pos += 1
+
+        return members
+
+    def _emit(self, end: int, members: List[Tuple[str, Any]]) -> None:
+        if self._member_emitted:
+            return
+        member = self.text[self._member_start:end].strip()
+        if not member:
+            return
+        self._member_emitted = True
+        try:
+            members.extend(json.loads("{" + member + "}").items())
+        except json.JSONDecodeError:
+            logger.warning(f"⚠️ Skipping unparsable JSON member: {truncate_text(member)}")
+
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text for logging/display.
@@ -90,3 +173,45 @@ def count_tokens_estimate(text: str) -> int:
     """
     return len(text) // 4
 
+
+
+def llm_error_to_value_error(error: Exception, action: str) -> ValueError:
+    """
+    Translate an LLM client exception into a user-facing ValueError.
+    
+    Routers map the emoji/keyword in the message to an HTTP status
+    (⏳ → 429, 🔑 → 401, anything else → 500).
+    
+    Args:
+        error: Exception raised by the LLM call
+        action: What was being attempted, e.g. "generate questions"
+        
+    Returns:
+        ValueError to raise
+        
+    Raises:
+        FeatureUnavailable: re-raised unchanged (provider not configured)
+    """
+    if isinstance(error, FeatureUnavailable):
+        # Not a provider failure: keep it so the app answers 503
+        raise error
+
+    from langchain_google_genai.chat_models import ChatGoogleGenerativeAIError
+
+    error_msg = str(error)
+
+    if isinstance(error, ChatGoogleGenerativeAIError):
+        logger.error(f"Gemini API error: {error_msg}")
+
+        # Check for rate limit error
+        if "RESOURCE_EXHAUSTED" in error_msg or "429" in error_msg:
+            return ValueError(
+                "⏳ API rate limit exceeded. Please wait a few moments and try again. "
+                "If this persists, consider upgrading your Gemini API plan."
+            )
+        if "PERMISSION_DENIED" in error_msg or "API key" in error_msg:
+            return ValueError("🔑 API key error. Please check your Gemini API key configuration.")
+        return ValueError(f"❌ API error: {error_msg}")
+
+    logger.error(f"Unexpected error while trying to {action}: {error_msg}")
+    return ValueError(f"❌ Failed to {action}: {error_msg}")
@@ -0,0 +1,211 @@
+"""Per-user token-bucket rate limiting.
+
+Two backends behind one interface:
+- SQLiteRateLimiter (default): buckets in data/rate_limit.db (WAL), each
+  check one BEGIN IMMEDIATE transaction, so updates are atomic and every
+  uvicorn worker draws from the same quota
+- MemoryRateLimiter: process-local, locked, bounded to max_entries buckets;
+  for tests and single-worker setups
+
+A bucket left idle for capacity / refill_rate seconds is full again, which
+is the same as having no bucket, so idle buckets are evicted without
+changing any decision.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Idle SQLite buckets are purged every N checks rather than on every check
+_EVICTION_CHECK_INTERVAL = 500
+
+
+class RateLimiter(ABC):
+    """Token bucket per key: `capacity` requests at once, refilled at `refill_rate` per second."""
+
+    def __init__(self, capacity: int = 8, refill_rate: float = 0.15):
+        self.capacity = max(1, capacity)
+        self.refill_rate = refill_rate
+        self.idle_seconds = self.capacity / refill_rate if refill_rate > 0 else float("inf")
+
+    def _take(self, tokens: float, elapsed: float) -> Tuple[float, bool, float]:
+        """
+        Refill a bucket for `elapsed` seconds and try to take one token.
+
+        Returns:
+            (tokens left, allowed, seconds to wait if not allowed)
+        """
+        tokens = min(self.capacity, tokens + max(0.0, elapsed) * self.refill_rate)
+        if tokens >= 1:
+            return tokens - 1, True, 0.0
+        wait_time = (1 - tokens) / self.refill_rate if self.refill_rate > 0 else float("inf")
+        return tokens, False, wait_time
+
+    @abstractmethod
+    def is_allowed(self, key: str) -> Tuple[bool, float]:
+        """
+        Consume one request for key.
+
+        Returns:
+            (allowed, seconds to wait before the next request is allowed)
+        """
+
+    async def ais_allowed(self, key: str) -> Tuple[bool, float]:
+        """is_allowed() for async code; runs in a thread so a blocking store can't stall the event loop."""
+        return await asyncio.to_thread(self.is_allowed, key)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of buckets currently stored."""
+
+
+class MemoryRateLimiter(RateLimiter):
+    """Process-local buckets in an LRU, at most max_entries of them."""
+
+    def __init__(self, capacity: int = 8, refill_rate: float = 0.15, max_entries: int = 10000):
+        super().__init__(capacity, refill_rate)
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # key -> (tokens, updated_at)
+
+    def is_allowed(self, key: str) -> Tuple[bool, float]:
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (self.capacity, now))
+            tokens, allowed, wait_time = self._take(tokens, now - updated_at)
+            self._buckets[key] = (tokens, now)
+            self._evict(now)
+        return allowed, wait_time
+
+    async def ais_allowed(self, key: str) -> Tuple[bool, float]:
+        # A locked dict update; cheaper inline than a thread hop
+        return self.is_allowed(key)
+
+    def _evict(self, now: float) -> None:
+        # LRU order is update order, so idle buckets are at the front
+        while self._buckets:
+            key, (_, updated_at) = next(iter(self._buckets.items()))
+            if len(self._buckets) <= self.max_entries and now - updated_at < self.idle_seconds:
+                break
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._buckets)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Buckets in a shared SQLite file (WAL), keyed by limiter name and key."""
+
+    def __init__(self, path: Path, name: str = "default", capacity: int = 8, refill_rate: float = 0.15):
+        super().__init__(capacity, refill_rate)
+        self.path = Path(path)
+        self.name = name
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._checks_since_eviction = 0
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL only risks the last few checks on power loss
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "limiter TEXT NOT NULL, key TEXT NOT NULL, "
+                "tokens REAL NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (limiter, key)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets_updated ON buckets(updated_at)")
+            self._conn = conn
+        return self._conn
+
+    def is_allowed(self, key: str) -> Tuple[bool, float]:
+        with self._lock:
+            try:
+                return self._check(self._db(), key)
+            except sqlite3.Error as e:
+                # Fail open: a broken limiter store must not block answers
+                logger.warning(f"⚠️ Rate limiter '{self.name}' check failed: {e}")
+                return True, 0.0
+
+    def _check(self, conn: sqlite3.Connection, key: str) -> Tuple[bool, float]:
+        # BEGIN IMMEDIATE takes the write lock up front, so read-modify-write
+        # is atomic across threads and worker processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE limiter = ? AND key = ?",
+                (self.name, key),
+            ).fetchone()
+            tokens, updated_at = row if row else (self.capacity, now)
+            tokens, allowed, wait_time = self._take(tokens, now - updated_at)
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (limiter, key, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                (self.name, key, tokens, now),
+            )
+
+            self._checks_since_eviction += 1
+            if self._checks_since_eviction >= _EVICTION_CHECK_INTERVAL:
+                self._checks_since_eviction = 0
+                conn.execute(
+                    "DELETE FROM buckets WHERE limiter = ? AND updated_at < ?",
+                    (self.name, now - self.idle_seconds),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return allowed, wait_time
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._db().execute(
+                "SELECT COUNT(*) FROM buckets WHERE limiter = ?", (self.name,)
+            ).fetchone()
+        return count
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, capacity: int = 8, refill_rate: float = 0.15) -> RateLimiter:
+    """
+    Get or create a named rate limiter, backed by RATE_LIMIT_BACKEND.
+
+    Args:
+        name: Limiter name (separates quotas in the shared store)
+        capacity: Burst size (requests allowed at once)
+        refill_rate: Requests regained per second
+
+    Returns:
+        Shared RateLimiter instance
+    """
+    with _limiters_lock:
+        if name not in _limiters:
+            cfg = settings()
+            backend = cfg["RATE_LIMIT_BACKEND"].lower()
+            if backend == "memory":
+                _limiters[name] = MemoryRateLimiter(capacity, refill_rate, cfg["RATE_LIMIT_MEMORY_MAX_ENTRIES"])
+            elif backend == "sqlite":
+                _limiters[name] = SQLiteRateLimiter(Path(cfg["RATE_LIMIT_DB_PATH"]), name, capacity, refill_rate)
+            else:
+                raise ValueError(f"❌ Unknown RATE_LIMIT_BACKEND '{backend}' (expected 'sqlite' or 'memory')")
+            logger.info(f"🚦 Rate limiter '{name}': {backend}")
+        return _limiters[name]
@@ -1,7 +1,9 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from .routers import core, texts, qa
+from .core.config import FeatureUnavailable
 from .core.logging_config import setup_logging
 
 
@@ -29,12 +31,21 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Audio-Id", "X-Next-Cursor", "ETag"],
     )
     
     # Note: GZIP compression removed due to compatibility issues
     # Can be added back later if needed with: pip install python-multipart
     # from starlette.middleware.gzip import GZipMiddleware (note: GZip not GZIP)
 
+    # Features whose API key is not configured answer 503 instead of failing the call
+    @app.exception_handler(FeatureUnavailable)
+    async def feature_unavailable(request: Request, exc: FeatureUnavailable) -> JSONResponse:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc), "feature": exc.feature, "missing": list(exc.missing)},
+        )
+
     # Routers
     app.include_router(core.router, tags=["core"])
     app.include_router(texts.router, prefix="/texts", tags=["texts"])
@@ -1,5 +1,10 @@
 from fastapi import APIRouter
 
+from ..core.cache import cache_stats
+from ..core.config import capabilities
+from ..core.llm_factory import llm_stats
+from ..services.audio import check_tts_health, get_tts_stats
+
 
 router = APIRouter()
 
@@ -9,3 +14,25 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+@router.get("/health/features")
+def health_features() -> dict:
+    """Which optional features are configured (false answers 503)."""
+    return capabilities()
+
+
+@router.get("/health/llm")
+def health_llm() -> dict:
+    """Calls and simulated latency per role when LLM_PROVIDER=fake."""
+    return llm_stats()
+
+
+@router.get("/health/cache")
+def health_cache() -> dict:
+    """Hit/miss counters for the response caches."""
+    return cache_stats()
+
+
+@router.get("/health/tts")
+def health_tts() -> dict:
+    """TTS client pool health, speaker cache counters and per-request overhead."""
+    return {"spaces": check_tts_health(), "stats": get_tts_stats()}
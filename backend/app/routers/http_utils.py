@@ -0,0 +1,16 @@
+from typing import Optional
+
+
+def _opaque_tag(tag: str) -> str:
+    # If-None-Match uses weak comparison: W/"x" and "x" name the same representation
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header (a list of ETags, or *) matches etag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return _opaque_tag(etag) in {_opaque_tag(tag) for tag in candidates}
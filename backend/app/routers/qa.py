@@ -1,15 +1,41 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
+from pathlib import Path
 from typing import List, Optional, Dict
 import base64
+import json
 import logging
-
-from ..services.simplifier import simplify_text
-from ..services.question_generator import generate_questions, generate_questions_batch
-from ..services.answer_evaluator import evaluate_answer
-from ..services.text_formatter import improve_formatting
-from ..services.audio import synthesize_audio, calculate_word_timings
+import re
+import time
+
+from ..core.config import FeatureUnavailable
+from ..core.llm_utils import llm_error_to_value_error
+from ..services.simplifier import (
+    join_simplified,
+    resolve_mode,
+    simplify_fragments_async,
+    simplify_text_async,
+    simplify_text_stream,
+)
+from ..services.question_generator import (
+    generate_questions_async,
+    generate_questions_batch_async,
+    generate_questions_batch_stream,
+)
+from ..services.answer_evaluator import evaluate_answer_async
+from ..services.text_formatter import improve_formatting_async
+from ..services.question_bank import lookup_batch, lookup_questions
+from ..services.audio import (
+    synthesize_audio,
+    calculate_word_timings,
+    clean_text_for_tts,
+    render_audio,
+    synthesize_audio_chunks,
+    get_audio_path,
+    get_word_timings,
+)
+from .http_utils import etag_matches
 
 logger = logging.getLogger(__name__)
 
@@ -22,31 +48,115 @@ class SimplifyRequest(BaseModel):
     text: str
     language: Optional[str] = "English"
     level: Optional[str] = "default"
+    mode: Optional[str] = None  # "auto" | "whole" | "fragments"; SIMPLIFY_MODE if unset
 
 
 class SimplifyResponse(BaseModel):
     text: str
+    # Fragments mode only: [{"original", "simplified"}] in text order
+    fragments: Optional[List[Dict[str, str]]] = None
 
 
 @router.post("/simplify", response_model=SimplifyResponse)
-def simplify(req: SimplifyRequest) -> SimplifyResponse:
-    result = simplify_text(req.text, lang=req.language or "English", level=req.level or "default")
+async def simplify(req: SimplifyRequest) -> SimplifyResponse:
+    lang = req.language or "English"
+    level = req.level or "default"
+    try:
+        mode = resolve_mode(req.text, req.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if mode == "fragments":
+        fragments = await simplify_fragments_async(req.text, lang=lang, level=level)
+        return SimplifyResponse(text=join_simplified(fragments), fragments=fragments)
+    result = await simplify_text_async(req.text, lang=lang, level=level, mode="whole")
     return SimplifyResponse(text=result)
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _llm_error_status(error_msg: str) -> int:
+    if "rate limit" in error_msg.lower() or "⏳" in error_msg:
+        return 429
+    if "API key" in error_msg or "🔑" in error_msg:
+        return 401
+    return 500
+
+
+@router.post("/simplify/stream")
+async def simplify_stream(req: SimplifyRequest, request: Request) -> Response:
+    """
+    Server-sent events variant of /simplify: relays text as DeepSeek
+    generates it (in fragments mode, one piece per simplified fragment).
+
+        event: text    data: {"text": "<next piece>"}
+        event: done    data: {}
+        event: error   data: {"detail": "..."}   (failure after the stream started)
+
+    Pieces are pulled only as fast as the client reads them, and a client
+    that disconnects closes the provider stream so generation stops.
+    """
+    try:
+        pieces = await simplify_text_stream(
+            req.text, lang=req.language or "English", level=req.level or "default", mode=req.mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Pull the first piece up front so provider errors still get a proper status
+    try:
+        first = await pieces.__anext__()
+    except StopAsyncIteration:
+        first = ""
+    except FeatureUnavailable:
+        raise
+    except Exception as e:
+        await pieces.aclose()
+        error_msg = str(llm_error_to_value_error(e, "simplify text"))
+        logger.error(f"Simplify stream failed: {error_msg}")
+        raise HTTPException(status_code=_llm_error_status(error_msg), detail=error_msg)
+
+    async def events():
+        sent = 0
+        try:
+            if first:
+                sent += 1
+                yield _sse("text", {"text": first})
+            async for piece in pieces:
+                if await request.is_disconnected():
+                    logger.info(f"🔌 Client left simplify stream after {sent} pieces, cancelling")
+                    return
+                sent += 1
+                yield _sse("text", {"text": piece})
+            yield _sse("done", {})
+        except Exception as e:
+            logger.error(f"Simplify stream failed mid-way: {e}")
+            yield _sse("error", {"detail": str(llm_error_to_value_error(e, "simplify text"))})
+        finally:
+            await pieces.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class FormatRequest(BaseModel):
     text: str
     language: Optional[str] = "English"
 
 
 @router.post("/format")
-def format_text(req: FormatRequest) -> dict:
-    return {"text": improve_formatting(req.text, req.language or "English")}
+async def format_text(req: FormatRequest) -> dict:
+    return {"text": await improve_formatting_async(req.text, req.language or "English")}
 
 
 class AudioRequest(BaseModel):
     text: str
     language: Optional[str] = "English"
+    speaker: Optional[str] = None
 
 
 @router.post("/audio")
@@ -60,11 +170,12 @@ def create_audio(req: AudioRequest) -> dict:
     }
     """
     language = req.language or "English"
-    audio_bytes = synthesize_audio(req.text, language)
+    audio_bytes = synthesize_audio(req.text, language, req.speaker)
     audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
     
-    # Calculate approximate word timings with language-specific speed and punctuation pauses
-    word_timings = calculate_word_timings(req.text, language)
+    # Calculate approximate word timings with language-specific speed and punctuation pauses,
+    # over the cleaned text that was spoken (as /qa/audio/render and /qa/audio/stream do)
+    word_timings = calculate_word_timings(clean_text_for_tts(req.text), language)
     
     return {
         "audio": audio_b64, 
@@ -73,6 +184,142 @@ def create_audio(req: AudioRequest) -> dict:
     }
 
 
+@router.post("/audio/render")
+def render_audio_resource(req: AudioRequest) -> dict:
+    """
+    Render TTS audio (or reuse the cached clip) and return its id.
+    Audio bytes and word timings are then fetched as separate resources,
+    so browsers can start playback while the audio is still downloading:
+    {
+        "id": "<sha256>",
+        "mime": "audio/mpeg",
+        "url": "/qa/audio/<id>",
+        "words_url": "/qa/audio/<id>/words"
+    }
+    """
+    try:
+        audio_id = render_audio(req.text, req.language or "English", req.speaker)
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return {
+        "id": audio_id,
+        "mime": "audio/mpeg",
+        "url": f"/qa/audio/{audio_id}",
+        "words_url": f"/qa/audio/{audio_id}/words",
+    }
+
+
+@router.post("/audio/stream")
+def stream_audio_chunks(req: AudioRequest) -> Response:
+    """
+    Chunked TTS: synthesize sentence chunks in parallel and stream them in
+    order, so playback starts after the first sentence instead of the whole
+    text. The X-Audio-Id header names the clip (the same id /qa/audio/render
+    returns for this text); once the stream completes, /qa/audio/<id> and
+    /qa/audio/<id>/words serve the full clip and timings.
+    """
+    audio_id, chunks = synthesize_audio_chunks(req.text, req.language or "English", req.speaker)
+    headers = {"X-Audio-Id": audio_id}
+
+    # Pull the first chunk up front so a failing TTS backend still gets a proper status
+    try:
+        first = next(chunks)
+    except StopIteration:
+        raise HTTPException(status_code=400, detail="No text to synthesize")
+    except ValueError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    def body():
+        yield first
+        yield from chunks
+
+    return StreamingResponse(body(), media_type="audio/mpeg", headers=headers)
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _stream_file(path: Path, media_type: str, etag: str, range_header: Optional[str]) -> Response:
+    """Stream a file with single-range (RFC 7233) support."""
+    file_size = path.stat().st_size
+    start, end = 0, file_size - 1
+    status_code = 200
+
+    # A malformed (or multi-range) header is ignored and the whole file sent (RFC 7233 3.1);
+    # only a well-formed range past the end of the file is answered with 416
+    match = _RANGE_RE.match(range_header.strip()) if range_header else None
+    first, last = (match.group(1), match.group(2)) if match else ("", "")
+    if first and last and int(first) > int(last):
+        first = last = ""
+    if first or last:
+        if first:
+            start = int(first)
+            if last:
+                end = min(int(last), file_size - 1)
+        else:
+            # Suffix range: last N bytes
+            start = max(0, file_size - int(last))
+        if start > end:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{file_size}"})
+        status_code = 206
+
+    def iter_file():
+        with path.open("rb") as file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(_STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(end - start + 1),
+        "ETag": etag,
+        # Content-addressed: the bytes behind an id never change
+        "Cache-Control": "public, max-age=31536000, immutable",
+    }
+    if status_code == 206:
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+
+    return StreamingResponse(iter_file(), status_code=status_code, media_type=media_type, headers=headers)
+
+
+@router.get("/audio/{audio_id}")
+def stream_audio(
+    audio_id: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+) -> Response:
+    """Stream rendered audio bytes with Range support."""
+    path = get_audio_path(audio_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    etag = f'"{audio_id}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        return _stream_file(path, "audio/mpeg", etag, range_header)
+    except FileNotFoundError:
+        # Evicted between lookup and open
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+
+@router.get("/audio/{audio_id}/words")
+def audio_words(audio_id: str) -> List[dict]:
+    """Word timings for a rendered clip."""
+    words = get_word_timings(audio_id)
+    if words is None:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    return words
+
+
 class QuestionsRequest(BaseModel):
     fragment: str
     previous_questions: List[str] = []
@@ -81,17 +328,25 @@ class QuestionsRequest(BaseModel):
 
 
 @router.post("/questions")
-def questions(req: QuestionsRequest) -> List[str]:
+async def questions(req: QuestionsRequest) -> List[str]:
+    # Library fragments are served from the precomputed bank
+    if not req.previous_questions:
+        banked = lookup_questions(req.fragment, req.language or "English", req.difficulty or "standard")
+        if banked is not None:
+            return list(banked)
+
     try:
         return [
             str(q)
-            for q in generate_questions(
+            for q in await generate_questions_async(
                 req.fragment,
                 req.previous_questions,
                 req.language or "English",
                 req.difficulty or "standard",
             )
         ]  # type: ignore
+    except FeatureUnavailable:
+        raise
     except ValueError as e:
         error_msg = str(e)
         logger.error(f"Question generation failed: {error_msg}")
@@ -119,18 +374,28 @@ class BatchQuestionsResponse(BaseModel):
     questions_by_fragment: Dict[int, List[str]]
     total_fragments: int
     total_api_calls: int
+    wall_time: Optional[float] = None
 
 
 @router.post("/questions/batch", response_model=BatchQuestionsResponse)
-def batch_questions(req: BatchQuestionsRequest) -> BatchQuestionsResponse:
+async def batch_questions(req: BatchQuestionsRequest) -> BatchQuestionsResponse:
     """
     Generate questions for all fragments in a single or few API calls.
     Provides full story context to the LLM for better question quality.
     """
+    banked = lookup_batch(req.fragments, req.language or "English", req.difficulty or "standard")
+    if banked is not None:
+        logger.info(f"📚 Batch questions for '{req.text_name}' served from question bank")
+        return BatchQuestionsResponse(
+            questions_by_fragment=banked,
+            total_fragments=len(req.fragments),
+            total_api_calls=0
+        )
+
     try:
         logger.info(f"Batch question generation for '{req.text_name}' ({len(req.fragments)} fragments)")
         
-        result = generate_questions_batch(
+        result = await generate_questions_batch_async(
             fragments=req.fragments,
             language=req.language or "English",
             difficulty=req.difficulty or "standard",
@@ -142,8 +407,11 @@ def batch_questions(req: BatchQuestionsRequest) -> BatchQuestionsResponse:
         return BatchQuestionsResponse(
             questions_by_fragment=result['questions_by_fragment'],
             total_fragments=len(req.fragments),
-            total_api_calls=result.get('api_calls', 1)
+            total_api_calls=result.get('api_calls', 1),
+            wall_time=result.get('wall_time')
         )
+    except FeatureUnavailable:
+        raise
     except ValueError as e:
         error_msg = str(e)
         logger.error(f"Batch question generation failed: {error_msg}")
@@ -159,6 +427,79 @@ def batch_questions(req: BatchQuestionsRequest) -> BatchQuestionsResponse:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@router.post("/questions/batch/stream")
+async def batch_questions_stream(req: BatchQuestionsRequest, request: Request) -> Response:
+    """
+    Server-sent events variant of /questions/batch: each fragment's
+    questions are sent as soon as the model has finished them, so reading
+    can start before the whole story is done.
+
+        event: fragment  data: {"index": 0, "questions": ["...", ...]}
+        event: done      data: {"total_fragments": 5, "wall_time": 2.4}
+        event: error     data: {"detail": "..."}   (failure after the stream started)
+
+    Fragments may arrive out of order (batches run concurrently); each is
+    sent exactly once. A client that disconnects stops the generation.
+    """
+    started = time.perf_counter()
+    language = req.language or "English"
+    difficulty = req.difficulty or "standard"
+
+    banked = lookup_batch(req.fragments, language, difficulty)
+    if banked is not None:
+        logger.info(f"📚 Batch questions for '{req.text_name}' served from question bank")
+
+        async def from_bank():
+            for idx, questions in sorted(banked.items()):
+                yield idx, questions
+
+        items = from_bank()
+    else:
+        logger.info(f"Streaming batch question generation for '{req.text_name}' ({len(req.fragments)} fragments)")
+        items = generate_questions_batch_stream(req.fragments, language, difficulty)
+
+    # Pull the first fragment up front so provider errors still get a proper status
+    try:
+        first = await items.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except FeatureUnavailable:
+        raise
+    except Exception as e:
+        await items.aclose()
+        error_msg = str(llm_error_to_value_error(e, "generate questions"))
+        logger.error(f"Batch question stream failed: {error_msg}")
+        raise HTTPException(status_code=_llm_error_status(error_msg), detail=error_msg)
+
+    async def events():
+        sent = 0
+        try:
+            if first is not None:
+                sent += 1
+                yield _sse("fragment", {"index": first[0], "questions": first[1]})
+            async for idx, questions in items:
+                if await request.is_disconnected():
+                    logger.info(f"🔌 Client left batch question stream after {sent} fragments, cancelling")
+                    return
+                sent += 1
+                yield _sse("fragment", {"index": idx, "questions": questions})
+            yield _sse("done", {
+                "total_fragments": len(req.fragments),
+                "wall_time": round(time.perf_counter() - started, 3),
+            })
+        except Exception as e:
+            logger.error(f"Batch question stream failed mid-way: {e}")
+            yield _sse("error", {"detail": str(llm_error_to_value_error(e, "generate questions"))})
+        finally:
+            await items.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 class EvaluateRequest(BaseModel):
     fragment: str
     question: str
@@ -169,10 +510,10 @@ class EvaluateRequest(BaseModel):
 
 
 @router.post("/evaluate")
-def evaluate(req: EvaluateRequest) -> dict:
+async def evaluate(req: EvaluateRequest) -> dict:
     try:
         # Pass userId if provided for rate limiting consistency
-        return evaluate_answer(
+        return await evaluate_answer_async(
             req.fragment,
             req.question,
             req.answer,
@@ -180,6 +521,8 @@ def evaluate(req: EvaluateRequest) -> dict:
             user_id=req.userId,
             strictness=req.strictness or 2,
         )  # type: ignore
+    except FeatureUnavailable:
+        raise
     except ValueError as e:
         error_msg = str(e)
         logger.error(f"Answer evaluation failed: {error_msg}")
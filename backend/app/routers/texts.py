@@ -1,33 +1,133 @@
-from typing import Dict, List, Optional
+import base64
+import binascii
+import json
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query, Response
 from pydantic import BaseModel
 
-from ..services.text_loader import load_texts
-from ..services.textsplitter import split_text_to_fragments
+from ..core.cache import make_cache_key
+from ..services.library_format import parts_dict
+from ..services.text_loader import get_library
+from ..services.textsplitter import split_from_token, split_text_cached
+from ..services.tokenizer import TokenizedDocument
+from ..services.upload_store import get_upload_store
+from .http_utils import etag_matches
 
 router = APIRouter()
 
-# ----- In-memory storage for uploaded texts (session-only) -----
-# Texts are stored only while the server is running
-# They are lost when the server restarts
-_session_uploads: List[dict] = []
+
+# ----- listing helpers -----
+
+# Fields selectable with ?fields=; fragmentCount is derived from parts
+TEXT_FIELDS = ("name", "language", "parts", "fragmentCount")
+DEFAULT_FIELDS = ["name", "language", "parts"]
+
+
+# A cursor names the last item returned: {"b": n} after the first n built-in
+# texts, or {"u": id} after the upload with that id. Uploads landing between
+# requests then never shift or repeat a page.
+
+def _encode_cursor(position: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[int], int]:
+    """(built-in texts to skip, or None if past them; upload id to list after)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded))
+        (kind, value), = position.items()
+    except (binascii.Error, ValueError, AttributeError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if kind not in ("b", "u") or not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return (value, 0) if kind == "b" else (None, value)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in selected if f not in TEXT_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(TEXT_FIELDS)})",
+        )
+    return selected
+
+
+def _project(item, fields: Optional[List[str]]) -> dict:
+    projected = {}
+    for field in fields or DEFAULT_FIELDS:
+        if field == "fragmentCount":
+            projected[field] = len(item["parts"])
+        elif field == "parts":
+            # Library parts live on disk; read each text's span once
+            projected[field] = parts_dict(item["parts"])
+        else:
+            projected[field] = item[field]
+    return projected
 
 
 # ----- endpoints -----
 
 @router.get("", response_model=List[dict])
-def list_texts(lang: str = "English") -> List[dict]:
+def list_texts(
+    response: Response,
+    lang: str = "English",
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+):
     """
-    Return all texts (built-in + uploaded) for a given language.
-    Shape: [{ name, language, parts }]
+    Return texts (built-in first, then uploaded) for a given language.
+    Shape: [{ name, language, parts }], or only the ?fields= requested,
+    e.g. fields=name,fragmentCount for the library picker.
+
+    Without limit the whole list is returned. With limit, the next page's
+    cursor is sent in the X-Next-Cursor header (absent on the last page).
+    The strong ETag changes whenever the library file or uploads change.
     """
-    base = load_texts(lang)  # Built-in sample texts
-    uploads = [
-        x for x in _session_uploads
-        if x.get("language", "").lower() == lang.lower()
-    ]
-    return base + uploads
+    library = get_library()
+    store = get_upload_store()
+    selected = _parse_fields(fields)
+    position, after_id = _decode_cursor(cursor) if cursor else (0, 0)
+
+    etag = '"{}"'.format(make_cache_key(
+        "texts", library.signature, store.version, lang.lower(), position, after_id, limit, selected,
+    )[:32])
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    base = library.texts(lang)  # Built-in sample texts
+    page = []
+    if position is not None:
+        page = list(base[position:position + limit] if limit else base[position:])
+    next_cursor = None
+    if limit is None:
+        page += store.list(lang, after_id)
+    elif len(page) == limit:
+        # Page filled by built-in texts; more follow if any built-in or upload is left
+        if position + limit < len(base):
+            next_cursor = {"b": position + limit}
+        elif store.list(lang, 0, 1):
+            next_cursor = {"u": 0}
+    else:
+        # One extra row tells whether another page follows
+        room = limit - len(page)
+        uploads = store.list(lang, after_id, room + 1)
+        page += uploads[:room]
+        if len(uploads) > room:
+            next_cursor = {"u": uploads[room - 1]["id"]}
+
+    response.headers["ETag"] = etag
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(next_cursor)
+
+    return [_project(item, selected) for item in page]
 
 
 @router.get("/{name}/parts", response_model=Dict[str, str])
@@ -35,10 +135,12 @@ def get_parts(name: str, lang: str = "English") -> Dict[str, str]:
     """
     Return the parts dict for a specific text name.
     """
-    texts = list_texts(lang)
-    for item in texts:
-        if item.get("name") == name:
-            return item.get("parts", {})
+    parts = get_library().get_parts(name, lang)
+    if parts is not None:
+        return parts_dict(parts)
+    upload = get_upload_store().get(name, lang)
+    if upload is not None:
+        return upload["parts"]
     raise HTTPException(status_code=404, detail="Text not found")
 
 
@@ -48,17 +150,26 @@ class UploadTextRequest(BaseModel):
     text: str
     autoSplit: Optional[bool] = True
     fragmentTargetTokens: Optional[int] = 400
+    splitToken: Optional[str] = None
 
 
 class FragmentPreviewRequest(BaseModel):
     text: str
     targetTokens: Optional[int] = 400
+    language: Optional[str] = "English"
 
 
 @router.post("/preview")
 def preview_fragments(req: FragmentPreviewRequest) -> dict:
+    """
+    Split a text without saving it.
+    Shape: { fragments, tokens, splitToken }. The split is cached briefly;
+    uploading the text with its splitToken stores exactly these fragments.
+    """
     target = req.targetTokens or 400
-    pieces = split_text_to_fragments(req.text, target_tokens=target)
+    # Tokenize once; the splitter and the per-fragment counts share it
+    doc = TokenizedDocument(req.text.strip())
+    pieces, split_token = split_text_cached(req.text, target, req.language or "English", doc=doc)
     if not pieces:
         # Last-resort: whole text as one fragment if non-empty
         cleaned = req.text.strip()
@@ -66,18 +177,22 @@ def preview_fragments(req: FragmentPreviewRequest) -> dict:
             pieces = [cleaned]
         else:
             raise HTTPException(status_code=400, detail="Empty text")
-    return {"fragments": pieces}
+    return {"fragments": pieces, "tokens": doc.count_fragments(pieces), "splitToken": split_token}
 
 
 @router.post("")
 def upload_text(req: UploadTextRequest) -> dict:
     """
-    Upload a new text for the current session only.
-    Text will be lost when server restarts.
+    Upload a new text. Stored in the configured upload store
+    (SQLite by default, shared by all workers).
+    A splitToken from /texts/preview reuses that split; if it expired or
+    the text changed, the text is split again.
     """
     target_tokens = req.fragmentTargetTokens or 400
     if req.autoSplit:
-        pieces = split_text_to_fragments(req.text, target_tokens=target_tokens)
+        pieces = split_from_token(req.splitToken, req.text) if req.splitToken else None
+        if pieces is None:
+            pieces, _ = split_text_cached(req.text, target_tokens, req.language)
         if not pieces:
             # Last-resort: whole text as one fragment if non-empty
             cleaned = req.text.strip()
@@ -89,9 +204,8 @@ def upload_text(req: UploadTextRequest) -> dict:
     else:
         parts = {"fragment 1": req.text}
 
-    # Store in memory only (session-only storage)
-    new_item = {"name": req.name, "language": req.language, "parts": parts}
-    _session_uploads.append(new_item)
+    store = get_upload_store()
+    new_item = store.add(req.name, req.language, parts)
     
-    print(f"📝 Uploaded text '{req.name}' for session (total uploads: {len(_session_uploads)})")
+    print(f"📝 Uploaded text '{req.name}' (total uploads: {store.count()})")
     return {"ok": True, "item": new_item}
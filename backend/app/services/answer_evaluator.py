@@ -2,57 +2,31 @@ import hashlib
 import json
 import logging
 import re
-import time
-from collections import defaultdict
+from typing import List
 from uuid import uuid4
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai.chat_models import ChatGoogleGenerativeAIError
-
-from backend.app.core.config import settings
-from backend.app.core.llm_factory import get_gemini_llm
-from backend.app.core.llm_utils import clean_llm_json_response
+from backend.app.core.config import require_feature
+from backend.app.core.llm_factory import Message, get_llm_provider
+from backend.app.core.llm_utils import clean_llm_json_response, llm_error_to_value_error
+from backend.app.core.rate_limit import get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
 
-_cfg = settings()
-
-# Use lazy-loaded LLM from factory
-def _get_llm():
-    return get_gemini_llm(temperature=0.7, top_p=0.7)
-
-
-class TokenBucketRateLimiter:
-    def __init__(self, capacity: int = 8, refill_rate: float = 0.15):
-        self.capacity = capacity
-        self.refill_rate = refill_rate
-        self.buckets = defaultdict(
-            lambda: {
-                "tokens": capacity,
-                "last_refill": time.time(),
-            }
-        )
+def _invoke(messages: List[Message]) -> str:
+    """Run a prompt through the evaluation provider (JSON mode)."""
+    return get_llm_provider("evaluation").complete(messages, json_mode=True)
 
-    def is_allowed(self, user_id: str) -> tuple[bool, float]:
-        now = time.time()
-        bucket = self.buckets[user_id]
 
-        time_passed = now - bucket["last_refill"]
-        tokens_to_add = time_passed * self.refill_rate
-        bucket["tokens"] = min(self.capacity, bucket["tokens"] + tokens_to_add)
-        bucket["last_refill"] = now
+async def _ainvoke(messages: List[Message]) -> str:
+    """Async variant of _invoke, bounded by the provider semaphore."""
+    return await get_llm_provider("evaluation").acomplete(messages, json_mode=True)
 
-        if bucket["tokens"] >= 1:
-            bucket["tokens"] -= 1
-            return True, 0
 
-        wait_time = (1 - bucket["tokens"]) / self.refill_rate
-        return False, wait_time
+# Answer evaluation: bursts of 8, then one answer every ~7 seconds per user
+EVALUATION_RATE_CAPACITY = 8
+EVALUATION_RATE_REFILL = 0.15
 
-
-_rate_limiter = TokenBucketRateLimiter(capacity=8, refill_rate=0.15)
 _DEFAULT_USER_ID = hashlib.md5(str(uuid4()).encode()).hexdigest()[:12]
 
 STRICTNESS_HINTS = {
@@ -68,37 +42,43 @@ def get_user_session_id(user_id: str | None = None) -> str:
     return _DEFAULT_USER_ID
 
 
-def evaluate_answer(
-    fragment,
-    question,
-    user_answer,
-    language="English",
-    user_id: str | None = None,
-    strictness: int = 2,
-):
-    print(f"🔍 Answer evaluation for language: {language}")
+def _evaluation_limiter():
+    return get_rate_limiter("evaluate", EVALUATION_RATE_CAPACITY, EVALUATION_RATE_REFILL)
 
-    uid = get_user_session_id(user_id)
-    allowed, wait_time = _rate_limiter.is_allowed(uid)
 
-    if not allowed:
-        if language.lower() == "latvian":
-            feedback = "Lūdzu, uzgaidiet brīdi pirms nākamās atbildes."
-        elif language.lower() == "spanish":
-            feedback = "Por favor, espera un momento antes de la siguiente respuesta."
-        elif language.lower() == "russian":
-            feedback = "Пожалуйста, подождите немного перед следующим ответом."
-        else:
-            feedback = "Please wait a moment before your next answer."
+def _check_rate_limit(language: str, user_id: str | None) -> dict | None:
+    """Return a localized rate-limited result, or None if the user may proceed."""
+    allowed, wait_time = _evaluation_limiter().is_allowed(get_user_session_id(user_id))
+    return None if allowed else _rate_limited_result(language, wait_time)
+
+
+async def _acheck_rate_limit(language: str, user_id: str | None) -> dict | None:
+    """Async variant of _check_rate_limit; the SQLite limiter runs in a thread."""
+    allowed, wait_time = await _evaluation_limiter().ais_allowed(get_user_session_id(user_id))
+    return None if allowed else _rate_limited_result(language, wait_time)
 
-        return {
-            "feedback": feedback,
-            "correct_snippet": "",
-            "correct": False,
-            "rate_limited": True,
-            "wait_time": wait_time,
-        }
 
+def _rate_limited_result(language: str, wait_time: float) -> dict:
+    """Localized answer telling the user to wait."""
+    if language.lower() == "latvian":
+        feedback = "Lūdzu, uzgaidiet brīdi pirms nākamās atbildes."
+    elif language.lower() == "spanish":
+        feedback = "Por favor, espera un momento antes de la siguiente respuesta."
+    elif language.lower() == "russian":
+        feedback = "Пожалуйста, подождите немного перед следующим ответом."
+    else:
+        feedback = "Please wait a moment before your next answer."
+
+    return {
+        "feedback": feedback,
+        "correct_snippet": "",
+        "correct": False,
+        "rate_limited": True,
+        "wait_time": wait_time,
+    }
+
+
+def _build_evaluation_prompt(fragment, question, user_answer, language, strictness) -> List[Message]:
     level_hint = STRICTNESS_HINTS.get(strictness, STRICTNESS_HINTS[2])
 
     if language.lower() == "latvian":
@@ -106,7 +86,7 @@ def evaluate_answer(
             "Tu esi skolotājs, kas īsi vērtē bērna atbildi. "
             "Atbildi TIKAI kā JSON objektu. Nekādus ```json vai komentārus neliec. "
             "Bez komentāriem vai papildu teksta. "
-            "JSON struktūra: {{\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}}. "
+            "JSON struktūra: {\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}. "
             "• 'feedback' - īss teikums par atbildi. "
             "• 'correct_snippet' - ĪSS citāts no Teksta (maksimums 20 vārdi), kas pierāda pareizo atbildi. "
             "  Izvēlies mazāko iespējamo frāzi, kas satur galveno informāciju, nevis veselu rindkopu. "
@@ -118,7 +98,7 @@ def evaluate_answer(
             "Eres un maestro que evalúa respuestas de niños. "
             "Responde SOLO como un objeto JSON. No agregues ```json o comentarios. "
             "Sin comentarios o texto adicional. "
-            "Formato JSON: {{\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}}. "
+            "Formato JSON: {\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}. "
             "• 'feedback' - oración breve sobre la respuesta. "
             "• 'correct_snippet' - una cita CORTA del Texto (máximo 20 palabras) que prueba la respuesta correcta. "
             "  Elige la frase más pequeña posible que contenga la información clave, no un párrafo completo. "
@@ -131,7 +111,7 @@ def evaluate_answer(
             "Ты учитель, который оценивает ответы детей. "
             "Отвечай ТОЛЬКО в виде JSON объекта. Не добавляй ```json или комментарии. "
             "Без комментариев или дополнительного текста. "
-            "Формат JSON: {{\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}}. "
+            "Формат JSON: {\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}. "
             "• 'feedback' - краткое предложение об ответе. "
             "• 'correct_snippet' - КОРОТКАЯ цитата из Текста (максимум 20 слов), доказывающая правильный ответ. "
             "  Выбери минимально возможную фразу, содержащую ключевую информацию, а не целый абзац. "
@@ -144,7 +124,7 @@ def evaluate_answer(
             "You are a teacher evaluating a child's answer. "
             "Respond ONLY as a JSON object. No ```json or comments. "
             "No additional commentary or text. "
-            "JSON format: {{\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}}. "
+            "JSON format: {\"feedback\":\"...\",\"correct_snippet\":\"...\",\"correct\":true/false}. "
             "• 'feedback' - a short sentence about the answer. "
             "• 'correct_snippet' - a SHORT quote from the Text (max 20 words) that proves the correct answer. "
             "  Choose the smallest possible phrase that contains the key information, not a whole paragraph. "
@@ -152,31 +132,66 @@ def evaluate_answer(
             f" {level_hint}"
         )
 
-    prompt = ChatPromptTemplate.from_messages([
+    return [
         ("system", system_msg),
-        ("human", f"Text:\n{fragment}\n\nQuestion:\n{question}\n\nChild's answer:\n{user_answer}"),
-    ])
+        ("user", f"Text:\n{fragment}\n\nQuestion:\n{question}\n\nChild's answer:\n{user_answer}"),
+    ]
+
+
+def evaluate_answer(
+    fragment,
+    question,
+    user_answer,
+    language="English",
+    user_id: str | None = None,
+    strictness: int = 2,
+):
+    print(f"🔍 Answer evaluation for language: {language}")
+
+    # Unconfigured feature: fail before spending the user's rate-limit token
+    require_feature("evaluation")
+    rate_limited = _check_rate_limit(language, user_id)
+    if rate_limited:
+        return rate_limited
+
+    prompt = _build_evaluation_prompt(fragment, question, user_answer, language, strictness)
 
     try:
-        response = (prompt | _get_llm() | StrOutputParser()).invoke({})
-    except ChatGoogleGenerativeAIError as e:
-        error_msg = str(e)
-        logger.error(f"Gemini API error: {error_msg}")
-        
-        # Check for rate limit error
-        if "RESOURCE_EXHAUSTED" in error_msg or "429" in error_msg:
-            raise ValueError(
-                "⏳ API rate limit exceeded. Please wait a few moments and try again. "
-                "If this persists, consider upgrading your Gemini API plan."
-            )
-        elif "PERMISSION_DENIED" in error_msg or "API key" in error_msg:
-            raise ValueError("🔑 API key error. Please check your Gemini API key configuration.")
-        else:
-            raise ValueError(f"❌ API error: {error_msg}")
+        response = _invoke(prompt)
+    except Exception as e:
+        raise llm_error_to_value_error(e, "evaluate answer")
+
+    return _parse_evaluation(response, language)
+
+
+async def evaluate_answer_async(
+    fragment,
+    question,
+    user_answer,
+    language="English",
+    user_id: str | None = None,
+    strictness: int = 2,
+):
+    """Async variant of evaluate_answer for the async /qa endpoints."""
+    print(f"🔍 Answer evaluation for language: {language}")
+
+    # Unconfigured feature: fail before spending the user's rate-limit token
+    require_feature("evaluation")
+    rate_limited = await _acheck_rate_limit(language, user_id)
+    if rate_limited:
+        return rate_limited
+
+    prompt = _build_evaluation_prompt(fragment, question, user_answer, language, strictness)
+
+    try:
+        response = await _ainvoke(prompt)
     except Exception as e:
-        logger.error(f"Unexpected error during answer evaluation: {e}")
-        raise ValueError(f"❌ Failed to evaluate answer: {str(e)}")
+        raise llm_error_to_value_error(e, "evaluate answer")
 
+    return _parse_evaluation(response, language)
+
+
+def _parse_evaluation(response: str, language: str) -> dict:
     logger.info("🟡 Raw LLM Response received")
     logger.info(f"🌐 Expected language: {language}")
 
@@ -257,5 +272,3 @@ def evaluate_answer(
             "wait_time": 0,
             "error": str(e),
         }
-
-
@@ -1,16 +1,22 @@
+import io
 import re
+import threading
 import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+from operator import add
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Callable, Iterator, List, Dict, Optional
 
-import requests
-import pyphen
-from gradio_client import Client
+from backend.app.core.cache import get_blob_cache, get_cache, make_cache_key
+from backend.app.core.config import feature_enabled, settings
 
-from backend.app.core.config import settings
+if TYPE_CHECKING:
+    from gradio_client import Client
+    from pyphen import Pyphen
 
-_cfg = settings()
-HF_API_TOKEN = _cfg["HF_API_TOKEN"]
 
 TTS_CONFIG = {
     "English": {
@@ -39,14 +45,38 @@ TTS_CONFIG = {
     },
 }
 
-# Initialize hyphenators for your languages (do this once, globally)
-HYPHENATORS = {
-    "English": pyphen.Pyphen(lang='en_US'),
-    "Latvian": pyphen.Pyphen(lang='lv_LV'),
-    "Spanish": pyphen.Pyphen(lang='es_ES'),
-    "Russian": pyphen.Pyphen(lang='ru_RU'),
+# Default speakers for each language
+DEFAULT_SPEAKERS = {
+    "English": "Jenny",
+    "Spanish": "Elena",
+    "Russian": "Svetlana",
+    "Latvian": "Nils",
 }
 
+# HF router models used when the primary Space fails
+FALLBACK_MODELS = {
+    "English": "facebook/mms-tts-eng",
+    "Russian": "facebook/mms-tts-rus",
+    "Spanish": "facebook/mms-tts-spa",
+    "Latvian": "facebook/mms-tts-lav",
+}
+
+# pyphen dictionaries per language, loaded on first use
+HYPHENATOR_LANGS = {
+    "English": "en_US",
+    "Latvian": "lv_LV",
+    "Spanish": "es_ES",
+    "Russian": "ru_RU",
+}
+
+
+@lru_cache(maxsize=None)
+def get_hyphenator(language: str) -> "Pyphen":
+    """Hyphenator for a language (English if unknown), built once per process."""
+    import pyphen
+
+    return pyphen.Pyphen(lang=HYPHENATOR_LANGS.get(language, HYPHENATOR_LANGS["English"]))
+
 
 def clean_text_for_tts(text: str) -> str:
     """
@@ -135,63 +165,197 @@ def process_audio_result(result) -> bytes | None:
         return None
 
 
-def generate_audio_multilingual_tts(text: str, language_code: str) -> bytes | None:
-    """
-    Generate audio using MohamedRashad/Multilingual-TTS space.
-    Based on working Streamlit implementation.
-    """
+# ----- Gradio client pool and speaker cache -----
+# Creating a Client performs a Space handshake, and /get_speakers is an extra
+# remote round trip, so both are reused across requests.
+
+_clients: Dict[str, "Client"] = {}
+_client_failures: Dict[str, int] = {}
+_clients_lock = threading.Lock()
+
+_speaker_cache: Dict[tuple, tuple] = {}
+
+_tts_stats = {
+    "requests": 0,
+    "client_inits": 0,
+    "reconnects": 0,
+    "speaker_lookups": 0,
+    "speaker_cache_hits": 0,
+    "overhead_seconds": 0.0,
+    "synthesis_seconds": 0.0,
+}
+_stats_lock = threading.Lock()
+
+
+def _record(**increments) -> None:
+    with _stats_lock:
+        for key, value in increments.items():
+            _tts_stats[key] += value
+
+
+def _get_client(space_name: str) -> "Client":
+    """Return the pooled client for a Space, creating it on first use."""
+    client = _clients.get(space_name)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(space_name)
+        if client is None:
+            from gradio_client import Client
+
+            print(f"🔌 Connecting to Space {space_name}...")
+            client = Client(space_name)
+            _clients[space_name] = client
+            _client_failures[space_name] = 0
+            _record(client_inits=1)
+        return client
+
+
+def _drop_client(space_name: str) -> None:
+    """Forget a broken client so the next call reconnects."""
+    with _clients_lock:
+        _clients.pop(space_name, None)
+        _client_failures[space_name] = _client_failures.get(space_name, 0) + 1
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """True for failures a fresh client can fix: dropped connections and lost Space sessions."""
+    import httpx
+
+    if isinstance(error, (httpx.TransportError, ConnectionError)):
+        return True
+    # gradio_client reports a restarted Space (session gone) as a bare ValueError
+    return isinstance(error, ValueError) and str(error) == "Server stopped."
+
+
+def _predict(space_name: str, **kwargs):
+    """Call the Space with the pooled client, reconnecting once on a connection failure."""
+    try:
+        return _get_client(space_name).predict(**kwargs)
+    except Exception as e:
+        if not _is_connection_error(e):
+            raise
+        print(f"⚠️ Space call failed ({e}), reconnecting to {space_name}...")
+        _drop_client(space_name)
+        _record(reconnects=1)
+        return _get_client(space_name).predict(**kwargs)
+
+
+def _lookup_speaker(space_name: str, language_code: str) -> str | None:
+    """Ask the Space for its speakers and return the first one, or None."""
+    speaker = None
+    _record(speaker_lookups=1)
+    
+    # Try to get available speakers for the language
     try:
-        client = Client("MohamedRashad/Multilingual-TTS")
+        speakers_result = _predict(
+            space_name,
+            language=language_code,
+            api_name="/get_speakers"
+        )
+        print(f"🔍 Raw speakers result for {language_code}: {speakers_result}")
         
-        # Default speakers for each language
-        default_speakers = {
-            "English": "Jenny",
-            "Spanish": "Elena",
-            "Russian": "Svetlana",
-            "Latvian": "Nils",
-        }
-        speaker = None
+        # Parse the speaker result - it returns a complex object
+        if isinstance(speakers_result, dict):
+            # Extract choices from the response
+            choices = speakers_result.get('choices', [])
+            if choices and len(choices) > 0:
+                # Each choice is a list like ['Elena', 'Elena'], take the first element
+                speaker = choices[0][0] if isinstance(choices[0], list) else choices[0]
+            elif 'value' in speakers_result:
+                speaker = speakers_result['value']
+        elif isinstance(speakers_result, list) and len(speakers_result) > 0:
+            # If it's a simple list, take the first speaker
+            speaker = speakers_result[0]
         
-        # Try to get available speakers for the language
+        print(f"✅ Selected speaker for {language_code}: {speaker}")
+    except Exception as e:
+        print(f"⚠️ Could not get speakers for {language_code}, using default: {e}")
+    
+    return speaker
+
+
+def _get_speaker(space_name: str, language_code: str) -> str:
+    """Speaker for a language, cached for TTS_SPEAKER_CACHE_TTL seconds."""
+    key = (space_name, language_code)
+    cached = _speaker_cache.get(key)
+    if cached and cached[1] > time.time():
+        _record(speaker_cache_hits=1)
+        return cached[0]
+    
+    speaker = _lookup_speaker(space_name, language_code)
+    if speaker:
+        _speaker_cache[key] = (speaker, time.time() + settings()["TTS_SPEAKER_CACHE_TTL"])
+        return speaker
+    
+    # Ensure we have a speaker - use default if needed
+    speaker = DEFAULT_SPEAKERS.get(language_code, "Jenny")
+    print(f"📌 Using default speaker: {speaker}")
+    return speaker
+
+
+def get_tts_stats() -> dict:
+    """Client pool / speaker cache counters and measured per-request overhead."""
+    with _stats_lock:
+        stats = dict(_tts_stats)
+    requests_made = stats["requests"] or 1
+    stats["avg_overhead_ms"] = round(stats.pop("overhead_seconds") / requests_made * 1000, 1)
+    stats["avg_synthesis_ms"] = round(stats.pop("synthesis_seconds") / requests_made * 1000, 1)
+    stats["connected_spaces"] = sorted(_clients)
+    stats["client_failures"] = dict(_client_failures)
+    return stats
+
+
+def check_tts_health() -> dict:
+    """Verify each pooled client can still reach its Space; drop dead ones."""
+    health = {}
+    for space_name in list(_clients):
         try:
-            speakers_result = client.predict(
-                language=language_code,
-                api_name="/get_speakers"
-            )
-            print(f"🔍 Raw speakers result for {language_code}: {speakers_result}")
-            
-            # Parse the speaker result - it returns a complex object
-            if isinstance(speakers_result, dict):
-                # Extract choices from the response
-                choices = speakers_result.get('choices', [])
-                if choices and len(choices) > 0:
-                    # Each choice is a list like ['Elena', 'Elena'], take the first element
-                    speaker = choices[0][0] if isinstance(choices[0], list) else choices[0]
-                elif 'value' in speakers_result:
-                    speaker = speakers_result['value']
-            elif isinstance(speakers_result, list) and len(speakers_result) > 0:
-                # If it's a simple list, take the first speaker
-                speaker = speakers_result[0]
-            
-            print(f"✅ Selected speaker for {language_code}: {speaker}")
+            _clients[space_name].view_api(print_info=False)
+            health[space_name] = "ok"
         except Exception as e:
-            print(f"⚠️ Could not get speakers for {language_code}, using default: {e}")
+            _drop_client(space_name)
+            health[space_name] = f"reconnect pending: {e}"
+    return health
+
+
+def generate_audio_multilingual_tts(
+    text: str,
+    language_code: str,
+    speaker: str | None = None,
+    space_name: str = "MohamedRashad/Multilingual-TTS",
+) -> bytes | None:
+    """
+    Generate audio using MohamedRashad/Multilingual-TTS space.
+    Based on working Streamlit implementation.
+    If no speaker is given, the Space's first speaker (cached) is used.
+    """
+    try:
+        started = time.perf_counter()
+        _get_client(space_name)
         
-        # Ensure we have a speaker - use default if needed
         if not speaker:
-            speaker = default_speakers.get(language_code, "Jenny")
-            print(f"📌 Using default speaker: {speaker}")
+            speaker = _get_speaker(space_name, language_code)
+        
+        overhead = time.perf_counter() - started
         
         print(f"🎤 Final speaker selection: {speaker} for {language_code}")
         
         # Generate the TTS audio
-        result = client.predict(
+        result = _predict(
+            space_name,
             text=text,
             language_code=language_code,
             speaker=speaker,
             tashkeel_checkbox=False,  # Arabic text processing, not needed
             api_name="/text_to_speech_edge"
         )
+        _record(
+            requests=1,
+            overhead_seconds=overhead,
+            synthesis_seconds=time.perf_counter() - started - overhead,
+        )
         
         print(f"📦 TTS result type: {type(result)}, content preview: {str(result)[:100]}")
         
@@ -243,9 +407,11 @@ def _hf_router_tts(text: str, model_id: str) -> bytes | None:
     """
     Fallback TTS using HuggingFace router API.
     """
+    import requests
+
     url = f"https://router.huggingface.co/hf-inference/models/{model_id}"
     headers = {
-        "Authorization": f"Bearer {HF_API_TOKEN}",
+        "Authorization": f"Bearer {settings()['HF_API_TOKEN']}",
         "Content-Type": "application/json"
     }
     
@@ -271,7 +437,7 @@ def _hf_router_tts(text: str, model_id: str) -> bytes | None:
         return None
 
 
-def generate_audio_hf_api(text: str, language: str = "English") -> bytes | None:
+def generate_audio_hf_api(text: str, language: str = "English", speaker: str | None = None) -> bytes | None:
     """
     Generate audio using appropriate HuggingFace API based on language.
     """
@@ -281,54 +447,428 @@ def generate_audio_hf_api(text: str, language: str = "English") -> bytes | None:
     cfg = TTS_CONFIG.get(language, TTS_CONFIG["English"])
     
     if cfg["service"] == "multilingual_tts":
-        return generate_audio_multilingual_tts(text, cfg["language_code"])
+        return generate_audio_multilingual_tts(text, cfg["language_code"], speaker, cfg["space_name"])
     else:
         print(f"⚠️ Unsupported language in TTS_CONFIG: {language}")
         return None
 
 
-def synthesize_audio(text: str, language: str = "English") -> bytes:
+def _audio_cache():
+    return get_blob_cache("audio", max_bytes=settings()["AUDIO_CACHE_MAX_MB"] * 1024 * 1024, suffix=".mp3")
+
+
+def audio_cache_key(clean_text: str, language: str, speaker: str | None, backend: str) -> str:
+    """Content hash identifying one rendered clip."""
+    return make_cache_key("tts", clean_text, language, speaker or "auto", backend)
+
+
+def _backend_keys(clean: str, language: str, speaker: str | None) -> tuple[str, str | None]:
+    """Cache keys for the primary Space and the HF router fallback."""
+    cfg = TTS_CONFIG.get(language, TTS_CONFIG["English"])
+    primary = audio_cache_key(clean, language, speaker, f"{cfg['service']}:{cfg['space_name']}")
+    model = FALLBACK_MODELS.get(language)
+    fallback = audio_cache_key(clean, language, None, f"hf_router:{model}") if model else None
+    return primary, fallback
+
+
+def _fallback_marks():
+    # Fallback clips are only reused for TTS_FALLBACK_CACHE_TTL, so the primary Space is retried later
+    cfg = settings()
+    return get_cache(
+        "audio_fallback",
+        max_entries=1024,
+        ttl_seconds=cfg["TTS_FALLBACK_CACHE_TTL"],
+        disk=cfg["RESPONSE_CACHE_DISK"],
+    )
+
+
+def _cached_clip_key(clean: str, language: str, speaker: str | None) -> str | None:
+    """Key of a usable cached clip: the primary one, else a recent fallback one."""
+    primary_key, fallback_key = _backend_keys(clean, language, speaker)
+    cache = _audio_cache()
+    if cache.get_path(primary_key):
+        return primary_key
+    if fallback_key and _fallback_marks().get(fallback_key) and cache.get_path(fallback_key):
+        return fallback_key
+    return None
+
+
+def _render(clean: str, language: str, speaker: str | None, cache_result: bool = True) -> tuple[str, bytes]:
+    """
+    Return (audio_id, audio bytes) for cleaned text, using the disk cache.
+    The audio_id is the cache key of whichever backend produced the clip.
+    With cache_result=False a new clip is not stored (e.g. a chunk that is
+    only kept as part of the joined clip).
+    """
+    primary_key, fallback_key = _backend_keys(clean, language, speaker)
+    
+    cache = _audio_cache()
+    key = _cached_clip_key(clean, language, speaker)
+    if key:
+        cached = cache.get(key)
+        if cached:
+            print(f"💾 TTS cache hit for {language} ({len(cached)} bytes)")
+            return key, cached
+    
+    audio = generate_audio_hf_api(clean, language, speaker)
+    if audio:
+        if cache_result:
+            cache.set(primary_key, audio)
+        return primary_key, audio
+    
+    # Fallbacks via HF router for all languages if primary fails (needs HF_API_TOKEN)
+    if not feature_enabled("tts_fallback"):
+        raise ValueError(f"TTS generation failed for language={language} (HF fallback disabled: no HF_API_TOKEN)")
+    print(f"🔄 Primary TTS failed for {language}, trying HF router fallback...")
+    
+    model = FALLBACK_MODELS.get(language)
+    if model:
+        audio = _hf_router_tts(clean, model)
+    
+    if not audio:
+        raise ValueError(f"TTS generation failed for language={language}")
+    
+    if cache_result:
+        cache.set(fallback_key, audio)
+        _fallback_marks().set(fallback_key, True)
+    return fallback_key, audio
+
+
+def synthesize_audio(text: str, language: str = "English", speaker: str | None = None) -> bytes:
     """
     Clean text and generate TTS audio bytes for the given language.
+    Rendered clips are cached on disk, so repeat plays are a file read.
     Raise ValueError with a helpful message if generation fails.
     """
+    _, audio = _render(clean_text_for_tts(text), language, speaker)
+    return audio
+
+
+# ----- Addressable audio resources (streamed by /qa/audio/{audio_id}) -----
+
+_AUDIO_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _word_timings_cache():
+    return get_cache("audio_words", max_entries=512, disk=settings()["RESPONSE_CACHE_DISK"])
+
+
+def render_audio(text: str, language: str = "English", speaker: str | None = None) -> str:
+    """
+    Make sure audio and word timings for text exist and return their audio_id.
+    Cached clips are not read into memory; they are streamed from disk later.
+    """
     clean = clean_text_for_tts(text)
-    audio = generate_audio_hf_api(clean, language)
+    audio_id = _cached_clip_key(clean, language, speaker)
+    if audio_id is None:
+        audio_id, _ = _render(clean, language, speaker)
     
-    # Fallbacks via HF router for all languages if primary fails
-    if audio is None:
-        print(f"🔄 Primary TTS failed for {language}, trying HF router fallback...")
-        
-        fallback_models = {
-            "English": "facebook/mms-tts-eng",
-            "Russian": "facebook/mms-tts-rus",
-            "Spanish": "facebook/mms-tts-spa",
-            "Latvian": "facebook/mms-tts-lav",
-        }
-        
-        model = fallback_models.get(language)
-        if model:
-            audio = _hf_router_tts(clean, model)
+    timings = _word_timings_cache()
+    if timings.get(audio_id) is None:
+        # Time the text that was spoken, the same one the audio_id hashes
+        timings.set(audio_id, calculate_word_timings(clean, language))
     
-    if not audio:
-        raise ValueError(f"TTS generation failed for language={language}")
+    return audio_id
+
+
+def get_audio_path(audio_id: str) -> Path | None:
+    """Path of a rendered clip, or None if the id is unknown or evicted."""
+    if not _AUDIO_ID_RE.match(audio_id):
+        return None
+    return _audio_cache().get_path(audio_id)
+
+
+def get_word_timings(audio_id: str) -> List[Dict] | None:
+    """Word timings stored for a rendered clip, or None if unknown."""
+    if not _AUDIO_ID_RE.match(audio_id):
+        return None
+    return _word_timings_cache().get(audio_id)
+
+
+# ----- Sentence-chunked pipelined synthesis -----
+
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Layer III bitrate tables (kbps) for MPEG-1 and MPEG-2/2.5
+_MP3_BITRATES = {
+    "mpeg1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "mpeg2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Sample rates by version bits (3 = MPEG-1, 2 = MPEG-2, 0 = MPEG-2.5)
+_MP3_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def split_tts_chunks(clean_text: str, max_chars: int | None = None) -> List[str]:
+    """Group sentences of cleaned text into chunks of at most ~max_chars."""
+    max_chars = max_chars or settings()["TTS_CHUNK_CHARS"]
+    sentences = [s for s in _SENTENCE_END_RE.split(clean_text) if s]
+    
+    chunks: List[str] = []
+    current = ""
+    for sentence in sentences:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
     
-    return audio
+    return chunks
 
 
-def count_syllables(word: str, language: str) -> int:
-    """Count syllables in a word using pyphen."""
-    # Remove punctuation for syllable counting
-    clean_word = re.sub(r'[^\w]', '', word)
+def _id3_size(data: bytes) -> int:
+    """Length of a leading ID3v2 tag (syncsafe size), 0 if there is none."""
+    if data[:3] == b"ID3" and len(data) >= 10:
+        return 10 + ((data[6] & 0x7F) << 21 | (data[7] & 0x7F) << 14 | (data[8] & 0x7F) << 7 | (data[9] & 0x7F))
+    return 0
+
+
+def _is_mp3(data: bytes) -> bool:
+    pos = _id3_size(data)
+    return len(data) >= pos + 2 and data[pos] == 0xFF and (data[pos + 1] & 0xE0) == 0xE0
+
+
+def join_audio_chunks(parts: List[bytes]) -> bytes | None:
+    """
+    One playable clip from consecutive chunks, or None if they can't be joined.
+    MP3 frames concatenate as they are (tags between chunks are dropped); WAV
+    chunks each carry a header, so their frames are decoded and rewritten
+    under a single one. Other formats (e.g. FLAC) would need re-encoding.
+    """
+    if all(part[:4] == b"RIFF" for part in parts):
+        frames = []
+        params = None
+        try:
+            for part in parts:
+                with wave.open(io.BytesIO(part)) as wav:
+                    if params is None:
+                        params = wav.getparams()
+                    elif wav.getparams()[:3] != params[:3]:  # channels, sample width, rate
+                        return None
+                    frames.append(wav.readframes(wav.getnframes()))
+        except (wave.Error, EOFError):
+            return None
+        out = io.BytesIO()
+        with wave.open(out, "wb") as wav:
+            wav.setnchannels(params.nchannels)
+            wav.setsampwidth(params.sampwidth)
+            wav.setframerate(params.framerate)
+            wav.writeframes(b"".join(frames))
+        return out.getvalue()
+    
+    if all(_is_mp3(part) for part in parts):
+        joined = []
+        for i, part in enumerate(parts):
+            if i > 0:
+                part = part[_id3_size(part):]
+            if i < len(parts) - 1 and part[-128:-125] == b"TAG":
+                part = part[:-128]  # ID3v1 trailer
+            joined.append(part)
+        return b"".join(joined)
+    
+    return None
+
+
+def estimate_audio_duration(data: bytes) -> float | None:
+    """
+    Duration in seconds of an MP3 (frame walk) or WAV clip, or None if unknown.
+    """
+    if data[:4] == b"RIFF":
+        try:
+            with wave.open(io.BytesIO(data)) as wav:
+                return wav.getnframes() / float(wav.getframerate())
+        except (wave.Error, EOFError):
+            return None
     
-    if not clean_word:
-        return 1
+    pos = _id3_size(data)
+    duration = 0.0
+    frames = 0
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+            pos += 1
+            continue
+        version = (data[pos + 1] >> 3) & 0x3
+        layer = (data[pos + 1] >> 1) & 0x3
+        bitrate_idx = (data[pos + 2] >> 4) & 0xF
+        rate_idx = (data[pos + 2] >> 2) & 0x3
+        padding = (data[pos + 2] >> 1) & 0x1
+        if version == 1 or layer != 1 or bitrate_idx in (0, 15) or rate_idx == 3:
+            pos += 1
+            continue
+        
+        mpeg1 = version == 3
+        bitrate = _MP3_BITRATES["mpeg1" if mpeg1 else "mpeg2"][bitrate_idx] * 1000
+        sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+        duration += (1152 if mpeg1 else 576) / sample_rate
+        frames += 1
+        pos += (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+    
+    return duration if frames else None
+
+
+def merge_chunk_timings(chunks: List[str], durations: List[float | None], language: str) -> List[Dict]:
+    """
+    Word timings for consecutive chunks, each offset by the real length of
+    the audio before it so highlighting stays in sync across chunks.
+    """
+    merged: List[Dict] = []
+    offset = 0.0
+    for chunk, duration in zip(chunks, durations):
+        timings = calculate_word_timings(chunk, language, estimated_duration=duration)
+        for timing in timings:
+            merged.append({
+                'word': timing['word'],
+                'start': round(timing['start'] + offset, 2),
+                'end': round(timing['end'] + offset, 2),
+            })
+        if duration is None:
+            duration = timings[-1]['end'] if timings else 0.0
+        offset += duration
+    return merged
+
+
+def _pipeline(chunks: List[str], language: str, speaker: str | None, clean: str) -> Iterator[bytes]:
+    """
+    Synthesize chunks concurrently and yield them in order as soon as each is ready.
+    When every chunk is done, the joined clip and merged timings are cached
+    under the primary clip key of the whole text, the same one render_audio uses;
+    chunks are not cached on their own.
+
+    If the first chunk fails the error is raised (before any audio is sent);
+    a later failure ends the stream early and nothing is cached.
+    """
+    max_workers = max(1, min(len(chunks), settings()["TTS_MAX_CONCURRENCY"]))
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    parts: List[bytes] = []
+    keys: List[str] = []
+    try:
+        futures = [pool.submit(_render, chunk, language, speaker, False) for chunk in chunks]
+        for i, future in enumerate(futures):
+            try:
+                key, audio = future.result()
+            except ValueError as e:
+                if not parts:
+                    raise
+                # Audio is already on the wire: stop here rather than fail mid-response
+                print(f"❌ TTS chunk {i + 1}/{len(chunks)} failed, ending the stream early: {e}")
+                return
+            print(f"🎧 TTS chunk {i + 1}/{len(chunks)} ready ({len(audio)} bytes)")
+            parts.append(audio)
+            keys.append(key)
+            yield audio
+    finally:
+        # Client gone or chunk failed: don't start chunks nobody will hear
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    if not parts:
+        return
+    # A clip with fallback chunks must not be stored as the primary backend's clip
+    if any(key != _backend_keys(chunk, language, speaker)[0] for chunk, key in zip(chunks, keys)):
+        print("⚠️ Some TTS chunks came from the fallback; full clip not cached")
+        return
+    clip = join_audio_chunks(parts)
+    if clip is None:
+        print("⚠️ TTS chunks can't be joined into one clip; full clip not cached")
+        return
+    
+    audio_id, _ = _backend_keys(clean, language, speaker)
+    durations = [estimate_audio_duration(part) for part in parts]
+    _audio_cache().set(audio_id, clip)
+    _word_timings_cache().set(audio_id, merge_chunk_timings(chunks, durations, language))
+
+
+def _stream_cached(path: Path, render: Callable[[], Iterator[bytes]]) -> Iterator[bytes]:
+    """Read a cached clip in blocks, rendering it after all if it was evicted meanwhile."""
+    try:
+        file = path.open("rb")
+    except FileNotFoundError:
+        yield from render()
+        return
+    with file:
+        while block := file.read(64 * 1024):
+            yield block
+
+
+def synthesize_audio_chunks(
+    text: str,
+    language: str = "English",
+    speaker: str | None = None,
+) -> tuple[str, Iterator[bytes]]:
+    """
+    Chunked TTS: split cleaned text on sentence boundaries and synthesize the
+    chunks with bounded parallelism, so the first sentence can play while the
+    rest is still rendering.
     
-    hyphenator = HYPHENATORS.get(language, HYPHENATORS["English"])
-    hyphenated = hyphenator.inserted(clean_word)
+    Returns:
+        (audio_id, iterator of audio chunks). The audio_id is the clip key
+        render_audio uses for the same text; if that clip is already cached
+        the iterator reads it from disk instead of synthesizing.
+    """
+    clean = clean_text_for_tts(text)
+    
+    def render() -> Iterator[bytes]:
+        return _pipeline(split_tts_chunks(clean), language, speaker, clean)
+    
+    audio_id = _cached_clip_key(clean, language, speaker)
+    path = _audio_cache().get_path(audio_id) if audio_id else None
+    if path is not None:
+        return audio_id, _stream_cached(path, render)
     
-    # Count hyphens + 1 = syllable count
-    return hyphenated.count('-') + 1
+    audio_id, _ = _backend_keys(clean, language, speaker)
+    return audio_id, render()
+
+
+# Syllables per second for each language
+SYLLABLES_PER_SECOND = {
+    "English": 4.6,
+    "Latvian": 4.9,
+    "Spanish": 4.8,   # Spanish is faster
+    "Russian": 4.5,
+}
+
+# Punctuation pauses
+PUNCTUATION_PAUSES = {
+    "English": {'.': 1.2, '!': 0.4, '?': 0.4, ',': 0.2, ';': 0.3, ':': 0.3},
+    "Latvian": {'.': 0.2, '!': 0.45, '?': 0.45, ',': 0.2, ';': 0.3, ':': 0.3},
+    "Spanish": {'.': 0.8, '!': 0.35, '?': 0.35, ',': 0.18, ';': 0.25, ':': 0.25},
+    "Russian": {'.': 0.5, '!': 0.5, '?': 0.5, ',': 0.25, ';': 0.35, ':': 0.35},
+}
+
+# Words cached per language; texts repeat the same vocabulary heavily
+SYLLABLE_CACHE_SIZE = 8192
+
+_NON_WORD_RE = re.compile(r'[^\w]')
+_syllable_counters: Dict[str, Callable[[str], int]] = {}
+
+
+def _syllable_counter(language: str) -> Callable[[str], int]:
+    """Memoized word → syllable count function for one language (bounded LRU)."""
+    counter = _syllable_counters.get(language)
+    if counter is None:
+        hyphenator = get_hyphenator(language)
+        
+        @lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+        def count(word: str) -> int:
+            # Remove punctuation for syllable counting
+            clean_word = _NON_WORD_RE.sub('', word)
+            if not clean_word:
+                return 1
+            # Count hyphens + 1 = syllable count
+            return hyphenator.inserted(clean_word).count('-') + 1
+        
+        counter = _syllable_counters.setdefault(language, count)
+    return counter
+
+
+def count_syllables(word: str, language: str) -> int:
+    """Count syllables in a word using pyphen."""
+    return _syllable_counter(language)(word)
+
+
+def count_syllables_batch(words: List[str], language: str) -> List[int]:
+    """Syllable counts for a whole word list, sharing one language cache lookup."""
+    return list(map(_syllable_counter(language), words))
 
 
 def calculate_word_timings(
@@ -355,22 +895,6 @@ def calculate_word_timings(
         >>> timings[0]
         {'word': 'Hello', 'start': 0.0, 'end': 0.38}
     """
-    # Syllables per second for each language
-    SYLLABLES_PER_SECOND = {
-        "English": 4.6,
-        "Latvian": 4.9,
-        "Spanish": 4.8,   # Spanish is faster
-        "Russian": 4.5,
-    }
-    
-    # Punctuation pauses
-    PUNCTUATION_PAUSES = {
-        "English": {'.': 1.2, '!': 0.4, '?': 0.4, ',': 0.2, ';': 0.3, ':': 0.3},
-        "Latvian": {'.': 0.2, '!': 0.45, '?': 0.45, ',': 0.2, ';': 0.3, ':': 0.3},
-        "Spanish": {'.': 0.8, '!': 0.35, '?': 0.35, ',': 0.18, ';': 0.25, ':': 0.25},
-        "Russian": {'.': 0.5, '!': 0.5, '?': 0.5, ',': 0.25, ';': 0.35, ':': 0.35},
-    }
-    
     words = re.findall(r'\S+', text)
     if not words:
         return []
@@ -378,49 +902,34 @@ def calculate_word_timings(
     syllables_per_sec = SYLLABLES_PER_SECOND.get(language, 4.5)
     language_pauses = PUNCTUATION_PAUSES.get(language, PUNCTUATION_PAUSES["English"])
     
-    # Calculate syllables and pauses for each word
-    word_data = []
-    total_syllables = 0
-    total_pause_time = 0.0
-    
-    for word in words:
-        syllable_count = count_syllables(word, language)
-        
-        # Check for punctuation
-        pause_duration = 0.0
-        for punct, pause in language_pauses.items():
-            if word.endswith(punct):
-                pause_duration = pause
-                break
-        
-        word_data.append({
-            'word': word,
-            'syllables': syllable_count,
-            'pause': pause_duration
-        })
-        total_syllables += syllable_count
-        total_pause_time += pause_duration
+    # Syllables and trailing punctuation pause for each word
+    syllables = count_syllables_batch(words, language)
+    pauses = [language_pauses.get(word[-1], 0.0) for word in words]
+    total_syllables = sum(syllables)
+    total_pause_time = sum(pauses)
     
     # Estimate duration if not provided
     if estimated_duration is None:
         base_duration = total_syllables / syllables_per_sec
         estimated_duration = base_duration + total_pause_time
-    
-    # Calculate timings
-    timings = []
-    current_time = 0.0
+    elif total_pause_time > estimated_duration / 2:
+        # Measured clip (e.g. one TTS chunk) shorter than the nominal pauses:
+        # shrink the pauses so words keep at least half of it
+        scale = estimated_duration / 2 / total_pause_time
+        pauses = [pause * scale for pause in pauses]
+        total_pause_time = estimated_duration / 2
+    
+    # Time based on syllable proportion
     words_duration = estimated_duration - total_pause_time
+    if total_syllables > 0:
+        durations = [count / total_syllables * words_duration for count in syllables]
+    else:
+        durations = [0.1] * len(words)
     
-    for wd in word_data:
-        # Time based on syllable proportion
-        word_duration = (wd['syllables'] / total_syllables) * words_duration if total_syllables > 0 else 0.1
-        
-        timings.append({
-            'word': wd['word'],
-            'start': round(current_time, 2),
-            'end': round(current_time + word_duration, 2)
-        })
-        
-        current_time += word_duration + wd['pause']
+    # Each word starts after all previous words and their pauses
+    starts = accumulate(map(add, durations, pauses), initial=0.0)
     
-    return timings
+    return [
+        {'word': word, 'start': round(start, 2), 'end': round(start + duration, 2)}
+        for word, start, duration in zip(words, starts, durations)
+    ]
@@ -0,0 +1,170 @@
+"""On-disk format of the built-in library.
+
+data/library/ holds two files:
+- manifest.json: compact index of texts; each part is [name, offset, length]
+  into the data file, so the manifest never contains fragment bodies
+- fragments.dat: append-only UTF-8 fragment bodies, one text's parts stored
+  contiguously
+
+Serving one fragment is a single seek+read at a known offset; serving all
+parts of a text is one read of its contiguous span. New texts are appended
+to fragments.dat and the manifest is rewritten atomically afterwards, so
+readers never see offsets into data that is not there yet.
+
+The legacy data/texts.json (a single JSON array with inline parts) is still
+read when no manifest exists; migrate_texts_json converts it.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+LIBRARY_FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DATA_NAME = "fragments.dat"
+
+
+class FragmentFile:
+    """Shared read handle on fragments.dat (opened lazily)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def read(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class LazyParts(Mapping[str, str]):
+    """
+    Read-only part name → fragment mapping backed by fragments.dat.
+
+    Part names and spans are known up front; bodies are read on access.
+    """
+
+    def __init__(self, source: FragmentFile, spans: Dict[str, Tuple[int, int]]):
+        self._source = source
+        self._spans = spans
+
+    def __getitem__(self, name: str) -> str:
+        offset, length = self._spans[name]
+        return self._source.read(offset, length).decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans)
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def to_dict(self) -> Dict[str, str]:
+        """All parts, read with a single read of the text's contiguous span."""
+        if not self._spans:
+            return {}
+        start = min(offset for offset, _ in self._spans.values())
+        end = max(offset + length for offset, length in self._spans.values())
+        blob = self._source.read(start, end - start)
+        return {
+            name: blob[offset - start:offset - start + length].decode("utf-8")
+            for name, (offset, length) in self._spans.items()
+        }
+
+
+def parts_dict(parts: Mapping[str, str]) -> Dict[str, str]:
+    """Materialize parts as a plain dict (one read for lazy parts)."""
+    if isinstance(parts, LazyParts):
+        return parts.to_dict()
+    return parts
+
+
+def read_manifest(library_dir: Path) -> Optional[dict]:
+    """Parsed manifest, or None if the library has not been created yet."""
+    try:
+        with (library_dir / MANIFEST_NAME).open("r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def _write_manifest(library_dir: Path, manifest: dict) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=library_dir, prefix=".manifest-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(manifest, tmp, ensure_ascii=False, separators=(",", ":"))
+        # mkstemp creates 0600; the manifest must stay readable by the web server
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, library_dir / MANIFEST_NAME)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def append_texts(library_dir: Path, texts: List[dict]) -> int:
+    """
+    Append texts ({name, language, parts, ...}) to the library.
+
+    Bodies go to the end of fragments.dat first; the manifest is replaced
+    afterwards. Extra keys besides parts (e.g. "source") are kept in the
+    manifest.
+
+    Returns:
+        Number of texts appended
+    """
+    library_dir.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(library_dir) or {
+        "format": LIBRARY_FORMAT_VERSION,
+        "data_file": DATA_NAME,
+        "texts": [],
+    }
+
+    with (library_dir / manifest["data_file"]).open("ab") as data:
+        offset = data.tell()
+        for text in texts:
+            spans = []
+            for name, fragment in text["parts"].items():
+                body = fragment.encode("utf-8")
+                data.write(body)
+                spans.append([name, offset, len(body)])
+                offset += len(body)
+            entry = {key: value for key, value in text.items() if key != "parts"}
+            entry["parts"] = spans
+            manifest["texts"].append(entry)
+        data.flush()
+        os.fsync(data.fileno())
+
+    _write_manifest(library_dir, manifest)
+    return len(texts)
+
+
+def load_legacy_texts(texts_file: Path) -> List[dict]:
+    """Entries of a legacy texts.json (handles both [...] and {"texts": [...]})."""
+    with texts_file.open("r", encoding="utf-8") as file:
+        data = json.load(file)
+    return data if isinstance(data, list) else data.get("texts", [])
+
+
+def migrate_texts_json(texts_file: Path, library_dir: Path) -> int:
+    """
+    One-shot conversion of a legacy texts.json into data/library/.
+
+    Refuses to run over an existing manifest so texts are never duplicated.
+
+    Returns:
+        Number of texts migrated
+    """
+    if read_manifest(library_dir) is not None:
+        raise ValueError(f"❌ {library_dir / MANIFEST_NAME} already exists")
+    return append_texts(library_dir, load_legacy_texts(texts_file))
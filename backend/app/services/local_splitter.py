@@ -0,0 +1,260 @@
+"""Deterministic, local text splitter.
+
+Cuts a story into reading fragments without an LLM round trip:
+
+1. Sentences are segmented with language-aware rules (EN/LV/ES/RU):
+   abbreviations, initials and lowercase continuations do not end a sentence.
+2. Sentences are grouped into units that must not be separated: consecutive
+   dialogue lines, and sentences inside an unclosed quotation.
+3. Units are packed greedily towards target_tokens, staying within
+   soft_min..soft_max and preferring to cut at paragraph breaks.
+
+Fragments are exact slices of the input, so paragraph formatting survives.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+# Lowercased, without the final dot ("e.g." -> "e.g")
+ABBREVIATIONS = {
+    "english": {
+        "mr", "mrs", "ms", "dr", "prof", "st", "jr", "sr", "vs", "etc", "e.g", "i.e",
+        "no", "mt", "capt", "col", "gen", "lt", "sgt", "rev", "fig", "approx",
+    },
+    "latvian": {
+        "u.c", "utt", "piem", "t.i", "t.sk", "plkst", "g", "gs", "nr", "sk", "prof", "dr",
+        "v", "k", "kg", "km", "lpp", "apm", "sal", "u.tml", "ang", "lat",
+    },
+    "spanish": {
+        "sr", "sra", "srta", "dr", "dra", "ud", "uds", "etc", "p. ej", "ej", "pág", "núm",
+        "av", "avda", "dña", "d", "lic", "ing", "prof", "aprox",
+    },
+    "russian": {
+        "т.е", "т.д", "т.п", "т.к", "и.т.д", "г", "гг", "им", "ул", "д", "кв", "стр",
+        "см", "тыс", "млн", "руб", "коп", "проф", "др", "пр", "т",
+    },
+}
+
+# (opening, closing characters) pairs used to detect an unclosed quotation
+QUOTE_PAIRS = {
+    "english": (("“", "”"), ("«", "»")),
+    "spanish": (("«", "»"), ("“", "”")),
+    "latvian": (("„", "“”"), ("«", "»")),
+    "russian": (("«", "»"), ("„", "“”")),
+}
+
+# Terminal punctuation, optionally followed by closing quotes/brackets, then whitespace
+_BOUNDARY_RE = re.compile(r'[.!?…]+["»”“’\')\]]*(?=\s)')
+_LAST_WORD_RE = re.compile(r'(\S+)$')
+_LINE_RE = re.compile(r'[^\n]+')
+# Dialogue lines start with a dash or an opening quote
+_DIALOGUE_RE = re.compile(r'^\s*(?:[—–]|-\s|["“„«‹])')
+
+
+@dataclass
+class Span:
+    """A run of text [start, end) in the source string."""
+    start: int
+    end: int
+    paragraph_start: bool = False
+    dialogue: bool = False
+
+
+def _language_key(language: str) -> str:
+    key = (language or "English").lower()
+    return key if key in ABBREVIATIONS else "english"
+
+
+def _is_boundary(line: str, match: re.Match, language: str) -> bool:
+    """Whether terminal punctuation at match really ends a sentence."""
+    after = line[match.end():].lstrip()
+    if not after:
+        return True
+
+    # A lowercase continuation ("5. maijā sākās") is not a sentence end
+    first = after[0]
+    if first.islower():
+        return False
+
+    punct = match.group().rstrip('"»”“’\')]')
+    if punct == ".":
+        word = _LAST_WORD_RE.search(line, 0, match.start())
+        if word:
+            token = word.group(1).lstrip('(«"„“¿¡').lower()
+            # Initials ("J. K. Rowling") and known abbreviations
+            if len(token) == 1 and token.isalpha():
+                return False
+            if token in ABBREVIATIONS[language]:
+                return False
+            # Two-word abbreviations such as "p. ej."
+            before = _LAST_WORD_RE.search(line, 0, word.start(1) - 1) if word.start(1) > 0 else None
+            if before and f"{before.group(1).lower()} {token}" in ABBREVIATIONS[language]:
+                return False
+    return True
+
+
+def split_sentences(text: str, language: str = "English") -> List[Span]:
+    """
+    Segment text into sentence spans.
+
+    Line breaks always end a sentence; a blank line starts a new paragraph.
+    Every sentence on a line that opens with a dash or quote is dialogue.
+    """
+    language = _language_key(language)
+    sentences: List[Span] = []
+    previous_end = 0
+
+    for line_match in _LINE_RE.finditer(text):
+        line = line_match.group()
+        if not line.strip():
+            continue
+        offset = line_match.start()
+        paragraph_start = not sentences or text.count("\n", previous_end, offset) >= 2
+        dialogue = bool(_DIALOGUE_RE.match(line))
+
+        pos = len(line) - len(line.lstrip())
+        for match in _BOUNDARY_RE.finditer(line):
+            if match.end() <= pos or not _is_boundary(line, match, language):
+                continue
+            sentences.append(Span(offset + pos, offset + match.end(), paragraph_start, dialogue))
+            paragraph_start = False
+            rest = line[match.end():]
+            pos = match.end() + len(rest) - len(rest.lstrip())
+
+        tail = line[pos:].rstrip()
+        if tail:
+            sentences.append(Span(offset + pos, offset + pos + len(tail), paragraph_start, dialogue))
+        previous_end = line_match.end()
+
+    return sentences
+
+
+def _quote_open(text: str, language: str) -> bool:
+    """True if text opens a quotation it does not close."""
+    if text.count('"') % 2:
+        return True
+    for opening, closing in QUOTE_PAIRS[language]:
+        if text.count(opening) > sum(text.count(c) for c in closing if c != opening):
+            return True
+    return False
+
+
+def group_units(text: str, sentences: List[Span], language: str = "English") -> List[List[Span]]:
+    """
+    Group sentences into units that packing must keep together:
+    dialogue runs and sentences inside an unclosed quotation.
+    """
+    language = _language_key(language)
+    units: List[List[Span]] = []
+    open_quote = False
+
+    for sentence in sentences:
+        if units and (open_quote or (sentence.dialogue and units[-1][-1].dialogue)):
+            units[-1].append(sentence)
+        else:
+            units.append([sentence])
+        unit_text = text[units[-1][0].start:sentence.end]
+        open_quote = _quote_open(unit_text, language)
+
+    return units
+
+
+def pack_units(
+    units: List[List[Span]],
+    count_tokens: Callable[[int, int], int],
+    target_tokens: int,
+    soft_min: int,
+    soft_max: int,
+) -> List[Tuple[int, int]]:
+    """
+    Pack units into fragment spans of roughly target_tokens.
+
+    Args:
+        units: Sentence groups from group_units
+        count_tokens: Token count of text[start:end]
+        target_tokens: Preferred fragment size
+        soft_min: Smallest fragment worth cutting
+        soft_max: Largest fragment before a cut is forced
+
+    Returns:
+        (start, end) spans of each fragment
+    """
+    # A unit that alone exceeds soft_max (a long dialogue scene) is packed sentence by sentence
+    pieces: List[Tuple[Span, int]] = []
+    for unit in units:
+        tokens = count_tokens(unit[0].start, unit[-1].end)
+        if tokens > soft_max and len(unit) > 1:
+            pieces.extend((sentence, count_tokens(sentence.start, sentence.end)) for sentence in unit)
+        else:
+            pieces.append((Span(unit[0].start, unit[-1].end, unit[0].paragraph_start), tokens))
+
+    fragments: List[Tuple[int, int, int]] = []  # (start, end, tokens)
+    start = end = None
+    current = 0
+    for piece, tokens in pieces:
+        if start is not None:
+            combined = current + tokens
+            closer_now = abs(current - target_tokens) <= abs(combined - target_tokens)
+            if combined > soft_max and (current >= soft_min or closer_now):
+                cut = True
+            elif combined > target_tokens and current >= soft_min:
+                # Past the target: cut at a paragraph break, or wherever we are closest
+                cut = piece.paragraph_start or closer_now
+            else:
+                cut = False
+            if cut:
+                fragments.append((start, end, current))
+                start = None
+                current = 0
+        if start is None:
+            start = piece.start
+        end = piece.end
+        current += tokens
+    if start is not None:
+        fragments.append((start, end, current))
+
+    # Fold a short tail into the previous fragment when it fits
+    if len(fragments) > 1 and fragments[-1][2] < soft_min and fragments[-2][2] + fragments[-1][2] <= soft_max:
+        tail = fragments.pop()
+        previous = fragments.pop()
+        fragments.append((previous[0], tail[1], previous[2] + tail[2]))
+
+    return [(start, end) for start, end, _ in fragments]
+
+
+def split_local(
+    text: str,
+    language: str,
+    target_tokens: int,
+    soft_min: int,
+    soft_max: int,
+    count_tokens: Callable[[int, int], int],
+) -> List[str]:
+    """
+    Split text into fragments locally (no LLM).
+
+    Args:
+        text: Full story
+        language: Story language (English, Latvian, Spanish, Russian)
+        target_tokens: Preferred fragment size
+        soft_min: Smallest fragment worth cutting
+        soft_max: Largest fragment before a cut is forced
+        count_tokens: Token count of text[start:end] (e.g. TokenizedDocument.count)
+
+    Returns:
+        Fragments as exact slices of text
+    """
+    sentences = split_sentences(text, language)
+    if not sentences:
+        return []
+
+    units = group_units(text, sentences, language)
+    spans = pack_units(
+        units,
+        count_tokens,
+        target_tokens,
+        soft_min,
+        soft_max,
+    )
+    return [text[start:end] for start, end in spans]
@@ -0,0 +1,105 @@
+"""Precomputed question bank for the built-in library.
+
+Built offline with `python scripts/toJson.py --build-questions`, which stores
+question sets per fragment × language × difficulty in data/question_bank.json.
+Entries are keyed by a content hash of the fragment, so lookups are O(1) and
+uploaded texts simply miss and fall back to live generation.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backend.app.core.cache import make_cache_key, normalize_text
+from backend.app.services.question_generator import QUESTION_PROMPT_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+BANK_FILE = PROJECT_ROOT / "data" / "question_bank.json"
+
+# Difficulty levels the frontend can request
+BANK_DIFFICULTIES = ("standard", "easy")
+
+_lock = threading.Lock()
+_bank: Dict[str, List[str]] = {}
+_bank_stamp: Optional[tuple] = None
+
+
+def bank_key(fragment: str, language: str, difficulty: str) -> str:
+    """Content key for one fragment × language × difficulty entry."""
+    return make_cache_key(
+        "bank",
+        normalize_text(fragment),
+        (language or "English").lower(),
+        (difficulty or "standard").lower(),
+    )
+
+
+def read_bank_file(path: Path = BANK_FILE) -> dict:
+    """Read the raw bank file (empty skeleton if missing)."""
+    if not path.exists():
+        return {"prompt_version": QUESTION_PROMPT_VERSION, "entries": {}}
+    with path.open("r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _entries() -> Dict[str, List[str]]:
+    """Return the key → questions index, reloading only when the file changes."""
+    global _bank, _bank_stamp
+
+    try:
+        stat = BANK_FILE.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        stamp = None
+
+    if stamp == _bank_stamp:
+        return _bank
+
+    with _lock:
+        if stamp == _bank_stamp:
+            return _bank
+
+        index: Dict[str, List[str]] = {}
+        if stamp is not None:
+            data = read_bank_file()
+            version = data.get("prompt_version")
+            if version == QUESTION_PROMPT_VERSION:
+                index = {
+                    key: entry["questions"]
+                    for key, entry in data.get("entries", {}).items()
+                    if entry.get("questions")
+                }
+                logger.info(f"📚 Loaded question bank: {len(index)} entries")
+            else:
+                logger.warning(
+                    f"⚠️ Question bank prompt version {version} != {QUESTION_PROMPT_VERSION}, ignoring bank"
+                )
+
+        _bank = index
+        _bank_stamp = stamp
+        return _bank
+
+
+def lookup_questions(fragment: str, language: str, difficulty: str) -> Optional[List[str]]:
+    """Precomputed questions for a fragment, or None if it is not in the bank."""
+    return _entries().get(bank_key(fragment, language, difficulty))
+
+
+def lookup_batch(fragments: List[str], language: str, difficulty: str) -> Optional[Dict[int, List[str]]]:
+    """Precomputed questions for every fragment, or None if any fragment is missing."""
+    entries = _entries()
+    if not entries:
+        return None
+
+    result: Dict[int, List[str]] = {}
+    for i, fragment in enumerate(fragments):
+        questions = entries.get(bank_key(fragment, language, difficulty))
+        if questions is None:
+            return None
+        result[i] = questions
+    return result
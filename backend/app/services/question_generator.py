@@ -1,23 +1,102 @@
+import asyncio
 import json
 import logging
-from typing import List, Dict
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
-from langchain_google_genai.chat_models import ChatGoogleGenerativeAIError
-
-from backend.app.core.config import settings
-from backend.app.core.llm_factory import get_gemini_llm
-from backend.app.core.llm_utils import clean_llm_json_response
+from backend.app.core.cache import get_cache, make_cache_key, normalize_text
+from backend.app.core.config import require_feature, settings
+from backend.app.core.llm_factory import Message, get_llm_provider
+from backend.app.core.llm_utils import JsonObjectStream, clean_llm_json_response, llm_error_to_value_error
+from backend.app.services.tokenizer import TokenizedDocument
 
 logger = logging.getLogger(__name__)
 
 
-_cfg = settings()
+# Bump when prompts change: invalidates cached and precomputed questions
+QUESTION_PROMPT_VERSION = "1"
+
+def _question_cache():
+    cfg = settings()
+    return get_cache(
+        "questions",
+        max_entries=cfg["QUESTION_CACHE_MAX_ENTRIES"],
+        ttl_seconds=cfg["QUESTION_CACHE_TTL"],
+        disk=cfg["RESPONSE_CACHE_DISK"],
+    )
+
+
+def _questions_cache_key(fragment, previous_questions, language, difficulty) -> str:
+    """Hash of the normalized prompt inputs plus the model name."""
+    return make_cache_key(
+        "questions",
+        QUESTION_PROMPT_VERSION,
+        get_llm_provider("questions").model,
+        normalize_text(fragment),
+        (language or "English").lower(),
+        (difficulty or "standard").lower(),
+        sorted(normalize_text(q) for q in previous_questions),
+    )
+
+
+def _batch_cache_key(fragments, language, difficulty) -> str:
+    return make_cache_key(
+        "questions_batch",
+        QUESTION_PROMPT_VERSION,
+        get_llm_provider("questions_batch").model,
+        [normalize_text(f) for f in fragments],
+        (language or "English").lower(),
+        (difficulty or "standard").lower(),
+    )
+
+
+def _cached_batch(key: str) -> Dict | None:
+    return _batch_from_cache(_question_cache().get(key))
+
+
+async def _acached_batch(key: str) -> Dict | None:
+    """Async variant of _cached_batch (disk tier off the event loop)."""
+    return _batch_from_cache(await _question_cache().aget(key))
+
+
+def _batch_from_cache(cached) -> Dict | None:
+    if cached is None:
+        return None
+    logger.info("✅ Batch questions served from cache (0 API calls)")
+    # JSON round-trip turns int keys into strings
+    return {
+        'questions_by_fragment': {int(k): v for k, v in cached.items()},
+        'api_calls': 0,
+    }
+
+
+def _batch_complete(result: Dict, fragment_count: int) -> bool:
+    # Only cache complete results so failed fragments are retried next time
+    by_fragment = result['questions_by_fragment']
+    return len(by_fragment) == fragment_count and all(by_fragment.values())
+
+
+def _store_batch(key: str, result: Dict, fragment_count: int) -> None:
+    if _batch_complete(result, fragment_count):
+        _question_cache().set(key, result['questions_by_fragment'])
+
+
+async def _astore_batch(key: str, result: Dict, fragment_count: int) -> None:
+    if _batch_complete(result, fragment_count):
+        await _question_cache().aset(key, result['questions_by_fragment'])
+
 
-# Use lazy-loaded LLM from factory
-def _get_llm():
-    return get_gemini_llm(temperature=0.7, top_p=0.7)
+def _invoke(messages: List[Message], role: str = "questions") -> str:
+    """Run a prompt through the questions provider (JSON mode)."""
+    require_feature("questions")
+    return get_llm_provider(role).complete(messages, json_mode=True)
+
+
+async def _ainvoke(messages: List[Message], role: str = "questions") -> str:
+    """Async variant of _invoke, bounded by the provider semaphore."""
+    require_feature("questions")
+    return await get_llm_provider(role).acomplete(messages, json_mode=True)
 
 
 def _difficulty_hint(difficulty: str) -> str:
@@ -149,10 +228,8 @@ def _build_system_message(language: str, previous_questions, difficulty: str, nu
     )
 
 
-def generate_questions(fragment, previous_questions=None, language="English", difficulty: str = "standard"):
-    if previous_questions is None:
-        previous_questions = []
 
+def _build_questions_prompt(fragment, previous_questions, language, difficulty) -> List[Message]:
     print(f"🔍 Question generation for language: {language}")
     
     # Calculate number of questions based on fragment length
@@ -161,33 +238,13 @@ def generate_questions(fragment, previous_questions=None, language="English", di
 
     system_msg = _build_system_message(language, previous_questions, difficulty, num_questions)
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system_msg),
-            ("human", f"Text:\n{fragment}"),
-        ]
-    )
+    return [
+        ("system", system_msg),
+        ("user", f"Text:\n{fragment}"),
+    ]
 
-    try:
-        response = (prompt | _get_llm() | StrOutputParser()).invoke({})
-    except ChatGoogleGenerativeAIError as e:
-        error_msg = str(e)
-        logger.error(f"Gemini API error: {error_msg}")
-        
-        # Check for rate limit error
-        if "RESOURCE_EXHAUSTED" in error_msg or "429" in error_msg:
-            raise ValueError(
-                "⏳ API rate limit exceeded. Please wait a few moments and try again. "
-                "If this persists, consider upgrading your Gemini API plan."
-            )
-        elif "PERMISSION_DENIED" in error_msg or "API key" in error_msg:
-            raise ValueError("🔑 API key error. Please check your Gemini API key configuration.")
-        else:
-            raise ValueError(f"❌ API error: {error_msg}")
-    except Exception as e:
-        logger.error(f"Unexpected error during question generation: {e}")
-        raise ValueError(f"❌ Failed to generate questions: {str(e)}")
 
+def _parse_questions(response: str, language: str) -> List[str]:
     logger.info("🟡 Raw LLM Response received")
     logger.info(f"🌐 Expected language: {language}")
 
@@ -249,6 +306,155 @@ def generate_questions(fragment, previous_questions=None, language="English", di
     return questions
 
 
+def generate_questions(fragment, previous_questions=None, language="English", difficulty: str = "standard"):
+    if previous_questions is None:
+        previous_questions = []
+
+    cache_key = _questions_cache_key(fragment, previous_questions, language, difficulty)
+    cached = _question_cache().get(cache_key)
+    if cached is not None:
+        logger.info(f"✅ Questions served from cache ({len(cached)} questions)")
+        return cached
+
+    prompt = _build_questions_prompt(fragment, previous_questions, language, difficulty)
+
+    try:
+        response = _invoke(prompt)
+    except Exception as e:
+        raise llm_error_to_value_error(e, "generate questions")
+
+    questions = _parse_questions(response, language)
+    if questions:
+        _question_cache().set(cache_key, questions)
+    return questions
+
+
+async def generate_questions_async(fragment, previous_questions=None, language="English", difficulty: str = "standard"):
+    """Async variant of generate_questions for the async /qa endpoints."""
+    if previous_questions is None:
+        previous_questions = []
+
+    cache_key = _questions_cache_key(fragment, previous_questions, language, difficulty)
+    cached = await _question_cache().aget(cache_key)
+    if cached is not None:
+        logger.info(f"✅ Questions served from cache ({len(cached)} questions)")
+        return cached
+
+    prompt = _build_questions_prompt(fragment, previous_questions, language, difficulty)
+
+    try:
+        response = await _ainvoke(prompt)
+    except Exception as e:
+        raise llm_error_to_value_error(e, "generate questions")
+
+    questions = _parse_questions(response, language)
+    if questions:
+        await _question_cache().aset(cache_key, questions)
+    return questions
+
+
+def _plan_batches(story: TokenizedDocument) -> List[List[int]]:
+    """
+    Pack consecutive fragments into as few requests as fit the token budget.
+    
+    Token counts come from the story tokenized once (one part per fragment).
+    A fragment that exceeds the budget on its own gets a batch to itself.
+    
+    Returns:
+        List of batches, each a list of global fragment indices
+    """
+    budget = settings()["QUESTION_BATCH_TOKEN_BUDGET"]
+    batches: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    
+    for i in range(len(story.part_spans)):
+        tokens = story.part_count(i)
+        if current and used + tokens > budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += tokens
+    
+    if current:
+        batches.append(current)
+    
+    return batches
+
+
+def _story_context(story: TokenizedDocument, start: int) -> str:
+    """Short tail of the story preceding fragment `start`, for continuity across batches."""
+    if start == 0:
+        return ""
+    _, end = story.part_spans[start - 1]
+    return story.tail(end, settings()["QUESTION_BATCH_CONTEXT_TOKENS"]).strip()
+
+
+def _log_plan(fragments: List[str], batches: List[List[int]], language: str) -> None:
+    logger.info(f"🎯 Batch question generation: {len(fragments)} fragments, language={language}")
+    logger.info(
+        f"📊 Planned {len(batches)} API call(s) within {settings()['QUESTION_BATCH_TOKEN_BUDGET']} tokens each: "
+        f"{[len(batch) for batch in batches]} fragments per call"
+    )
+
+
+def _merge_batches(batches: List[List[int]], outcomes: List) -> Tuple[Dict, List[int], List[Exception]]:
+    """
+    Remap per-batch results (local indices) to global fragment indices.
+    
+    Returns:
+        (result, fragments to retry one at a time, batch errors). Retried
+        are the fragments of failed batches and any the model skipped.
+    """
+    questions_by_fragment: Dict[int, List[str]] = {}
+    retry: List[int] = []
+    errors: List[Exception] = []
+    for batch, outcome in zip(batches, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ Failed to generate questions for fragments {batch[0]}-{batch[-1]}: {outcome}")
+            errors.append(outcome)
+            retry.extend(batch)
+            continue
+        local = outcome['questions_by_fragment']
+        for offset, idx in enumerate(batch):
+            questions = local.get(offset)
+            if questions:
+                questions_by_fragment[idx] = questions
+            else:
+                retry.append(idx)
+    
+    result = {
+        'questions_by_fragment': questions_by_fragment,
+        'api_calls': len(batches)
+    }
+    return result, retry, errors
+
+
+def _merge_retries(result: Dict, retried: Dict[int, object], errors: List[Exception]) -> Dict:
+    """
+    Fold per-fragment retry outcomes (questions or exception) into result.
+    
+    A fragment whose retry also failed gets an empty list without affecting
+    the others; if no fragment got any questions, the first error is raised
+    so routers can report it.
+    """
+    by_fragment = result['questions_by_fragment']
+    for idx, outcome in retried.items():
+        if isinstance(outcome, Exception):
+            logger.error(f"❌ Failed to generate questions for fragment {idx}: {outcome}")
+            errors.append(outcome)
+            by_fragment[idx] = []
+        else:
+            by_fragment[idx] = outcome
+    
+    if errors and not any(by_fragment.values()):
+        raise errors[0]
+    
+    result['questions_by_fragment'] = dict(sorted(by_fragment.items()))
+    result['api_calls'] += len(retried)
+    return result
+
+
 def generate_questions_batch(
     fragments: List[str],
     language: str = "English",
@@ -256,8 +462,9 @@ def generate_questions_batch(
     text_name: str = ""
 ) -> Dict:
     """
-    Generate questions for multiple fragments in a single API call.
-    Provides full story context for better question quality.
+    Generate questions for multiple fragments in as few API calls as possible.
+    Fragments are packed into token-budgeted batches that run concurrently;
+    each batch sees a short context from the preceding part of the story.
     
     Args:
         fragments: List of text fragments
@@ -268,39 +475,109 @@ def generate_questions_batch(
     Returns:
         {
             'questions_by_fragment': {0: ['Q1', 'Q2'], 1: ['Q3', 'Q4'], ...},
-            'api_calls': 1
+            'api_calls': 1,
+            'wall_time': 2.4
         }
     """
     if not fragments:
         return {'questions_by_fragment': {}, 'api_calls': 0}
     
-    logger.info(f"🎯 Batch question generation: {len(fragments)} fragments, language={language}")
+    started = time.perf_counter()
+    cache_key = _batch_cache_key(fragments, language, difficulty)
+    result = _cached_batch(cache_key)
     
-    # Calculate total size and determine if we can do single batch
-    total_chars = sum(len(f) for f in fragments)
-    logger.info(f"📊 Total text size: {total_chars} characters")
+    if result is None:
+        story = TokenizedDocument.from_parts(fragments)
+        batches = _plan_batches(story)
+        _log_plan(fragments, batches, language)
+        
+        def run(batch: List[int]):
+            try:
+                return _generate_single_batch(
+                    [fragments[i] for i in batch], language, difficulty, _story_context(story, batch[0])
+                )
+            except Exception as e:
+                return e
+        
+        max_workers = max(1, min(len(batches), settings()["GEMINI_MAX_CONCURRENCY"]))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            outcomes = list(pool.map(run, batches))
+        
+        result, retry, errors = _merge_batches(batches, outcomes)
+        retried = {}
+        if retry:
+            logger.warning(f"🔁 Retrying {len(retry)} fragment(s) one at a time")
+            
+            def run_one(idx: int):
+                try:
+                    return generate_questions(fragments[idx], [], language, difficulty)
+                except Exception as e:
+                    return e
+            
+            max_workers = max(1, min(len(retry), settings()["GEMINI_MAX_CONCURRENCY"]))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                retried = dict(zip(retry, pool.map(run_one, retry)))
+        
+        result = _merge_retries(result, retried, errors)
+        _store_batch(cache_key, result, len(fragments))
     
-    # Gemini can handle large contexts, but let's be conservative
-    # Single batch if < 8000 chars (~2000 tokens)
-    if total_chars < 8000:
-        logger.info(f"✅ Using SINGLE BATCH mode (1 API call for all {len(fragments)} fragments)")
-        return _generate_single_batch(fragments, language, difficulty)
-    else:
-        # For very large texts, fall back to sequential generation
-        logger.warning(f"⚠️ Text too large ({total_chars} chars), using SEQUENTIAL mode ({len(fragments)} API calls)")
-        return _generate_sequential(fragments, language, difficulty)
+    result['wall_time'] = round(time.perf_counter() - started, 3)
+    return result
 
 
-def _generate_single_batch(
+async def generate_questions_batch_async(
     fragments: List[str],
-    language: str,
-    difficulty: str
+    language: str = "English",
+    difficulty: str = "standard",
+    text_name: str = ""
 ) -> Dict:
-    """Generate questions for all fragments in ONE API call."""
+    """Async variant of generate_questions_batch. Same arguments and result shape."""
+    if not fragments:
+        return {'questions_by_fragment': {}, 'api_calls': 0}
+    
+    started = time.perf_counter()
+    cache_key = _batch_cache_key(fragments, language, difficulty)
+    result = await _acached_batch(cache_key)
     
-    logger.info("=" * 60)
-    logger.info("🔥 STARTING SINGLE BATCH GENERATION (1 API CALL)")
-    logger.info("=" * 60)
+    if result is None:
+        story = TokenizedDocument.from_parts(fragments)
+        batches = _plan_batches(story)
+        _log_plan(fragments, batches, language)
+        
+        outcomes = await asyncio.gather(
+            *(
+                _generate_single_batch_async(
+                    [fragments[i] for i in batch], language, difficulty, _story_context(story, batch[0])
+                )
+                for batch in batches
+            ),
+            return_exceptions=True,
+        )
+        
+        result, retry, errors = _merge_batches(batches, list(outcomes))
+        retried = {}
+        if retry:
+            logger.warning(f"🔁 Retrying {len(retry)} fragment(s) one at a time")
+            outcomes = await asyncio.gather(
+                *(generate_questions_async(fragments[idx], [], language, difficulty) for idx in retry),
+                return_exceptions=True,
+            )
+            retried = dict(zip(retry, outcomes))
+        
+        result = _merge_retries(result, retried, errors)
+        await _astore_batch(cache_key, result, len(fragments))
+    
+    result['wall_time'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _build_batch_prompt(
+    fragments: List[str],
+    language: str,
+    difficulty: str,
+    context: str = ""
+) -> List[Message]:
+    """Build the prompt asking for questions for a batch of fragments at once."""
     
     # Build comprehensive prompt with full context
     hint = _difficulty_hint(difficulty)
@@ -320,56 +597,57 @@ def _generate_single_batch(
     system_msg = (
         f"You are a reading comprehension expert creating questions in {language}.\n\n"
         "TASK: Generate questions for a story divided into fragments.\n"
-        "- You will see the ENTIRE story for context\n"
+        "- You will see the story fragments for context\n"
         "- Generate questions for EACH fragment separately\n"
         "- Questions should test comprehension of that specific fragment\n"
-        "- But you can reference earlier/later events for better context\n\n"
-        f"Generate {total_questions} questions total:\n"
+        "- But you can reference earlier/later events for better context\n"
     )
     
+    if context:
+        system_msg += (
+            "- STORY SO FAR is the end of the previous part of the story. "
+            "Use it only for context; do NOT ask questions about it\n"
+        )
+    
+    system_msg += f"\nGenerate {total_questions} questions total:\n"
+    
     for i, count in enumerate(questions_per_fragment):
         system_msg += f"- Fragment {i}: {count} questions\n"
     
     system_msg += (
         f"\n{hint}\n\n"
         "IMPORTANT: Return ONLY a JSON object in this exact format:\n"
-        "{{\n"
+        "{\n"
         '  "0": ["Question 1 for fragment 0", "Question 2 for fragment 0"],\n'
         '  "1": ["Question 1 for fragment 1", "Question 2 for fragment 1"],\n'
         "  ...\n"
-        "}}\n\n"
+        "}\n\n"
         f"All questions must be in {language}. No explanations, just the JSON."
     )
     
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", system_msg),
-        ("human", f"FULL STORY:\n\n{fragment_list}\n\nGenerate questions for each fragment:")
-    ])
+    story = f"STORY SO FAR:\n...{context}\n\n" if context else ""
     
+    return [
+        ("system", system_msg),
+        ("user", f"{story}FRAGMENTS:\n\n{fragment_list}\n\nGenerate questions for each fragment:")
+    ]
+
+
+def _batch_entry(key, value) -> Optional[Tuple[int, List[str]]]:
+    """Validate one member of the batch JSON object: fragment index → questions."""
     try:
-        logger.info("=" * 60)
-        logger.info(f"📤 API CALL #1: Sending batch request to Gemini API...")
-        logger.info("=" * 60)
-        response = (prompt | _get_llm() | StrOutputParser()).invoke({})
-        logger.info("=" * 60)
-        logger.info(f"📥 API CALL #1 COMPLETE: Received response from Gemini API")
-        logger.info("=" * 60)
-    except ChatGoogleGenerativeAIError as e:
-        error_msg = str(e)
-        logger.error(f"Gemini API error in batch generation: {error_msg}")
-        
-        if "RESOURCE_EXHAUSTED" in error_msg or "429" in error_msg:
-            raise ValueError(
-                "⏳ API rate limit exceeded. Please wait a few moments and try again."
-            )
-        elif "PERMISSION_DENIED" in error_msg or "API key" in error_msg:
-            raise ValueError("🔑 API key error. Please check your Gemini API key configuration.")
-        else:
-            raise ValueError(f"❌ API error: {error_msg}")
-    except Exception as e:
-        logger.error(f"Unexpected error during batch question generation: {e}")
-        raise ValueError(f"❌ Failed to generate questions: {str(e)}")
-    
+        idx = int(key)
+    except (ValueError, TypeError):
+        logger.warning(f"Invalid key '{key}', skipping")
+        return None
+    if isinstance(value, list) and all(isinstance(q, str) for q in value):
+        return idx, value
+    logger.warning(f"Invalid format for fragment {idx}, skipping")
+    return None
+
+
+def _parse_batch_response(response: str) -> Dict:
+    """Parse the batch JSON object into the questions_by_fragment result."""
     logger.info("🟡 Received batch response from LLM")
     
     # Parse response
@@ -404,14 +682,9 @@ def _generate_single_batch(
     # Convert string keys to integers and validate
     questions_by_fragment = {}
     for key, value in parsed.items():
-        try:
-            idx = int(key)
-            if isinstance(value, list) and all(isinstance(q, str) for q in value):
-                questions_by_fragment[idx] = value
-            else:
-                logger.warning(f"Invalid format for fragment {idx}, skipping")
-        except (ValueError, TypeError):
-            logger.warning(f"Invalid key '{key}', skipping")
+        entry = _batch_entry(key, value)
+        if entry is not None:
+            questions_by_fragment[entry[0]] = entry[1]
     
     logger.info(f"✅ Successfully generated questions for {len(questions_by_fragment)} fragments in 1 API call")
     
@@ -421,37 +694,205 @@ def _generate_single_batch(
     }
 
 
-def _generate_sequential(
+def _generate_single_batch(
     fragments: List[str],
     language: str,
-    difficulty: str
+    difficulty: str,
+    context: str = ""
 ) -> Dict:
-    """Fallback: Generate questions fragment-by-fragment."""
+    """Generate questions for a batch of fragments in ONE API call."""
+    prompt = _build_batch_prompt(fragments, language, difficulty, context)
     
-    logger.warning("=" * 60)
-    logger.warning(f"⚠️ USING SEQUENTIAL MODE: {len(fragments)} SEPARATE API CALLS")
-    logger.warning("=" * 60)
+    try:
+        logger.info(f"📤 Sending batch request for {len(fragments)} fragments to the LLM...")
+        response = _invoke(prompt, role="questions_batch")
+        logger.info("📥 Received batch response")
+    except Exception as e:
+        raise llm_error_to_value_error(e, "generate questions")
     
-    questions_by_fragment = {}
-    api_calls = 0
+    return _parse_batch_response(response)
+
+
+async def _generate_single_batch_async(
+    fragments: List[str],
+    language: str,
+    difficulty: str,
+    context: str = ""
+) -> Dict:
+    """Async variant of _generate_single_batch."""
+    prompt = _build_batch_prompt(fragments, language, difficulty, context)
+    
+    try:
+        logger.info(f"📤 Sending batch request for {len(fragments)} fragments to the LLM...")
+        response = await _ainvoke(prompt, role="questions_batch")
+        logger.info("📥 Received batch response")
+    except Exception as e:
+        raise llm_error_to_value_error(e, "generate questions")
+    
+    return _parse_batch_response(response)
+
+
+async def _stream_single_batch(
+    fragments: List[str],
+    language: str,
+    difficulty: str,
+    context: str = ""
+) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Streaming variant of _generate_single_batch: yields (local index,
+    questions) as soon as each fragment's array closes in the output.
+    """
+    prompt = _build_batch_prompt(fragments, language, difficulty, context)
+    parser = JsonObjectStream()
+    seen = set()
+    
+    logger.info(f"📤 Streaming batch request for {len(fragments)} fragments from the LLM...")
+    pieces = get_llm_provider("questions_batch").astream(prompt, json_mode=True)
+    try:
+        async for piece in pieces:
+            for key, value in parser.feed(piece):
+                entry = _batch_entry(key, value)
+                if entry is not None and entry[0] not in seen:
+                    seen.add(entry[0])
+                    yield entry
+    except Exception as e:
+        raise llm_error_to_value_error(e, "generate questions")
+    finally:
+        await pieces.aclose()
+    
+    if len(seen) < len(fragments):
+        # Output the streaming parser could not follow: try the lenient full parse
+        try:
+            parsed = _parse_batch_response(parser.text)['questions_by_fragment']
+        except ValueError:
+            if not seen:
+                raise
+            parsed = {}
+        for idx, questions in sorted(parsed.items()):
+            if idx not in seen:
+                seen.add(idx)
+                yield idx, questions
+
+
+async def generate_questions_batch_stream(
+    fragments: List[str],
+    language: str = "English",
+    difficulty: str = "standard",
+) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Streaming variant of generate_questions_batch_async.
+    
+    Yields (fragment index, questions) as soon as each fragment's question
+    list is complete in the model output, so the first fragments can be
+    used while later ones are still being generated. Batches run
+    concurrently, so indices may arrive out of order; every fragment is
+    yielded exactly once (empty list if its batch failed). The complete
+    result is cached like the non-streaming variant.
+    
+    Cached results are yielded at once; otherwise "questions" must be
+    available (FeatureUnavailable is raised on the first item).
+    """
+    if not fragments:
+        return
+    
+    cache_key = _batch_cache_key(fragments, language, difficulty)
+    result = await _acached_batch(cache_key)
+    if result is not None:
+        for idx, questions in sorted(result['questions_by_fragment'].items()):
+            yield idx, questions
+        return
+    
+    require_feature("questions")
+    items = _stream_batches(fragments, language, difficulty, cache_key)
+    try:
+        async for item in items:
+            yield item
+    finally:
+        await items.aclose()
+
+
+async def _stream_batches(
+    fragments: List[str],
+    language: str,
+    difficulty: str,
+    cache_key: str,
+) -> AsyncIterator[Tuple[int, List[str]]]:
+    story = TokenizedDocument.from_parts(fragments)
+    batches = _plan_batches(story)
+    _log_plan(fragments, batches, language)
     
-    for i, fragment in enumerate(fragments):
+    # Batches push (index, questions), then (None, error or None) when done
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def run(batch: List[int]) -> None:
+        outcome = None
         try:
-            logger.warning("=" * 60)
-            logger.warning(f"📤 API CALL #{i+2}: Generating questions for fragment {i}...")
-            logger.warning(f"⚠️ THIS IS AN ADDITIONAL API CALL (not part of batch)")
-            logger.warning("=" * 60)
-            questions = generate_questions(fragment, [], language, difficulty)
-            questions_by_fragment[i] = questions
-            api_calls += 1
-            logger.info(f"✅ Fragment {i} complete")
+            async for offset, questions in _stream_single_batch(
+                [fragments[i] for i in batch], language, difficulty, _story_context(story, batch[0])
+            ):
+                if offset < len(batch):
+                    await queue.put((batch[offset], questions))
         except Exception as e:
-            logger.error(f"❌ Failed to generate questions for fragment {i}: {e}")
-            questions_by_fragment[i] = []
+            outcome = e
+        await queue.put((None, outcome))
     
-    logger.warning(f"⚠️ Sequential generation complete: {api_calls} TOTAL API CALLS")
+    tasks = [asyncio.ensure_future(run(batch)) for batch in batches]
+    questions_by_fragment: Dict[int, List[str]] = {}
+    errors = []
+    try:
+        pending = len(tasks)
+        while pending:
+            idx, item = await queue.get()
+            if idx is None:
+                pending -= 1
+                if item is not None:
+                    errors.append(item)
+                continue
+            if item:
+                # Empty lists are retried below
+                questions_by_fragment[idx] = item
+                yield idx, item
+    finally:
+        # Client left or a consumer error: stop the remaining generations
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
     
-    return {
-        'questions_by_fragment': questions_by_fragment,
-        'api_calls': api_calls
-    }
+    for error in errors:
+        logger.error(f"❌ Failed to generate questions for part of the story: {error}")
+    
+    retry = [idx for idx in range(len(fragments)) if idx not in questions_by_fragment]
+    if retry:
+        logger.warning(f"🔁 Retrying {len(retry)} fragment(s) one at a time")
+        
+        async def run_one(idx: int):
+            try:
+                return idx, await generate_questions_async(fragments[idx], [], language, difficulty)
+            except Exception as e:
+                return idx, e
+        
+        retry_tasks = [asyncio.ensure_future(run_one(idx)) for idx in retry]
+        failed = []
+        try:
+            for next_done in asyncio.as_completed(retry_tasks):
+                idx, outcome = await next_done
+                if isinstance(outcome, Exception):
+                    logger.error(f"❌ Failed to generate questions for fragment {idx}: {outcome}")
+                    errors.append(outcome)
+                if isinstance(outcome, Exception) or not outcome:
+                    failed.append(idx)
+                    continue
+                questions_by_fragment[idx] = outcome
+                yield idx, outcome
+        finally:
+            for task in retry_tasks:
+                task.cancel()
+            await asyncio.gather(*retry_tasks, return_exceptions=True)
+        
+        if errors and not questions_by_fragment:
+            raise errors[0]
+        for idx in failed:
+            questions_by_fragment[idx] = []
+            yield idx, []
+    
+    await _astore_batch(cache_key, {'questions_by_fragment': questions_by_fragment}, len(fragments))
@@ -1,11 +1,18 @@
-from langchain_core.prompts import PromptTemplate
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Tuple
 
-from backend.app.core.config import settings
-from backend.app.core.llm_factory import get_openai_client
+from backend.app.core.cache import get_cache, make_cache_key, normalize_text
+from backend.app.core.config import require_feature, settings
+from backend.app.core.llm_factory import Message, get_llm_provider
+from backend.app.services.textsplitter import split_text_to_fragments
+from backend.app.services.tokenizer import TokenizedDocument
 
+logger = logging.getLogger(__name__)
 
-_cfg = settings()
-
+# Bump when prompts change: invalidates cached simplifications
+SIMPLIFY_PROMPT_VERSION = "1"
 
 _LV_PROMPT = """
     Tu esi radošs un atbalstošs skolotājs, kurš māca 14 gadus vecus bērnus lasīt un saprast stāstus.
@@ -98,44 +105,283 @@ _LEVEL_HINTS = {
 }
 
 
-def simplify_text(
-    text: str,
-    lang: str = "Latvian",
-    max_length: int = 15000,
-    level: str = "default",
-) -> str:
+SIMPLIFY_MODES = ("auto", "whole", "fragments")
+
+
+def _build_messages(text: str, lang: str, max_length: int, level: str, context: str = "") -> List[Message]:
     if len(text) > max_length:
         raise ValueError(f"Text longer than {max_length} characters")
 
     level_hint = _LEVEL_HINTS.get(level, _LEVEL_HINTS["default"])
 
-    if lang == "English":
+    lang = lang.strip().lower()
+    if lang == "english":
         template = _EN_PROMPT
         system_msg = "You are a creative and supportive teacher who teaches children to read with comprehension."
-    elif lang == "Spanish":
+    elif lang == "spanish":
         template = _ES_PROMPT
         system_msg = "Eres un maestro creativo y solidario que enseña a los niños a leer con comprensión."
-    elif lang == "Russian":
+    elif lang == "russian":
         template = _RU_PROMPT
         system_msg = "Ты творческий и поддерживающий учитель, который учит детей читать с пониманием."
     else:
         template = _LV_PROMPT
         system_msg = "Tu esi radošs un atbalstošs skolotājs, kurš māca bērnus lasīt ar izpratni."
 
-    prompt = PromptTemplate(template=template, input_variables=["text"])
-    full = prompt.format(text=text) + f"\n\nSimplification aim: {level_hint}"
-
-    # Use centralized OpenAI client factory
-    client = get_openai_client()
-    resp = client.chat.completions.create(
-        model="deepseek-chat",
-        messages=[
-            {"role": "system", "content": system_msg},
-            {"role": "user", "content": full},
-        ],
-        stream=False,
+    full = template.format(text=text) + f"\n\nSimplification aim: {level_hint}"
+    if context:
+        full += (
+            "\n\nThe text above continues this passage. Use it only for continuity "
+            f"(names, tense, tone); do not rewrite or repeat it:\n...{context}"
+        )
+
+    return [
+        ("system", system_msg),
+        ("user", full),
+    ]
+
+
+def _simplify_cache():
+    cfg = settings()
+    return get_cache(
+        "simplify",
+        max_entries=cfg["SIMPLIFY_CACHE_MAX_ENTRIES"],
+        ttl_seconds=cfg["SIMPLIFY_CACHE_TTL"],
+        disk=cfg["RESPONSE_CACHE_DISK"],
+    )
+
+
+def _simplify_cache_key(text: str, lang: str, level: str, context: str = "") -> str:
+    """Hash of the normalized prompt inputs plus prompt version and model name."""
+    return make_cache_key(
+        "simplify",
+        SIMPLIFY_PROMPT_VERSION,
+        get_llm_provider("simplify").model,
+        normalize_text(text),
+        lang.strip().lower(),
+        level if level in _LEVEL_HINTS else "default",
+        normalize_text(context),
+    )
+
+
+def _simplify_one(text: str, lang: str, max_length: int, level: str, context: str = "") -> str:
+    """One simplification call (a whole text or one fragment), through the cache."""
+    messages = _build_messages(text, lang, max_length, level, context)
+    key = _simplify_cache_key(text, lang, level, context)
+    cached = _simplify_cache().get(key)
+    if cached is not None:
+        logger.info("✅ Simplification served from cache")
+        return cached
+
+    require_feature("simplify")
+    result = get_llm_provider("simplify").complete(messages)
+    if result.strip():
+        _simplify_cache().set(key, result)
+    return result
+
+
+async def _asimplify_one(text: str, lang: str, max_length: int, level: str, context: str = "") -> str:
+    """Async variant of _simplify_one, bounded by the DeepSeek semaphore."""
+    messages = _build_messages(text, lang, max_length, level, context)
+    key = _simplify_cache_key(text, lang, level, context)
+    cached = await _simplify_cache().aget(key)
+    if cached is not None:
+        logger.info("✅ Simplification served from cache")
+        return cached
+
+    require_feature("simplify")
+    result = await get_llm_provider("simplify").acomplete(messages)
+    if result.strip():
+        await _simplify_cache().aset(key, result)
+    return result
+
+
+def resolve_mode(text: str, mode: str | None = None) -> str:
+    """
+    "whole" (one prompt) or "fragments" (one prompt per fragment, in parallel).
+
+    "auto" (SIMPLIFY_MODE default) picks fragments for texts longer than
+    SIMPLIFY_FRAGMENT_CHARS, where a single generation gets slow.
+    """
+    cfg = settings()
+    mode = (mode or cfg["SIMPLIFY_MODE"]).lower()
+    if mode not in SIMPLIFY_MODES:
+        raise ValueError(f"❌ Unknown simplify mode '{mode}' (use {', '.join(SIMPLIFY_MODES)})")
+    if mode == "auto":
+        return "fragments" if len(text.strip()) > cfg["SIMPLIFY_FRAGMENT_CHARS"] else "whole"
+    return mode
+
+
+def _fragment_jobs(text: str, lang: str) -> List[Tuple[str, str]]:
+    """
+    Split text at the splitter's boundaries into (fragment, context) pairs;
+    context is the tail of the text preceding the fragment, for continuity.
+    """
+    cfg = settings()
+    doc = TokenizedDocument(text.strip())
+    fragments = split_text_to_fragments(
+        doc.text,
+        target_tokens=cfg["SIMPLIFY_FRAGMENT_TOKENS"],
+        language=lang,
+        mode="local",
+        doc=doc,
     )
+    jobs = []
+    position = 0
+    for fragment in fragments:
+        # Local fragments are slices of doc.text, so the context comes from the same encoding
+        start = doc.text.find(fragment, position)
+        if start < 0:
+            start = position
+        context = doc.tail(start, cfg["SIMPLIFY_CONTEXT_TOKENS"]).strip()
+        jobs.append((fragment, context))
+        position = start + len(fragment)
+    return jobs
+
+
+def join_simplified(results: List[Dict[str, str]]) -> str:
+    return "\n\n".join(result["simplified"].strip() for result in results)
+
+
+def simplify_fragments(text: str, lang: str = "Latvian", level: str = "default") -> List[Dict[str, str]]:
+    """
+    Simplify a text fragment by fragment, DEEPSEEK_MAX_CONCURRENCY at a time.
+
+    There is no overall size cap; latency is roughly that of the slowest
+    fragment.
+
+    Returns:
+        [{"original": fragment, "simplified": text}, ...] in text order
+    """
+    jobs = _fragment_jobs(text, lang)
+
+    def run(job: Tuple[str, str]) -> str:
+        fragment, context = job
+        return _simplify_one(fragment, lang, len(fragment), level, context)
+
+    max_workers = max(1, min(len(jobs), settings()["DEEPSEEK_MAX_CONCURRENCY"]))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        simplified = list(pool.map(run, jobs))
+
+    return [
+        {"original": fragment, "simplified": result}
+        for (fragment, _), result in zip(jobs, simplified)
+    ]
+
+
+async def simplify_fragments_async(text: str, lang: str = "Latvian", level: str = "default") -> List[Dict[str, str]]:
+    """Async variant of simplify_fragments; concurrency is bounded by the DeepSeek semaphore."""
+    # Tokenizing and splitting a long text is CPU work; keep it off the event loop
+    jobs = await asyncio.to_thread(_fragment_jobs, text, lang)
+    tasks = [
+        asyncio.ensure_future(_asimplify_one(fragment, lang, len(fragment), level, context))
+        for fragment, context in jobs
+    ]
+    try:
+        simplified = await asyncio.gather(*tasks)
+    except BaseException:
+        # One fragment failed (or the request was cancelled): don't pay for the rest
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    return [
+        {"original": fragment, "simplified": result}
+        for (fragment, _), result in zip(jobs, simplified)
+    ]
+
+
+def simplify_text(
+    text: str,
+    lang: str = "Latvian",
+    max_length: int = 15000,
+    level: str = "default",
+    mode: str | None = None,
+) -> str:
+    """Simplify text; mode "fragments" (or "auto" on long texts) lifts max_length."""
+    if resolve_mode(text, mode) == "fragments":
+        return join_simplified(simplify_fragments(text, lang, level))
+    return _simplify_one(text, lang, max_length, level)
+
+
+async def simplify_text_async(
+    text: str,
+    lang: str = "Latvian",
+    max_length: int = 15000,
+    level: str = "default",
+    mode: str | None = None,
+) -> str:
+    """Async variant of simplify_text, bounded by the DeepSeek semaphore."""
+    if resolve_mode(text, mode) == "fragments":
+        return join_simplified(await simplify_fragments_async(text, lang, level))
+    return await _asimplify_one(text, lang, max_length, level)
+
+
+async def simplify_text_stream(
+    text: str,
+    lang: str = "Latvian",
+    max_length: int = 15000,
+    level: str = "default",
+    mode: str | None = None,
+) -> AsyncIterator[str]:
+    """
+    Stream the simplified text as DeepSeek generates it.
+
+    In fragments mode all fragments are simplified in parallel and each is
+    yielded, in order, as soon as it and those before it are done.
+
+    A cached result is yielded as a single piece; a completed stream is
+    cached.
+
+    Input is validated before the iterator is returned, so errors surface
+    before the response starts. Closing the iterator (aclose) closes the provider
+    stream, which stops generation.
+    """
+    if resolve_mode(text, mode) == "fragments":
+        jobs = await asyncio.to_thread(_fragment_jobs, text, lang)
+        return _stream_fragments(jobs, lang, level)
+
+    messages = _build_messages(text, lang, max_length, level)
+    key = _simplify_cache_key(text, lang, level)
+    cached = await _simplify_cache().aget(key)
+    if cached is not None:
+        logger.info("✅ Simplification served from cache")
+        return _stream_cached(cached)
+
+    require_feature("simplify")
+    return _stream_and_cache(get_llm_provider("simplify").astream(messages), key)
+
+
+async def _stream_cached(text: str) -> AsyncIterator[str]:
+    yield text
+
 
-    return resp.choices[0].message.content
+async def _stream_and_cache(pieces: AsyncIterator[str], key: str) -> AsyncIterator[str]:
+    """Relay the provider stream; cache the full text only if it finished."""
+    parts = []
+    try:
+        async for piece in pieces:
+            parts.append(piece)
+            yield piece
+    finally:
+        await pieces.aclose()
+    result = "".join(parts)
+    if result.strip():
+        await _simplify_cache().aset(key, result)
 
 
+async def _stream_fragments(jobs: List[Tuple[str, str]], lang: str, level: str) -> AsyncIterator[str]:
+    tasks = [
+        asyncio.ensure_future(_asimplify_one(fragment, lang, len(fragment), level, context))
+        for fragment, context in jobs
+    ]
+    try:
+        for i, task in enumerate(tasks):
+            simplified = (await task).strip()
+            yield ("\n\n" if i else "") + simplified
+    finally:
+        # Client gone or a fragment failed: stop the rest and let them unwind
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,18 +1,10 @@
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+from typing import List
 
-from backend.app.core.config import settings
-from backend.app.core.llm_factory import get_gemini_llm
+from backend.app.core.config import require_feature
+from backend.app.core.llm_factory import Message, get_llm_provider
 
-_cfg = settings()
 
-# Use lazy-loaded LLM from factory with lower temperature for formatting
-def _get_llm():
-    return get_gemini_llm(temperature=0.4, top_p=0.7)
-
-
-def improve_formatting(text: str, language: str = "English") -> str:
-    """Ask the LLM to fix spacing, punctuation, sentence casing, and speaker markers."""
+def _build_prompt(text: str, language: str) -> List[Message]:
     lang = language.lower()
     instructions = {
         "latvian": "Uzlabot teikumu robežas, lielos sākumburtus un dialogu domuzīmes latviešu valodā.",
@@ -21,17 +13,23 @@ def improve_formatting(text: str, language: str = "English") -> str:
     }
     hint = instructions.get(lang, "Improve punctuation, spacing, and paragraphing in English.")
 
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                "You are an editor. Clean up formatting, fix missing capital letters, ensure paragraphs break at natural points, "
-                "and keep every piece of content from the user's text. Do not summarize; return the original story with better formatting.",
-            ),
-            ("human", f"{hint}\n\nText:\n{text}"),
-        ]
-    )
+    return [
+        (
+            "system",
+            "You are an editor. Clean up formatting, fix missing capital letters, ensure paragraphs break at natural points, "
+            "and keep every piece of content from the user's text. Do not summarize; return the original story with better formatting.",
+        ),
+        ("user", f"{hint}\n\nText:\n{text}"),
+    ]
 
-    return (prompt | _get_llm() | StrOutputParser()).invoke({})
+
+def improve_formatting(text: str, language: str = "English") -> str:
+    """Ask the LLM to fix spacing, punctuation, sentence casing, and speaker markers."""
+    require_feature("formatting")
+    return get_llm_provider("formatting").complete(_build_prompt(text, language))
 
 
+async def improve_formatting_async(text: str, language: str = "English") -> str:
+    """Async variant of improve_formatting, bounded by the provider semaphore."""
+    require_feature("formatting")
+    return await get_llm_provider("formatting").acomplete(_build_prompt(text, language))
@@ -1,38 +1,178 @@
-import json
+"""Built-in text library.
+
+The library manifest (data/library/, see library_format) is parsed once into
+an indexed, read-only LibraryStore and only re-read when its mtime or size
+changes. Fragment bodies stay on disk and are read on access. Lookups by
+language and by (language, name) are O(1) and return shared immutable views,
+so request handlers never copy or re-filter the library.
+
+Without a manifest the legacy data/texts.json is loaded eagerly instead.
+"""
+
+import logging
+import threading
 from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from backend.app.services.library_format import (
+    FragmentFile,
+    LazyParts,
+    load_legacy_texts,
+    read_manifest,
+    MANIFEST_NAME,
+)
+
+logger = logging.getLogger(__name__)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 DATA_DIR = PROJECT_ROOT / "data"
-TEXTS_FILE = DATA_DIR / "texts.json"
+LIBRARY_DIR = DATA_DIR / "library"
+TEXTS_FILE = DATA_DIR / "texts.json"  # legacy single-file library
 
 
-def load_texts(language: str = "English"):
-    if not TEXTS_FILE.exists():
-        return []
+class ReadOnlyDict(dict):
+    """
+    dict that refuses mutation.
 
-    with TEXTS_FILE.open("r", encoding="utf-8") as file:
-        data = json.load(file)
+    Shared library records are handed straight to response serialization;
+    a dict subclass (unlike MappingProxyType) serializes natively.
+    """
 
-    # Handle both old format {"texts": [...]} and new format [...]
-    texts_list = data if isinstance(data, list) else data.get("texts", [])
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("library texts are read-only")
 
-    return [
-        {
-            "name": t["name"],
-            "language": t.get("language", language),
-            "parts": t["parts"],
-        }
-        for t in texts_list
-        if t.get("language", "").lower() == language.lower()
-    ]
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
 
 
-def get_fragment(text_name: str, part_name: str, language: str = "English") -> str:
-    texts = load_texts(language)
-    for text in texts:
-        if text["name"] == text_name:
-            return text.get("parts", {}).get(part_name, "")
-    return ""
+# Read-only text record: {"name", "language", "parts": {part name: fragment}}
+Text = Mapping[str, object]
+
+
+class LibraryStore:
+    """Indexed, mtime-aware view of the library manifest (or legacy texts.json)."""
+
+    def __init__(self, library_dir: Path, legacy_file: Optional[Path] = None):
+        self.library_dir = library_dir
+        self.legacy_file = legacy_file
+        self._lock = threading.Lock()
+        self._stamp: Optional[tuple] = None
+        self._by_language: Dict[str, Tuple[Text, ...]] = {}
+        self._by_name: Dict[Tuple[str, str], Text] = {}
+        # Open fragments.dat behind the current manifest texts
+        self._source: Optional[FragmentFile] = None
+        # Bumped on every reload; lets callers build cheap ETags
+        self.version = 0
+
+    def _current_stamp(self) -> Optional[tuple]:
+        candidates = [("manifest", self.library_dir / MANIFEST_NAME)]
+        if self.legacy_file is not None:
+            candidates.append(("legacy", self.legacy_file))
+        for kind, path in candidates:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            return (kind, stat.st_mtime_ns, stat.st_size)
+        return None
+
+    def _read_texts(self, kind: str) -> list:
+        """Raw text entries; parts are lazy for the manifest format."""
+        if kind == "legacy":
+            return [
+                {**t, "parts": ReadOnlyDict(t["parts"])}
+                for t in load_legacy_texts(self.legacy_file)
+            ]
+
+        manifest = read_manifest(self.library_dir) or {"texts": []}
+        source = FragmentFile(self.library_dir / manifest.get("data_file", "fragments.dat"))
+        self._source = source
+        return [
+            {**t, "parts": LazyParts(source, {name: (offset, length) for name, offset, length in t["parts"]})}
+            for t in manifest["texts"]
+        ]
+
+    def _refresh(self) -> None:
+        stamp = self._current_stamp()
+        if stamp == self._stamp:
+            return
+
+        with self._lock:
+            if stamp == self._stamp:
+                return
 
+            previous = self._source
+            self._source = None
+            by_language: Dict[str, list] = {}
+            by_name: Dict[Tuple[str, str], Text] = {}
+            if stamp is not None:
+                for t in self._read_texts(stamp[0]):
+                    language = t.get("language", "")
+                    if not language:
+                        continue
+                    text = ReadOnlyDict(
+                        name=t["name"],
+                        language=language,
+                        parts=t["parts"],
+                    )
+                    key = language.lower()
+                    by_language.setdefault(key, []).append(text)
+                    # First text wins on duplicate names, as the old linear scan did
+                    by_name.setdefault((key, t["name"]), text)
 
+            self._by_language = {key: tuple(texts) for key, texts in by_language.items()}
+            self._by_name = by_name
+            self._stamp = stamp
+            self.version += 1
+            if previous is not None:
+                # The old texts are replaced; release their file handle
+                previous.close()
+            source = stamp[0] if stamp else "empty"
+            logger.info(f"📚 Loaded library ({source}): {len(by_name)} texts in {len(by_language)} languages")
+
+    @property
+    def signature(self) -> str:
+        """Stamp of the loaded file (kind, mtime, size); identical in every worker, unlike version."""
+        self._refresh()
+        if self._stamp is None:
+            return "none"
+        kind, mtime_ns, size = self._stamp
+        return f"{kind}-{mtime_ns:x}-{size:x}"
+
+    def languages(self) -> Tuple[str, ...]:
+        """Languages present in the library (as written in the first text of each)."""
+        self._refresh()
+        return tuple(texts[0]["language"] for texts in self._by_language.values())
+
+    def texts(self, language: str = "English") -> Tuple[Text, ...]:
+        """All texts for a language, in file order."""
+        self._refresh()
+        return self._by_language.get(language.lower(), ())
+
+    def get(self, name: str, language: str = "English") -> Optional[Text]:
+        """One text by name, or None."""
+        self._refresh()
+        return self._by_name.get((language.lower(), name))
+
+    def get_parts(self, name: str, language: str = "English") -> Optional[Mapping[str, str]]:
+        """Parts of one text by name, or None."""
+        text = self.get(name, language)
+        return text["parts"] if text is not None else None
+
+
+_library = LibraryStore(LIBRARY_DIR, legacy_file=TEXTS_FILE)
+
+
+def get_library() -> LibraryStore:
+    """Shared store for the built-in library."""
+    return _library
+
+
+def load_texts(language: str = "English") -> Tuple[Text, ...]:
+    return _library.texts(language)
+
+
+def get_fragment(text_name: str, part_name: str, language: str = "English") -> str:
+    parts = _library.get_parts(text_name, language)
+    return parts.get(part_name, "") if parts is not None else ""
@@ -1,83 +1,167 @@
 import json
+import logging
 import re
 
-import google.generativeai as genai
-import tiktoken
+from backend.app.core.cache import get_cache, make_cache_key
+from backend.app.core.config import feature_enabled, settings
+from backend.app.core.llm_factory import get_llm_provider
+from backend.app.services.local_splitter import split_local
+from backend.app.services.tokenizer import TokenizedDocument
 
-from backend.app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-_cfg = settings()
+SPLITTER_MODES = ("local", "llm", "refine")
 
-genai.configure(api_key=_cfg["GEMINI_API_KEY"])
-model = genai.GenerativeModel(_cfg["GEMINI_SPLITTER_MODEL"])
-encoding = tiktoken.get_encoding("cl100k_base")
 
+def _split_window(target_tokens: int) -> tuple[int, int, int]:
+    """Clamp the target and derive the soft_min..soft_max window around it."""
+    target_tokens = max(100, min(target_tokens, 900))
+    soft_min = max(60, int(target_tokens * 0.65))
+    soft_max = int(target_tokens * 1.4)
+    return target_tokens, soft_min, soft_max
+
+
+def split_locally(doc: TokenizedDocument, language: str = "English", target_tokens: int = 400) -> list[str]:
+    """Split an already tokenized text with the deterministic local engine (no API call)."""
+    target_tokens, soft_min, soft_max = _split_window(target_tokens)
+    return split_local(doc.text, language, target_tokens, soft_min, soft_max, doc.count)
+
+
+def _split_cache():
+    cfg = settings()
+    return get_cache(
+        "splits",
+        max_entries=256,
+        ttl_seconds=cfg["SPLIT_CACHE_TTL"],
+        disk=cfg["RESPONSE_CACHE_DISK"],
+    )
+
+
+def _split_key(full_text: str, target_tokens: int = 400, language: str = "English") -> str:
+    """Cache key of a split: hash of the text, target size, language and splitter mode."""
+    return make_cache_key(
+        "split",
+        full_text.strip(),
+        target_tokens,
+        (language or "English").lower(),
+        settings()["SPLITTER_MODE"].lower(),
+    )
 
-def num_tokens(text: str) -> int:
-    return len(encoding.encode(text))
 
+def _text_hash(full_text: str) -> str:
+    return make_cache_key("split-text", full_text.strip())
 
-def _fallback_simple_split(text: str, max_chars: int = 800) -> list[str]:
+
+def split_text_cached(
+    full_text: str,
+    target_tokens: int = 400,
+    language: str = "English",
+    doc: TokenizedDocument | None = None,
+) -> tuple[list[str], str]:
     """
-    Fallback splitter used when Gemini / JSON parsing fails.
-    - Split by blank lines into paragraphs.
-    - Merge paragraphs up to max_chars.
+    split_text_to_fragments through the short-lived "splits" cache.
+
+    Returns the fragments and a split token. Passing the token to
+    split_from_token uploads exactly the previewed split (and, in llm/refine
+    mode, skips a second Gemini call).
     """
-    text = text.strip()
-    if not text:
-        return []
-    
-    # Paragraphs separated by blank lines
-    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
-    if not paragraphs:
-        return [text]
-    
-    fragments: list[str] = []
-    current = ""
-    
-    for para in paragraphs:
-        # +2 for the '\n\n' we might add
-        if len(current) + len(para) + 2 <= max_chars:
-            if current:
-                current += "\n\n" + para
-            else:
-                current = para
-        else:
-            if current:
-                fragments.append(current)
-            current = para
-    
-    if current:
-        fragments.append(current)
-    
-    return fragments
+    key = _split_key(full_text, target_tokens, language)
+    entry = _split_cache().get(key)
+    if isinstance(entry, dict):
+        logger.info(f"♻️ Reusing cached split ({len(entry['fragments'])} fragments)")
+        return entry["fragments"], key
+    fragments = split_text_to_fragments(full_text, target_tokens, language=language, doc=doc)
+    if fragments:
+        _split_cache().set(key, {"text": _text_hash(full_text), "fragments": fragments})
+    return fragments, key
+
+
+def split_from_token(token: str, full_text: str) -> list[str] | None:
+    """Fragments stored under a split token, or None if it expired or belongs to another text."""
+    entry = _split_cache().get(token)
+    if not isinstance(entry, dict) or entry.get("text") != _text_hash(full_text):
+        return None
+    return entry["fragments"]
 
 
-def split_text_to_fragments(full_text: str, target_tokens: int = 400, max_tokens: int = 5000) -> list[str]:
+def split_text_to_fragments(
+    full_text: str,
+    target_tokens: int = 400,
+    max_tokens: int = 5000,
+    language: str = "English",
+    mode: str | None = None,
+    doc: TokenizedDocument | None = None,
+) -> list[str]:
     """
-    Split a long story into 2–8 logical fragments using Gemini.
-    On any error or invalid JSON, fall back to a simple rule-based splitter.
+    Split a long story into logical fragments.
+
+    SPLITTER_MODE (or mode) selects the engine:
+    - "local": deterministic sentence packing, no API call (default)
+    - "llm": Gemini splits the story; the local engine is the fallback
+    - "refine": the local split is sent to Gemini as a proposal to adjust;
+      kept as-is if the answer is invalid or changes the text
+    
+    The text is tokenized once; pass doc (a TokenizedDocument of the
+    stripped text) to share that encoding with the caller.
     """
     full_text = full_text.strip()
     if not full_text:
         return []
     
-    # For short texts, don't bother the LLM
+    # For short texts, don't bother splitting
     if len(full_text) < 800:
         return [full_text]
     
-    total_tokens = num_tokens(full_text)
+    mode = (mode or settings()["SPLITTER_MODE"]).lower()
+    if mode not in SPLITTER_MODES:
+        print(f"⚠️ Unknown SPLITTER_MODE '{mode}', using local")
+        mode = "local"
     
+    if doc is None or doc.text != full_text:
+        doc = TokenizedDocument(full_text)
+    local = split_locally(doc, language, target_tokens)
+    if mode == "local":
+        return local
+    if not feature_enabled("llm_split"):
+        print(f"⚠️ SPLITTER_MODE '{mode}' needs GEMINI_API_KEY, using local split")
+        return local
+    
+    total_tokens = len(doc)
     if total_tokens > max_tokens:
         print(f"Text exceeds max limit ({max_tokens} tokens). Found: {total_tokens}")
-        # Still try to split it with fallback
-        return _fallback_simple_split(full_text, max_chars=900)
+        return local
     
-    target_tokens = max(100, min(target_tokens, 900))
-    soft_min = max(60, int(target_tokens * 0.65))
-    soft_max = int(target_tokens * 1.4)
+    target_tokens, soft_min, soft_max = _split_window(target_tokens)
+    fragments = _llm_split(
+        full_text,
+        target_tokens,
+        soft_min,
+        soft_max,
+        proposal=local if mode == "refine" else None,
+    )
+    if fragments is None:
+        return local
     
+    # Refinement may only move boundaries; whitespace aside, the text must be unchanged
+    if mode == "refine" and "".join("".join(fragments).split()) != "".join(full_text.split()):
+        print("🔴 Refined split changed the text, keeping local split")
+        return local
+    
+    return fragments
+
+
+def _llm_split(
+    full_text: str,
+    target_tokens: int,
+    soft_min: int,
+    soft_max: int,
+    proposal: list[str] | None = None,
+) -> list[str] | None:
+    """
+    Ask Gemini for fragments. Returns None on any error or invalid JSON
+    so the caller can use the local split.
+    """
     prompt = f"""
 You are a precise text splitter for a reading comprehension app.
 Your job: split the story below into 2–8 logical fragments that are comfortable to read on screen.
@@ -99,9 +183,16 @@ Story:
 {full_text}
 """.strip()
     
+    if proposal:
+        proposed = json.dumps({"fragments": proposal}, ensure_ascii=False)
+        prompt += f"""
+
+A rule-based splitter proposed this split. Keep it unless moving a boundary
+clearly improves meaning or balance. Never change, add or drop any text:
+{proposed}"""
+    
     try:
-        response = model.generate_content(prompt)
-        raw_text = response.text.strip()
+        raw_text = get_llm_provider("splitter").complete([("user", prompt)], json_mode=True).strip()
         
         print("🟡 Raw LLM Response:", raw_text[:200] + "..." if len(raw_text) > 200 else raw_text)
         
@@ -129,12 +220,12 @@ Story:
                 fragments_json = json.loads(fixed_text)
                 print("🟢 Fixed JSON after escape sequence repair")
             except json.JSONDecodeError:
-                print("🔴 Could not fix JSON - falling back to simple split")
-                return _fallback_simple_split(full_text)
+                print("🔴 Could not fix JSON - falling back to local split")
+                return None
         
         if "fragments" not in fragments_json:
             print("🔴 No 'fragments' key found in response, falling back")
-            return _fallback_simple_split(full_text)
+            return None
         
         fragments = fragments_json["fragments"]
         
@@ -147,7 +238,7 @@ Story:
                     if result:
                         return result
                 print("🔴 Unexpected object format in fragments, falling back")
-                return _fallback_simple_split(full_text)
+                return None
             
             # Normal case: list of strings
             if fragments and isinstance(fragments[0], str):
@@ -155,14 +246,14 @@ Story:
                 if clean:
                     return clean
                 print("🔴 Fragments list is empty after cleaning, falling back")
-                return _fallback_simple_split(full_text)
+                return None
             
             print("🔴 Empty or invalid fragments array, falling back")
-            return _fallback_simple_split(full_text)
+            return None
         
         print("🔴 'fragments' is not an array, falling back")
-        return _fallback_simple_split(full_text)
+        return None
     
     except Exception as e:
         print(f"Error from Gemini in split_text_to_fragments: {e}")
-        return _fallback_simple_split(full_text)
+        return None
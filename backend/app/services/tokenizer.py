@@ -0,0 +1,104 @@
+"""Token counting for the splitter, batch planner and preview.
+
+TokenizedDocument encodes a text once and maps every character offset to
+the number of tokens that start before it, so "tokens in text[i:j]" is a
+prefix-array subtraction instead of a fresh tiktoken encode per candidate
+fragment.
+
+Counts for a span are the document's tokens that start inside it; at span
+edges this can differ by a token from encoding the slice on its own, which
+is well within the splitter's soft window.
+"""
+
+from array import array
+from functools import lru_cache
+from typing import List, Sequence, Tuple
+
+
+@lru_cache(maxsize=1)
+def get_encoding():
+    """cl100k_base encoding, loaded on first use (importing tiktoken and the BPE file is slow)."""
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def num_tokens(text: str) -> int:
+    return len(get_encoding().encode(text))
+
+
+class TokenizedDocument:
+    """A text encoded once, with O(1) token counts for any character span."""
+
+    def __init__(self, text: str):
+        self.text = text
+        encoding = get_encoding()
+        self.tokens = encoding.encode(text)
+
+        decoded, starts = encoding.decode_with_offsets(self.tokens)
+        if len(decoded) != len(text):
+            # Lossy round trip (e.g. lone surrogates): map offsets proportionally
+            scale = len(text) / max(1, len(decoded))
+            starts = [min(len(text), int(start * scale)) for start in starts]
+        self._starts = starts
+
+        # _before[c] = number of tokens starting before character c
+        size = len(text)
+        before = array("I", bytes(4 * (size + 1)))
+        for i, start in enumerate(starts):
+            stop = starts[i + 1] if i + 1 < len(starts) else size
+            if stop > start:
+                before[start + 1:stop + 1] = array("I", [i + 1]) * (stop - start)
+        self._before = before
+
+        self.part_spans: List[Tuple[int, int]] = [(0, size)]
+
+    @classmethod
+    def from_parts(cls, parts: Sequence[str], separator: str = "\n\n") -> "TokenizedDocument":
+        """Encode consecutive parts (e.g. fragments of one story) as a single document."""
+        doc = cls(separator.join(parts))
+        spans = []
+        start = 0
+        for part in parts:
+            spans.append((start, start + len(part)))
+            start += len(part) + len(separator)
+        doc.part_spans = spans
+        return doc
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def count(self, start: int = 0, end: int | None = None) -> int:
+        """Tokens in text[start:end]."""
+        end = len(self.text) if end is None else end
+        return self._before[end] - self._before[start]
+
+    def part_count(self, index: int) -> int:
+        """Tokens in part `index` (see from_parts)."""
+        return self.count(*self.part_spans[index])
+
+    def tail(self, end: int, max_tokens: int) -> str:
+        """Text of the last max_tokens tokens before character `end`."""
+        stop = self._before[end]
+        if stop == 0 or max_tokens <= 0:
+            return ""
+        first = max(0, stop - max_tokens)
+        return self.text[self._starts[first]:end]
+
+    def count_fragments(self, fragments: Sequence[str]) -> List[int]:
+        """
+        Token counts of fragments cut from this text, in order.
+
+        Fragments that are not verbatim slices (e.g. LLM output) are encoded
+        on their own.
+        """
+        counts = []
+        position = 0
+        for fragment in fragments:
+            start = self.text.find(fragment, position)
+            if start < 0:
+                counts.append(num_tokens(fragment))
+                continue
+            position = start + len(fragment)
+            counts.append(self.count(start, position))
+        return counts
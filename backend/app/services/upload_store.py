@@ -0,0 +1,214 @@
+"""Storage for user-uploaded texts.
+
+Two backends behind one interface:
+- SQLiteUploadStore (default): data/uploads.db in WAL mode, so every
+  uvicorn worker sees the same uploads and they survive restarts
+- MemoryUploadStore: bounded, process-local; for tests and throwaway setups
+
+Both index texts by (language, name) and list them in upload order, paged
+by id (keyset: "after this id", so new uploads never shift a page). `version` changes whenever an upload is added, so
+callers can derive cache validators without reading the texts.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import dropwhile, islice
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UploadStore(ABC):
+    """Interface for uploaded text storage."""
+
+    @abstractmethod
+    def add(self, name: str, language: str, parts: Dict[str, str]) -> dict:
+        """Store a text and return it as {name, language, parts}."""
+
+    @abstractmethod
+    def get(self, name: str, language: str) -> Optional[dict]:
+        """First text uploaded under name for language, or None."""
+
+    @abstractmethod
+    def list(self, language: str, after_id: int = 0, limit: Optional[int] = None) -> List[dict]:
+        """Texts for a language in upload order, starting after after_id; each also carries its "id"."""
+
+    @abstractmethod
+    def count(self, language: Optional[str] = None) -> int:
+        """Number of texts (for one language, or in total)."""
+
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """Counter that changes whenever the stored texts change."""
+
+
+class SQLiteUploadStore(UploadStore):
+    """Uploads in a shared SQLite file (WAL), indexed by language and name."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS uploads ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "name TEXT NOT NULL, language TEXT NOT NULL, language_key TEXT NOT NULL, "
+                "parts TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            # (language_key, name) serves lookups; rowid order within a language serves listing
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_uploads_language_name ON uploads(language_key, name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_uploads_language_id ON uploads(language_key, id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _row_to_text(row: Tuple[str, str, str]) -> dict:
+        name, language, parts = row
+        return {"name": name, "language": language, "parts": json.loads(parts)}
+
+    def add(self, name: str, language: str, parts: Dict[str, str]) -> dict:
+        with self._lock:
+            conn = self._db()
+            with conn:
+                conn.execute(
+                    "INSERT INTO uploads (name, language, language_key, parts, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (name, language, language.lower(), json.dumps(parts, ensure_ascii=False), time.time()),
+                )
+                conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+        return {"name": name, "language": language, "parts": parts}
+
+    def get(self, name: str, language: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT name, language, parts FROM uploads "
+                "WHERE language_key = ? AND name = ? ORDER BY id LIMIT 1",
+                (language.lower(), name),
+            ).fetchone()
+        return self._row_to_text(row) if row else None
+
+    def list(self, language: str, after_id: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            # Seek on the (language_key, id) index instead of skipping rows
+            rows = self._db().execute(
+                "SELECT id, name, language, parts FROM uploads "
+                "WHERE language_key = ? AND id > ? ORDER BY id LIMIT ?",
+                (language.lower(), after_id, -1 if limit is None else limit),
+            ).fetchall()
+        return [{"id": row[0], **self._row_to_text(row[1:])} for row in rows]
+
+    def count(self, language: Optional[str] = None) -> int:
+        with self._lock:
+            if language is None:
+                (total,) = self._db().execute("SELECT COUNT(*) FROM uploads").fetchone()
+            else:
+                (total,) = self._db().execute(
+                    "SELECT COUNT(*) FROM uploads WHERE language_key = ?", (language.lower(),)
+                ).fetchone()
+        return total
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            (value,) = self._db().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return value
+
+
+class MemoryUploadStore(UploadStore):
+    """Process-local uploads, bounded to max_entries (oldest dropped first)."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._next_id = 1  # ids start at 1, as in SQLite, so after_id=0 lists everything
+        self._version = 0
+        self._by_language: Dict[str, "OrderedDict[int, dict]"] = {}
+        self._by_name: Dict[Tuple[str, str], List[int]] = {}
+        self._order: "OrderedDict[int, str]" = OrderedDict()  # id -> language key
+
+    def add(self, name: str, language: str, parts: Dict[str, str]) -> dict:
+        item = {"name": name, "language": language, "parts": parts}
+        key = language.lower()
+        with self._lock:
+            text_id = self._next_id
+            self._next_id += 1
+            self._by_language.setdefault(key, OrderedDict())[text_id] = item
+            self._by_name.setdefault((key, name), []).append(text_id)
+            self._order[text_id] = key
+            while len(self._order) > self.max_entries:
+                self._evict_oldest()
+            self._version += 1
+        return item
+
+    def _evict_oldest(self) -> None:
+        text_id, key = self._order.popitem(last=False)
+        item = self._by_language[key].pop(text_id)
+        ids = self._by_name[(key, item["name"])]
+        ids.remove(text_id)
+        if not ids:
+            del self._by_name[(key, item["name"])]
+
+    def get(self, name: str, language: str) -> Optional[dict]:
+        key = language.lower()
+        with self._lock:
+            ids = self._by_name.get((key, name))
+            return self._by_language[key][ids[0]] if ids else None
+
+    def list(self, language: str, after_id: int = 0, limit: Optional[int] = None) -> List[dict]:
+        with self._lock:
+            items = self._by_language.get(language.lower(), {}).items()
+            newer = dropwhile(lambda entry: entry[0] <= after_id, items)
+            return [{"id": text_id, **item} for text_id, item in islice(newer, limit)]
+
+    def count(self, language: Optional[str] = None) -> int:
+        with self._lock:
+            if language is None:
+                return len(self._order)
+            return len(self._by_language.get(language.lower(), ()))
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+
+_store: Optional[UploadStore] = None
+_store_lock = threading.Lock()
+
+
+def get_upload_store() -> UploadStore:
+    """
+    Shared upload store selected by UPLOAD_STORE ("sqlite" or "memory").
+
+    Returns:
+        Process-wide UploadStore instance
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            cfg = settings()
+            backend = cfg["UPLOAD_STORE"].lower()
+            if backend == "memory":
+                _store = MemoryUploadStore(cfg["UPLOAD_MEMORY_MAX_ENTRIES"])
+            elif backend == "sqlite":
+                _store = SQLiteUploadStore(Path(cfg["UPLOAD_DB_PATH"]))
+            else:
+                raise ValueError(f"❌ Unknown UPLOAD_STORE '{backend}' (expected 'sqlite' or 'memory')")
+            logger.info(f"📝 Upload store: {backend}")
+        return _store
@@ -5,9 +5,11 @@ const API_BASE = import.meta.env.VITE_API_BASE || 'http://localhost:8000'
 export const api = axios.create({ baseURL: API_BASE })
 
 export type TextItem = { name: string; language: string; parts: Record<string, string> }
+export type TextSummary = { name: string; fragmentCount: number }
 
+// Library picker only needs names; parts are fetched per text via getParts
 export async function listTexts(lang: string) {
-  const res = await api.get<TextItem[]>(`/texts`, { params: { lang } })
+  const res = await api.get<TextSummary[]>(`/texts`, { params: { lang, fields: 'name,fragmentCount' } })
   return res.data
 }
 
@@ -21,6 +23,63 @@ export async function simplify(text: string, language: string, level: string = '
   return res.data.text
 }
 
+// POSTs to a server-sent events endpoint and calls onEvent for each event.
+// An `error` event is thrown. Abort the signal to stop generation server-side.
+async function postEventStream(
+  path: string,
+  body: unknown,
+  onEvent: (event: string | undefined, data: any) => void,
+  signal?: AbortSignal,
+) {
+  const res = await fetch(`${API_BASE}${path}`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(body),
+    signal,
+  })
+  if (!res.ok || !res.body) {
+    throw new Error(`${path} failed: ${res.status}`)
+  }
+
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true })
+    let end: number
+    while ((end = buffer.indexOf('\n\n')) >= 0) {
+      const block = buffer.slice(0, end)
+      buffer = buffer.slice(end + 2)
+      const event = /^event: (.*)$/m.exec(block)?.[1]
+      const data = JSON.parse(/^data: (.*)$/m.exec(block)?.[1] ?? '{}')
+      if (event === 'error') {
+        throw new Error(data.detail)
+      }
+      onEvent(event, data)
+    }
+  }
+}
+
+// Streams /qa/simplify/stream; onText receives the text so far.
+export async function simplifyStream(
+  text: string,
+  language: string,
+  level: string = 'default',
+  onText: (textSoFar: string) => void,
+  signal?: AbortSignal,
+) {
+  let result = ''
+  await postEventStream('/qa/simplify/stream', { text, language, level }, (event, data) => {
+    if (event === 'text') {
+      result += data.text
+      onText(result)
+    }
+  }, signal)
+  return result
+}
+
 export async function formatText(text: string, language: string) {
   const res = await api.post<{ text: string }>(`/qa/format`, { text, language })
   return res.data.text
@@ -31,23 +90,30 @@ export async function generateQuestions(fragment: string, previous: string[], la
   return res.data
 }
 
-export async function generateQuestionsBatch(
+// Streams /qa/questions/batch/stream; onFragment receives each fragment's
+// questions as soon as they are generated (fragments may arrive out of order).
+export async function generateQuestionsBatchStream(
   textName: string,
   fragments: string[],
   language: string,
-  difficulty: string = 'standard'
+  difficulty: string = 'standard',
+  onFragment: (index: number, questions: string[]) => void,
+  signal?: AbortSignal,
 ) {
-  const res = await api.post<{
-    questions_by_fragment: Record<number, string[]>
-    total_fragments: number
-    total_api_calls: number
-  }>(`/qa/questions/batch`, {
+  let total = 0
+  await postEventStream('/qa/questions/batch/stream', {
     text_name: textName,
     fragments,
     language,
     difficulty
-  })
-  return res.data
+  }, (event, data) => {
+    if (event === 'fragment') {
+      onFragment(data.index, data.questions)
+    } else if (event === 'done') {
+      total = data.total_fragments
+    }
+  }, signal)
+  return { total_fragments: total }
 }
 
 export async function evaluate(
@@ -68,14 +134,15 @@ export async function uploadText(
   text: string,
   autoSplit = true,
   fragmentTargetTokens = 400,
+  splitToken?: string,
 ) {
-  const res = await api.post(`/texts`, { name, language, text, autoSplit, fragmentTargetTokens })
+  const res = await api.post(`/texts`, { name, language, text, autoSplit, fragmentTargetTokens, splitToken })
   return res.data
 }
 
-export async function previewFragments(text: string, targetTokens: number) {
-  const res = await api.post<{ fragments: string[] }>(`/texts/preview`, { text, targetTokens })
-  return res.data.fragments
+export async function previewFragments(text: string, targetTokens: number, language?: string) {
+  const res = await api.post<{ fragments: string[]; tokens: number[]; splitToken: string }>(`/texts/preview`, { text, targetTokens, language })
+  return res.data
 }
 
 export type WordTiming = {
@@ -84,9 +151,20 @@ export type WordTiming = {
   end: number
 }
 
-export async function synthesizeAudio(text: string, language: string) {
-  const res = await api.post<{ audio: string; mime: string; words: WordTiming[] }>(`/qa/audio`, { text, language })
+export type AudioResource = { id: string; mime: string; url: string; words_url: string }
+
+// Renders (or reuses) audio and returns URLs; point an <audio> element at audioUrl(res)
+// to stream playback instead of downloading base64 JSON.
+export async function renderAudio(text: string, language: string) {
+  const res = await api.post<AudioResource>(`/qa/audio/render`, { text, language })
   return res.data
 }
 
+export function audioUrl(resource: AudioResource) {
+  return `${API_BASE}${resource.url}`
+}
 
+export async function getAudioWords(resource: AudioResource) {
+  const res = await api.get<WordTiming[]>(resource.words_url)
+  return res.data
+}
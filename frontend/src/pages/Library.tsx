@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useRef, useState } from 'react'
-import type { TextItem, WordTiming } from '../api/client'
-import { evaluate, generateQuestions, generateQuestionsBatch, getParts, listTexts, synthesizeAudio, simplify } from '../api/client'
+import type { TextSummary, WordTiming } from '../api/client'
+import { audioUrl as audioResourceUrl, evaluate, generateQuestions, generateQuestionsBatchStream, getAudioWords, getParts, listTexts, renderAudio, simplify } from '../api/client'
 import { LANGS, type Lang, useTranslations } from '../i18n'
 
 type LibraryProps = {
@@ -117,7 +117,7 @@ function buildFragmentHtml(
 
 export default function Library({ language, onLanguageChange }: LibraryProps) {
   const t = useTranslations(language)
-  const [texts, setTexts] = useState<TextItem[]>([])
+  const [texts, setTexts] = useState<TextSummary[]>([])
   const [selectedText, setSelectedText] = useState('')
   const [parts, setParts] = useState<Record<string, string>>({})
   const [selectedPart, setSelectedPart] = useState('')
@@ -164,6 +164,12 @@ export default function Library({ language, onLanguageChange }: LibraryProps) {
   const [questionCache, setQuestionCache] = useState<Record<number, string[]>>({})
   const [allQuestionsLoaded, setAllQuestionsLoaded] = useState(false)
   const [batchGenerating, setBatchGenerating] = useState(false)
+  // Read by stream callbacks, which outlive the render that started them
+  const selectedPartRef = useRef(selectedPart)
+
+  useEffect(() => {
+    selectedPartRef.current = selectedPart
+  }, [selectedPart])
 
   const currentQuestion = useMemo(() => questions[qIndex] || '', [questions, qIndex])
 
@@ -291,32 +297,34 @@ export default function Library({ language, onLanguageChange }: LibraryProps) {
     
     try {
       const fragmentsArray = Object.values(parts)
-      const result = await generateQuestionsBatch(
+      const partKeys = Object.keys(parts)
+      
+      // Fill the cache fragment by fragment as questions arrive
+      const result = await generateQuestionsBatchStream(
         selectedText,
         fragmentsArray,
         language,
-        difficulty
+        difficulty,
+        (index, fragmentQuestions) => {
+          setQuestionCache(prev => ({ ...prev, [index]: fragmentQuestions }))
+          
+          // Load questions for the fragment shown now (the user may have moved on) as soon as they are ready
+          if (index === partKeys.indexOf(selectedPartRef.current) && fragmentQuestions.length > 0) {
+            setQuestions(fragmentQuestions)
+            setQIndex(0)
+            setAnswer('')
+            setFeedback('')
+            setHighlight(null)
+            setLastResult('idle')
+          }
+        }
       )
-      
-      // Store all questions in cache
-      setQuestionCache(result.questions_by_fragment)
       setAllQuestionsLoaded(true)
       
-      // Load questions for current fragment
-      const currentFragmentIndex = Object.keys(parts).indexOf(selectedPart)
-      if (currentFragmentIndex >= 0 && result.questions_by_fragment[currentFragmentIndex]) {
-        setQuestions(result.questions_by_fragment[currentFragmentIndex])
-        setQIndex(0)
-        setAnswer('')
-        setFeedback('')
-        setHighlight(null)
-        setLastResult('idle')
-      }
-      
-      console.log(`✅ Generated questions for ${result.total_fragments} fragments in ${result.total_api_calls} API call(s)`)
+      console.log(`✅ Generated questions for ${result.total_fragments} fragments`)
     } catch (err: any) {
       console.error('Batch question generation failed', err)
-      alert(err.response?.data?.detail || 'Failed to generate questions. Please try again.')
+      alert(err.message || 'Failed to generate questions. Please try again.')
     } finally {
       setBatchGenerating(false)
     }
@@ -393,7 +401,8 @@ export default function Library({ language, onLanguageChange }: LibraryProps) {
     
     // Check if we have cached questions for this fragment
     const fragmentIndex = Object.keys(parts).indexOf(part)
-    if (allQuestionsLoaded && questionCache[fragmentIndex]) {
+    // While a batch is streaming, fragments that already arrived are usable
+    if ((allQuestionsLoaded || batchGenerating) && questionCache[fragmentIndex]) {
       // Use cached questions
       setQuestions(questionCache[fragmentIndex])
       setQIndex(0)
@@ -469,20 +478,20 @@ export default function Library({ language, onLanguageChange }: LibraryProps) {
     setAudioError('')
 
     try {
-      const { audio, mime, words } = await synthesizeAudio(target, language)
-      
-      // Create data URL for audio player
-      const dataUrl = `data:${mime};base64,${audio}`
+      // Render (or reuse) the clip; the player then streams it by URL instead of base64 JSON
+      const resource = await renderAudio(target, language)
+      const src = audioResourceUrl(resource)
       
       if (kind === 'fragment') {
         // For fragment audio, show persistent player with word highlighting
-        setAudioUrl(dataUrl)
+        const words = await getAudioWords(resource)
+        setAudioUrl(src)
         setWordTimings(words || [])
         setCurrentWordIndex(-1)
         setFragmentReading(false)
       } else {
         // For question audio, play immediately without showing player
-        const tempAudio = new Audio(dataUrl)
+        const tempAudio = new Audio(src)
         tempAudio.play()
       }
       
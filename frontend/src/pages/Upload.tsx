@@ -1,6 +1,6 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useNavigate } from 'react-router-dom'
-import { formatText, previewFragments, simplify, uploadText } from '../api/client'
+import { formatText, previewFragments, simplifyStream, uploadText } from '../api/client'
 import { LANGS, type Lang, useTranslations } from '../i18n'
 
 type UploadProps = {
@@ -27,18 +27,24 @@ export default function Upload({ language, onLanguageChange }: UploadProps) {
   const [text, setText] = useState('')
   const [fragmentSize, setFragmentSize] = useState<keyof typeof FRAGMENT_TARGETS>('medium')
   const [preview, setPreview] = useState<string[]>([])
+  const [splitToken, setSplitToken] = useState<string | undefined>()
   const [busy, setBusy] = useState(false)
   const [message, setMessage] = useState('')
 
+  // A preview's split only applies to the text and size it was made for
+  useEffect(() => setSplitToken(undefined), [text, fragmentSize, language])
+
   async function handleSimplify(level: 'gentle' | 'deep') {
     if (!text.trim()) return
     setBusy(true)
     setMessage('')
+    const original = text
     try {
-      const simplified = await simplify(text, language, level === 'gentle' ? 'gentle' : 'deep')
-      setText(simplified)
+      // Show the simplified text as it is generated
+      await simplifyStream(text, language, level === 'gentle' ? 'gentle' : 'deep', setText)
     } catch (err) {
       console.error('simplify failed', err)
+      setText(original)
       setMessage(t.uploadError)
     } finally {
       setBusy(false)
@@ -65,11 +71,14 @@ export default function Upload({ language, onLanguageChange }: UploadProps) {
     setBusy(true)
     setMessage('')
     try {
-      const fragments = await previewFragments(text, FRAGMENT_TARGETS[fragmentSize])
-      setPreview(fragments)
+      // Saving with the split token stores exactly these fragments
+      const result = await previewFragments(text, FRAGMENT_TARGETS[fragmentSize], language)
+      setPreview(result.fragments)
+      setSplitToken(result.splitToken)
     } catch (err) {
       console.error('preview failed', err)
       setPreview([])
+      setSplitToken(undefined)
     } finally {
       setBusy(false)
     }
@@ -81,7 +90,7 @@ export default function Upload({ language, onLanguageChange }: UploadProps) {
     setMessage('')
     try {
       const finalTitle = title.trim() || generateAutoTitle(text)
-      await uploadText(finalTitle, language, text, true, FRAGMENT_TARGETS[fragmentSize])
+      await uploadText(finalTitle, language, text, true, FRAGMENT_TARGETS[fragmentSize], splitToken)
       setMessage(t.uploadSuccess)
       localStorage.setItem('reading:lastUploaded', finalTitle)
       setTimeout(() => {
@@ -0,0 +1,140 @@
+"""Benchmark for the per-user rate limiters in core/rate_limit.py.
+
+Measures per-check latency of each backend with many threads checking at
+once, and verifies the guarantees the limiter exists for:
+- a burst from many threads (and, for SQLite, many processes standing in
+  for uvicorn workers) on one user is granted exactly `capacity` requests
+- the memory backend never holds more than max_entries buckets
+
+Usage:
+    python scripts/bench_rate_limiter.py [--threads 8] [--checks 2000] [--users 200] [--processes 4]
+"""
+
+import argparse
+import multiprocessing
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.core.rate_limit import MemoryRateLimiter, SQLiteRateLimiter
+
+# Practically no refill during a run, so grants must equal capacity exactly
+BURST_CAPACITY = 50
+BURST_REFILL = 1e-9
+
+
+def _hammer(limiter, threads: int, checks: int, keys: list) -> tuple[list, int, float]:
+    """Run checks from several threads at once; returns (latencies, allowed, wall seconds)."""
+    latencies = [[] for _ in range(threads)]
+    allowed = [0] * threads
+    barrier = threading.Barrier(threads)
+
+    def worker(index: int) -> None:
+        rng = random.Random(index)
+        barrier.wait()
+        for _ in range(checks):
+            key = rng.choice(keys)
+            start = time.perf_counter()
+            ok, _ = limiter.is_allowed(key)
+            latencies[index].append(time.perf_counter() - start)
+            allowed[index] += ok
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - start
+    return [value for per_thread in latencies for value in per_thread], sum(allowed), wall
+
+
+def _report(label: str, latencies: list, wall: float) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"⏱️ {label:<8} mean {statistics.mean(latencies) * 1e6:8.1f} µs  "
+        f"p50 {statistics.median(latencies) * 1e6:8.1f} µs  "
+        f"p99 {p99 * 1e6:8.1f} µs  "
+        f"{len(latencies) / wall:9.0f} checks/s"
+    )
+
+
+def _process_burst(path: str, checks: int, start_event, results) -> None:
+    limiter = SQLiteRateLimiter(Path(path), "burst", BURST_CAPACITY, BURST_REFILL)
+    start_event.wait()
+    results.put(sum(limiter.is_allowed("same-user")[0] for _ in range(checks)))
+
+
+def main(threads: int, checks: int, users: int, processes: int) -> int:
+    ok = True
+    keys = [f"user-{i}" for i in range(users)]
+    tmp = Path(tempfile.mkdtemp(prefix="bench_rate_limiter_"))
+    print(f"📏 {threads} threads × {checks} checks over {users} users")
+
+    # Per-check overhead under contention (default evaluation quota)
+    memory = MemoryRateLimiter(8, 0.15, max_entries=users)
+    latencies, _, wall = _hammer(memory, threads, checks, keys)
+    _report("memory", latencies, wall)
+
+    sqlite = SQLiteRateLimiter(tmp / "latency.db", "bench", 8, 0.15)
+    latencies, _, wall = _hammer(sqlite, threads, checks, keys)
+    _report("sqlite", latencies, wall)
+
+    # Burst on one user from many threads
+    for label, limiter in (
+        ("memory", MemoryRateLimiter(BURST_CAPACITY, BURST_REFILL)),
+        ("sqlite", SQLiteRateLimiter(tmp / "threads.db", "burst", BURST_CAPACITY, BURST_REFILL)),
+    ):
+        _, granted, _ = _hammer(limiter, threads, 100, ["same-user"])
+        mark = "✅" if granted == BURST_CAPACITY else "❌"
+        ok &= granted == BURST_CAPACITY
+        print(f"{mark} {label} thread burst: {granted} granted (capacity {BURST_CAPACITY})")
+
+    # Burst on one user from several processes sharing the SQLite file
+    context = multiprocessing.get_context("spawn")
+    start_event = context.Event()
+    results = context.Queue()
+    pool = [
+        context.Process(target=_process_burst, args=(str(tmp / "processes.db"), 100, start_event, results))
+        for _ in range(processes)
+    ]
+    for process in pool:
+        process.start()
+    time.sleep(0.5)
+    start_event.set()
+    granted = sum(results.get() for _ in pool)
+    for process in pool:
+        process.join()
+    mark = "✅" if granted == BURST_CAPACITY else "❌"
+    ok &= granted == BURST_CAPACITY
+    print(f"{mark} sqlite {processes}-process burst: {granted} granted (capacity {BURST_CAPACITY})")
+
+    # Memory bound: more users than max_entries
+    bounded = MemoryRateLimiter(8, 0.15, max_entries=100)
+    for key in keys * 2:
+        bounded.is_allowed(key)
+    mark = "✅" if len(bounded) <= 100 else "❌"
+    ok &= len(bounded) <= 100
+    print(f"{mark} memory buckets after {users} users: {len(bounded)} (max 100)")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent threads")
+    parser.add_argument("--checks", type=int, default=2000, help="Checks per thread")
+    parser.add_argument("--users", type=int, default=200, help="Distinct user ids")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes for the shared-quota check")
+    args = parser.parse_args()
+
+    sys.exit(main(args.threads, args.checks, args.users, args.processes))
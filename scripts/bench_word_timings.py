@@ -0,0 +1,119 @@
+"""Micro-benchmark for word timing calculation.
+
+Compares the memoized, batch syllable engine in services/audio.py against
+the previous per-word implementation (uncached pyphen call and punctuation
+scan for every word) on the library fragments, and checks both produce
+identical timings.
+
+Usage:
+    python scripts/bench_word_timings.py [--rounds 20]
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.audio import (
+    PUNCTUATION_PAUSES,
+    SYLLABLES_PER_SECOND,
+    calculate_word_timings,
+    get_hyphenator,
+)
+from backend.app.services.text_loader import load_texts
+
+
+def _reference_word_timings(text, language="English", estimated_duration=None):
+    """Per-word loop as it was before the syllable cache."""
+    words = re.findall(r'\S+', text)
+    if not words:
+        return []
+
+    syllables_per_sec = SYLLABLES_PER_SECOND.get(language, 4.5)
+    language_pauses = PUNCTUATION_PAUSES.get(language, PUNCTUATION_PAUSES["English"])
+    hyphenator = get_hyphenator(language)
+
+    word_data = []
+    total_syllables = 0
+    total_pause_time = 0.0
+    for word in words:
+        clean_word = re.sub(r'[^\w]', '', word)
+        syllable_count = hyphenator.inserted(clean_word).count('-') + 1 if clean_word else 1
+
+        pause_duration = 0.0
+        for punct, pause in language_pauses.items():
+            if word.endswith(punct):
+                pause_duration = pause
+                break
+
+        word_data.append({'word': word, 'syllables': syllable_count, 'pause': pause_duration})
+        total_syllables += syllable_count
+        total_pause_time += pause_duration
+
+    if estimated_duration is None:
+        estimated_duration = total_syllables / syllables_per_sec + total_pause_time
+
+    timings = []
+    current_time = 0.0
+    words_duration = estimated_duration - total_pause_time
+    for wd in word_data:
+        word_duration = (wd['syllables'] / total_syllables) * words_duration if total_syllables > 0 else 0.1
+        timings.append({
+            'word': wd['word'],
+            'start': round(current_time, 2),
+            'end': round(current_time + word_duration, 2),
+        })
+        current_time += word_duration + wd['pause']
+    return timings
+
+
+def _fragments():
+    """(language, fragment) pairs for the whole library."""
+    pairs = []
+    for language in SYLLABLES_PER_SECOND:
+        for text in load_texts(language):
+            pairs.extend((language, part) for part in text["parts"].values() if part.strip())
+    return pairs
+
+
+def _time(func, fragments, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for language, fragment in fragments:
+            func(fragment, language)
+    return time.perf_counter() - start
+
+
+def main(rounds: int) -> None:
+    fragments = _fragments()
+    if not fragments:
+        print("❌ No library fragments found in data/")
+        return
+
+    for language, fragment in fragments:
+        if calculate_word_timings(fragment, language) != _reference_word_timings(fragment, language):
+            print(f"❌ Timings differ for a {language} fragment")
+            sys.exit(1)
+
+    words = sum(len(fragment.split()) for _, fragment in fragments)
+    print(f"📏 {len(fragments)} fragments, {words} words, {rounds} rounds")
+
+    before = _time(_reference_word_timings, fragments, rounds)
+    after = _time(calculate_word_timings, fragments, rounds)
+    per_round = 1000 / rounds
+    print(f"⏱️ per-word loop:  {before * per_round:8.1f} ms/round")
+    print(f"⚡ cached engine:  {after * per_round:8.1f} ms/round")
+    print(f"🚀 speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="Passes over the library")
+    args = parser.parse_args()
+
+    main(args.rounds)
@@ -0,0 +1,94 @@
+"""Import-time budget check for the backend.
+
+Imports backend.app.main in a fresh interpreter (what a PythonAnywhere
+cold start does) and reports wall time and peak RSS. Fails if either is
+over budget, or if any SDK that should load on first use
+(langchain, Gemini, gradio_client, openai, tiktoken, pyphen, ...) was
+imported eagerly.
+
+Usage:
+    python scripts/check_startup.py [--runs 3] [--max-seconds 1.5] [--max-rss-mb 100]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# Modules that must only be imported on first use
+LAZY_MODULES = (
+    "langchain_core",
+    "langchain_google_genai",
+    "google.generativeai",
+    "gradio_client",
+    "openai",
+    "tiktoken",
+    "pyphen",
+    "requests",
+)
+
+_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import backend.app.main
+seconds = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": rss_kb / 1024,
+    "eager": [name for name in {lazy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure_startup() -> dict:
+    """Import the app once in a subprocess and return its measurements."""
+    probe = _PROBE.format(root=str(project_root), lazy=LAZY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", probe],
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"❌ Importing the app failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check backend import time and memory")
+    parser.add_argument("--runs", type=int, default=3, help="Imports to measure (best run counts)")
+    parser.add_argument("--max-seconds", type=float, default=1.5, help="Import time budget")
+    parser.add_argument("--max-rss-mb", type=float, default=100.0, help="Peak RSS budget")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(max(1, args.runs))]
+    seconds = min(run["seconds"] for run in runs)
+    rss_mb = min(run["rss_mb"] for run in runs)
+    eager = sorted({name for run in runs for name in run["eager"]})
+
+    print(f"⏱️ Import time: {seconds:.3f}s (budget {args.max_seconds:.1f}s)")
+    print(f"🧠 Peak RSS: {rss_mb:.1f} MB (budget {args.max_rss_mb:.0f} MB)")
+
+    ok = True
+    if seconds > args.max_seconds:
+        print("❌ Import time over budget")
+        ok = False
+    if rss_mb > args.max_rss_mb:
+        print("❌ Memory over budget")
+        ok = False
+    if eager:
+        print(f"❌ Imported at startup, should be lazy: {', '.join(eager)}")
+        ok = False
+
+    if ok:
+        print("✅ Startup within budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,47 +1,69 @@
-"""Utility script to add texts to JSON library.
+"""Utility script to add texts to the library.
 
 This script is used to process and add new texts to the application's
-data/texts.json file with automatic text splitting.
+library (data/library/: manifest.json + fragments.dat) with automatic text
+splitting, to migrate the legacy data/texts.json into that format, and to
+precompute the question bank served for library texts.
 
 Usage:
     python scripts/toJson.py
+    python scripts/toJson.py --migrate
+    python scripts/toJson.py --build-questions [--force]
 """
 
+import argparse
 import json
 import os
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
 
 # Add backend to path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from backend.app.services.library_format import append_texts, migrate_texts_json, parts_dict, read_manifest
+from backend.app.services.text_loader import LIBRARY_DIR, TEXTS_FILE, LibraryStore
 from backend.app.services.textsplitter import split_text_to_fragments
+from backend.app.services.question_generator import QUESTION_PROMPT_VERSION, generate_questions_batch
+from backend.app.services.question_bank import BANK_DIFFICULTIES, BANK_FILE, bank_key, read_bank_file
 
 
-def add_text_to_json(file_path, text, language, title):
+def migrate_library(texts_file=TEXTS_FILE, library_dir=LIBRARY_DIR):
     """
-    Add a text to the JSON library with automatic fragmentation.
+    One-shot migration of the legacy texts.json into data/library/.
+
+    Args:
+        texts_file: Path to the legacy texts.json
+        library_dir: Target library directory
+    """
+    count = migrate_texts_json(Path(texts_file), Path(library_dir))
+    print(f"✅ Migrated {count} texts from {texts_file} → {library_dir}")
+
+
+def add_text_to_library(library_dir, text, language, title):
+    """
+    Add a text to the library with automatic fragmentation.
     
     Args:
-        file_path: Path to texts.json file
+        library_dir: Path to the library directory (data/library)
         text: Full text content
         language: Language code (English, Latvian, Spanish, Russian)
         title: Display title for the text
     """
-    fragments = split_text_to_fragments(text)
+    library_dir = Path(library_dir)
+    fragments = split_text_to_fragments(text, language=language)
     if not fragments:
         print("❌ Failed to split text into fragments.")
         return
 
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
-        data = {"texts": []}
+    manifest = read_manifest(library_dir)
+    if manifest is None and TEXTS_FILE.exists():
+        migrate_library(TEXTS_FILE, library_dir)
+        manifest = read_manifest(library_dir)
 
     # Avoid duplicate titles for the same language
-    for text_entry in data["texts"]:
+    for text_entry in (manifest or {}).get("texts", []):
         if text_entry["language"] == language and text_entry["name"].strip().lower() == title.strip().lower():
             print(f"⚠️ Text with title '{title}' already exists in {language}.")
             return
@@ -60,18 +82,90 @@ def add_text_to_json(file_path, text, language, title):
         "parts": parts
     }
 
-    data["texts"].append(entry)
+    append_texts(library_dir, [entry])
+
+    print(f"✅ Added '{title}' to {library_dir}")
 
-    # Use indent=4 to make the JSON more readable
-    # ensure_ascii=False to properly handle non-ASCII characters
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
 
-    print(f"✅ Added '{title}' to {file_path}")
+def _write_json_atomic(path, data):
+    """Write JSON via a temp file so readers never see a half-written bank."""
+    path = Path(path)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
 
 
-# === CLI Test ===
+def build_question_bank(library_dir=LIBRARY_DIR, bank_path=BANK_FILE, difficulties=BANK_DIFFICULTIES, force=False):
+    """
+    Generate questions for every library fragment × difficulty and store them
+    in the question bank, stamped with the current prompt version.
+
+    Args:
+        library_dir: Path to the library directory
+        bank_path: Path to question_bank.json
+        difficulties: Difficulty levels to precompute
+        force: Regenerate entries that already exist
+    """
+    bank = read_bank_file(Path(bank_path))
+    if bank.get("prompt_version") != QUESTION_PROMPT_VERSION:
+        print(f"♻️ Prompt version changed ({bank.get('prompt_version')} → {QUESTION_PROMPT_VERSION}), rebuilding bank")
+        bank = {"prompt_version": QUESTION_PROMPT_VERSION, "entries": {}}
+    entries = bank.setdefault("entries", {})
+
+    library = LibraryStore(Path(library_dir), legacy_file=TEXTS_FILE)
+    for text in (t for language in library.languages() for t in library.texts(language)):
+        language = text["language"]
+        parts = parts_dict(text["parts"])
+        part_names = list(parts.keys())
+        fragments = [parts[name] for name in part_names]
+
+        for difficulty in difficulties:
+            keys = [bank_key(fragment, language, difficulty) for fragment in fragments]
+            if not force and all(key in entries for key in keys):
+                print(f"⏭️ '{text['name']}' ({language}, {difficulty}) already in bank")
+                continue
+
+            try:
+                result = generate_questions_batch(fragments, language, difficulty, text_name=text["name"])
+            except ValueError as e:
+                print(f"❌ Failed for '{text['name']}' ({language}, {difficulty}): {e}")
+                continue
+
+            for i, key in enumerate(keys):
+                questions = result["questions_by_fragment"].get(i)
+                if questions:
+                    entries[key] = {
+                        "text": text["name"],
+                        "part": part_names[i],
+                        "language": language,
+                        "difficulty": difficulty,
+                        "questions": questions,
+                    }
+
+            bank["generated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            _write_json_atomic(bank_path, bank)
+            print(f"✅ Banked '{text['name']}' ({language}, {difficulty}): {result.get('api_calls', 0)} API call(s)")
+
+    print(f"📚 Question bank has {len(entries)} entries → {bank_path}")
+
+
+# === CLI ===
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--migrate", action="store_true", help="Convert data/texts.json to data/library/")
+    parser.add_argument("--build-questions", action="store_true", help="Precompute the library question bank")
+    parser.add_argument("--force", action="store_true", help="Regenerate existing question bank entries")
+    args = parser.parse_args()
+
+    if args.migrate:
+        migrate_library()
+        sys.exit(0)
+
+    if args.build_questions:
+        build_question_bank(force=args.force)
+        sys.exit(0)
+
     # Test with sample text
     test_file = "Pasakas/Горячий_камень.txt"
 
@@ -88,5 +182,5 @@ if __name__ == "__main__":
 
     # Remove soft hyphens but keep all other formatting
     sample = sample.replace("\u00AD", "")
-    add_text_to_json("data/texts.json", sample, "Russian", "Горячий камень")
+    add_text_to_library(LIBRARY_DIR, sample, "Russian", "Горячий камень")
 
@@ -0,0 +1,53 @@
+"""Pre-render TTS audio for every library fragment.
+
+Fills the disk audio cache (data/cache/audio/) so that /qa/audio serves
+library fragments with a file read instead of a 20-60s Space round trip.
+Already cached fragments are skipped, so the script can be re-run safely.
+
+Usage:
+    python scripts/warm_audio_cache.py [--language Latvian]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.app.services.audio import TTS_CONFIG, synthesize_audio
+from backend.app.services.text_loader import load_texts
+
+
+def warm_audio_cache(languages):
+    """
+    Render every fragment of every library text in the given languages.
+
+    Args:
+        languages: Languages to render (keys of TTS_CONFIG)
+    """
+    rendered = failed = 0
+
+    for language in languages:
+        for text in load_texts(language):
+            for part_name, fragment in text["parts"].items():
+                if not fragment.strip():
+                    continue
+                try:
+                    audio = synthesize_audio(fragment, language)
+                    rendered += 1
+                    print(f"✅ {language} / {text['name']} / {part_name}: {len(audio)} bytes")
+                except ValueError as e:
+                    failed += 1
+                    print(f"❌ {language} / {text['name']} / {part_name}: {e}")
+
+    print(f"🎧 Audio cache warm-up done: {rendered} fragments ready, {failed} failed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--language", choices=sorted(TTS_CONFIG), help="Only warm one language")
+    args = parser.parse_args()
+
+    warm_audio_cache([args.language] if args.language else list(TTS_CONFIG))